@@ -0,0 +1,330 @@
+import numpy as np
+import pandas as pd
+from scipy import stats as sp_stats
+
+# Shared stat logic used by the Streamlit pages and the headless tools.
+# Nothing in here imports Streamlit.
+
+STAT_COLUMNS = [
+    "Minutes Played", "Match Rating", "Goals", "Own Goals", "Assists",
+    "Shots", "Shots on Target",
+    "Passes Attempted", "Passes Completed",
+    "Short Passes Attempted", "Short Passes Completed",
+    "Medium Passes Attempted", "Medium Passes Completed",
+    "Long Passes Attempted", "Long Passes Completed",
+    "Dribbles Attempted", "Dribbles Completed",
+    "Crosses Attempted", "Crosses Completed",
+    "Tackles Attempted", "Tackles Completed",
+    "Interceptions", "Key Passes", "Key Dribbles", "Fouled",
+    "Successful 1 on 1 Dribbles", "Fouls", "Penalties Conceded",
+    "Blocks", "Out of Position", "Posession Won", "Posession Lost",
+    "Clearances", "Headers Won", "Headers Lost",
+    "Saves", "Shots Caught", "Shots Parried", "Crosses Caught", "Balls Stripped"
+]
+
+# (Completed, Attempted, output name) for the Player Stats accuracy columns
+ACCURACY_COLUMNS = [
+    ("Passes Completed", "Passes Attempted", "Pass Accuracy %"),
+    ("Shots on Target", "Shots", "Shot Accuracy %"),
+    ("Crosses Completed", "Crosses Attempted", "Cross Accuracy %"),
+    ("Tackles Completed", "Tackles Attempted", "Tackle Accuracy %"),
+    ("Dribbles Completed", "Dribbles Attempted", "Dribble Accuracy %"),
+    ("Short Passes Completed", "Short Passes Attempted", "Short Pass %"),
+    ("Medium Passes Completed", "Medium Passes Attempted", "Medium Pass %"),
+    ("Long Passes Completed", "Long Passes Attempted", "Long Pass %"),
+]
+
+SQUAD_INFO_COLUMNS = ["Name", "Season", "Position 1", "Position 2", "Position 3", "Position 4", "Nationality", "Age"]
+MATCH_KEY_COLUMNS = ["Season", "Competition", "Opponent", "Scores", "Date"]
+# Match metadata (text) and boolean flags in the MatchStats sheet.
+# Everything else in the MatchStats header list is a numeric stat.
+MATCH_META_COLUMNS = ["Player Name", "Season", "Competition", "Opponent", "Scores", "Date"]
+MATCH_BOOLEAN_COLUMNS = ["Man of the Match", "Started"]
+
+
+# --- Player Stats ---
+def coerce_stats(df, cols=STAT_COLUMNS):
+    """Return a copy of df with the stat columns converted to numbers (bad cells -> 0)."""
+    df = df.copy()
+    present = [c for c in cols if c in df.columns]
+    df[present] = df[present].apply(pd.to_numeric, errors='coerce').fillna(0)
+    return df
+
+
+def calc_acc(df, num, den, name):
+    """Safe percentage num/den; 0/0 is reported as 0."""
+    df[name] = (df[num] / df[den].replace(0, 1)) * 100
+    df.loc[df[den] == 0, name] = 0
+    return df
+
+
+def player_sums(match_df, by=("Player Name",)):
+    """Sums of every stat plus Games Played per group, before any ratios.
+
+    Sums from disjoint row sets add up, so these can be combined across partitions.
+    """
+    df = coerce_stats(match_df)
+    by = list(by)
+    games_played = df.groupby(by, observed=True).size().rename("Games Played")
+    return df.groupby(by, observed=True)[STAT_COLUMNS].sum().join(games_played)
+
+
+def finish_totals(agg_df):
+    """Add the accuracy percentages to per-player sums."""
+    for num, den, name in ACCURACY_COLUMNS:
+        agg_df = calc_acc(agg_df, num, den, name)
+    return agg_df
+
+
+def player_totals(match_df):
+    """Per-player sums of every stat, games played and accuracy percentages."""
+    return finish_totals(player_sums(match_df))
+
+
+def player_stats_table(match_df, per_90=False, per_game=False, totals=None):
+    """The Player Stats page table: totals, per 90 or per game, with average rating.
+
+    totals (from player_totals) skips the aggregation of match_df.
+    """
+    display_df = player_totals(match_df) if totals is None else totals.copy()
+
+    if per_90:
+        # Divide all accumulation cols by (Minutes Played / 90)
+        mins = display_df["Minutes Played"] / 90
+        for col in STAT_COLUMNS:
+            if col != "Minutes Played" and col != "Match Rating":  # Rating shouldn't be per 90
+                display_df[col] = display_df[col] / mins.replace(0, 1)
+    elif per_game:
+        games = display_df["Games Played"]
+        for col in STAT_COLUMNS:
+            if col != "Match Rating":
+                display_df[col] = display_df[col] / games
+        display_df["Match Rating"] = display_df["Match Rating"] / games  # Average rating
+
+    # Rating is always shown as an average, never a total
+    if not per_game:
+        display_df["Match Rating"] = display_df["Match Rating"] / display_df["Games Played"]
+    return display_df
+
+
+# --- Team Stats ---
+def unique_matches(match_df):
+    """One row per match (stats are stored per player)."""
+    return match_df[MATCH_KEY_COLUMNS].drop_duplicates()
+
+
+def parse_scores(scores):
+    """Split 'Us - Them' score strings into two integer columns (NaN when unparseable).
+
+    Takes the first two runs of digits, so '2-1', '2 - 1' and '2:1 (AET)' all parse.
+    """
+    parts = scores.astype(str).str.extract(r'(\d+)\D+(\d+)')
+    return pd.DataFrame({
+        "Us": pd.to_numeric(parts[0], errors='coerce'),
+        "Them": pd.to_numeric(parts[1], errors='coerce'),
+    }, index=scores.index)
+
+
+def team_record(match_df):
+    """Games played and W/D/L for the given match rows."""
+    matches_df = unique_matches(match_df)
+    goals = parse_scores(matches_df["Scores"])
+    return {
+        "Games Played": len(matches_df),
+        "Wins": int((goals["Us"] > goals["Them"]).sum()),
+        "Draws": int((goals["Us"] == goals["Them"]).sum()),
+        "Losses": int((goals["Us"] < goals["Them"]).sum()),
+    }
+
+
+def team_record_table(match_df, group_cols=("Season",)):
+    """W/D/L, goals for/against per group (e.g. per Season or Season + Competition)."""
+    group_cols = list(group_cols)
+    matches_df = unique_matches(match_df).copy()
+    matches_df["Season"] = matches_df["Season"].astype(str)
+    goals = parse_scores(matches_df["Scores"])
+    matches_df["Wins"] = goals["Us"] > goals["Them"]
+    matches_df["Draws"] = goals["Us"] == goals["Them"]
+    matches_df["Losses"] = goals["Us"] < goals["Them"]
+    matches_df["Goals For"] = goals["Us"]
+    matches_df["Goals Against"] = goals["Them"]
+    table = matches_df.groupby(group_cols, observed=True).agg(
+        **{
+            "Games Played": ("Scores", "size"),
+            "Wins": ("Wins", "sum"),
+            "Draws": ("Draws", "sum"),
+            "Losses": ("Losses", "sum"),
+            "Goals For": ("Goals For", "sum"),
+            "Goals Against": ("Goals Against", "sum"),
+        }
+    )
+    return table.reset_index()
+
+
+def _team_total_columns(df):
+    numeric_cols = df.select_dtypes(include='number').columns.tolist()
+    # Filter out obvious metadata if they got detected as numeric
+    return [c for c in numeric_cols if c not in ["Season", "Year"]]
+
+
+def team_totals(df):
+    """Sum of every numeric stat column (team totals)."""
+    return df[_team_total_columns(df)].sum()
+
+
+def team_totals_by(df, group_col):
+    """team_totals per value of group_col (one row per group)."""
+    return df.groupby(group_col, observed=True)[_team_total_columns(df)].sum()
+
+
+# --- Dashboard ---
+def _text_key(s, transform):
+    """Apply a str transform to a key column.
+
+    Categorical (surrogate-keyed) columns are transformed on their categories
+    only, keeping the integer codes, unless that would merge two categories.
+    """
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        categories = transform(s.cat.categories.astype(str).to_series())
+        if categories.is_unique:
+            return s.cat.rename_categories(categories.to_numpy())
+    return transform(s.astype(str))
+
+
+def prepare_match_stats(match_df):
+    """Numeric stats plus stripped Player Name/Season and lowercase merge keys."""
+    df = coerce_stats(match_df)
+    df["Season"] = _text_key(df["Season"], lambda v: v.str.strip())
+    df["Player Name"] = _text_key(df["Player Name"], lambda v: v.str.strip())
+    df["_merge_name"] = _text_key(df["Player Name"], lambda v: v.str.lower())
+    df["_merge_season"] = _text_key(df["Season"], lambda v: v.str.lower())
+    return df
+
+
+def prepare_squad_info(squad_df):
+    """Squad columns used by the dashboard, renamed and keyed like prepare_match_stats."""
+    squad_info = squad_df[SQUAD_INFO_COLUMNS].rename(columns={"Name": "Player Name"})
+    squad_info["Season"] = _text_key(squad_info["Season"], lambda v: v.str.strip())
+    squad_info["Player Name"] = _text_key(squad_info["Player Name"], lambda v: v.str.strip())
+    squad_info["_merge_name"] = _text_key(squad_info["Player Name"], lambda v: v.str.lower())
+    squad_info["_merge_season"] = _text_key(squad_info["Season"], lambda v: v.str.lower())
+    return squad_info
+
+
+def merge_squad_info(match_stats_df, squad_info):
+    """Left-join Squad info onto prepared match rows by (name, season).
+
+    Keeps the MatchStats Player Name/Season and drops the Squad duplicates.
+    """
+    merged_df = pd.merge(
+        match_stats_df, squad_info,
+        left_on=["_merge_name", "_merge_season"], right_on=["_merge_name", "_merge_season"],
+        how="left", suffixes=("", "_squad")
+    )
+    merged_df = merged_df.drop(columns=["_merge_name", "_merge_season"])
+    return merged_df.drop(columns=[c for c in ["Player Name_squad", "Season_squad"] if c in merged_df.columns])
+
+
+def aggregate_stats(df, group_cols):
+    """Sum stats (mean rating) per group, keeping the first Squad metadata value found."""
+    agg_funcs = {col: 'sum' for col in STAT_COLUMNS if col != "Match Rating"}
+    agg_funcs["Match Rating"] = 'mean'
+
+    # Metadata to preserve (taking first value found in group)
+    meta_cols = ["Position 1", "Position 2", "Position 3", "Position 4", "Nationality", "Age", "Season"]
+    for mc in meta_cols:
+        if mc in df.columns and mc not in group_cols:
+            agg_funcs[mc] = 'first'
+
+    # Games played
+    games = df.groupby(group_cols, observed=True).size().rename("Games Played")
+
+    # Sums
+    agg = df.groupby(group_cols, observed=True).agg(agg_funcs)
+    agg = agg.join(games)
+
+    # Recalculate Per 90
+    agg["90s Played"] = agg["Minutes Played"] / 90
+
+    agg = agg.reset_index()
+    # Grouping ran on integer codes for keyed columns; hand back plain text labels
+    for col in group_cols:
+        if isinstance(agg[col].dtype, pd.CategoricalDtype):
+            agg[col] = agg[col].astype(str)
+    return agg
+
+
+def per_90(agg, stat):
+    """Stat per 90 minutes (Match Rating is already an average and is returned as is)."""
+    if stat == "Match Rating":
+        return agg[stat]
+    return agg[stat] / agg["90s Played"].replace(0, 1)
+
+
+def radar_values(rows, population, attrs, use_per_90=True, normalize=True):
+    """Radar values for the selected rows (rows x attrs).
+
+    Per 90 divides by 90s played (not Match Rating); normalize min-max scales
+    each attribute against the whole population (0 when it has no spread).
+    """
+    def metric(df):
+        if not use_per_90:
+            return df[attrs].astype(float)
+        return pd.DataFrame({attr: per_90(df, attr) for attr in attrs}, index=df.index)
+
+    values = metric(rows)
+    if normalize:
+        pop = metric(population)
+        lo, hi = pop.min(), pop.max()
+        spread = hi - lo
+        values = (values - lo) / spread.where(spread > 0, 1)
+        values.loc[:, spread <= 0] = 0.0
+    return values
+
+
+def percentile_ranks(player_row, pool_df, stat_list):
+    """Per 90 value and percentile rank (vs the pool) of a player for each stat."""
+    p_90s = player_row["90s Played"] if player_row["90s Played"] > 0 else 1
+    records = []
+    for stat in stat_list:
+        p_metric = player_row[stat] / p_90s if stat != "Match Rating" else player_row[stat]
+        pool_vals = per_90(pool_df, stat)
+        percentile = sp_stats.percentileofscore(pool_vals, p_metric) if len(pool_vals) > 0 else 0
+        records.append((stat, p_metric, percentile))
+    return pd.DataFrame(records, columns=["Stat", "Value", "Percentile"])
+
+
+def correlation_matrix(agg, stats=STAT_COLUMNS, use_per_90=False):
+    """Pearson correlation between every pair of stats over the aggregated rows.
+
+    One matrix product over the z-scored columns; stats without spread
+    (or fewer than two rows) give NaN, like scipy's pearsonr.
+    """
+    stats = [s for s in stats if s in agg.columns]
+    values = np.column_stack([
+        (per_90(agg, s) if use_per_90 else agg[s]).to_numpy(dtype=float) for s in stats
+    ]) if stats else np.empty((len(agg), 0))
+    n = len(values)
+    if n < 2:
+        return pd.DataFrame(np.nan, index=stats, columns=stats)
+    centered = values - values.mean(axis=0)
+    norms = np.sqrt((centered ** 2).sum(axis=0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = centered / np.where(norms > 0, norms, np.nan)
+    corr = np.clip(z.T @ z, -1.0, 1.0)
+    return pd.DataFrame(corr, index=stats, columns=stats)
+
+
+def season_leaderboards(agg, stats=STAT_COLUMNS, top_n=10, season_col="Season"):
+    """Long table of the top N players for every stat within each season."""
+    frames = []
+    for stat in stats:
+        ranked = agg[[season_col, "Player Name", stat]].rename(columns={stat: "Value"})
+        ranked = ranked.sort_values([season_col, "Value"], ascending=[True, False], kind="stable")
+        ranked = ranked.groupby(season_col, sort=False).head(top_n)
+        ranked.insert(1, "Stat", stat)
+        ranked["Rank"] = ranked.groupby(season_col).cumcount() + 1
+        frames.append(ranked)
+    if not frames:
+        return pd.DataFrame(columns=[season_col, "Stat", "Player Name", "Value", "Rank"])
+    return pd.concat(frames, ignore_index=True)
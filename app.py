@@ -1,7 +1,12 @@
 import streamlit as st
 import io
 import time
+import uuid
+import autosave
+import export_jobs
+import warmup
 from data_manager import DataManager
+from shared_store import get_store
 
 st.set_page_config(
     page_title="Retro FIFA Stats",
@@ -10,14 +15,59 @@ st.set_page_config(
 )
 
 # Initialize Session State
+# Sheets live in a process-wide store so identical data is held once across sessions
+if 'session_id' not in st.session_state:
+    st.session_state['session_id'] = uuid.uuid4().hex
 if 'data_manager' not in st.session_state:
     st.session_state['data_manager'] = DataManager()
+    st.session_state['data_manager'].attach_store(get_store(), st.session_state['session_id'])
 
 dm = st.session_state['data_manager']
+dm.keep_alive()
+dm.profiler.start_run("Home")
+
+# Autosave owner: a random token kept in the URL, so a reload or a bookmark finds the same snapshots
+if 'autosave_owner' not in st.session_state:
+    owner = st.query_params.get("owner")
+    st.session_state['autosave_owner'] = owner if autosave.valid_owner(owner) else uuid.uuid4().hex
+st.query_params["owner"] = st.session_state['autosave_owner']
+
+# One Autosaver per DataManager (a reset creates a new one, keeping the on/off choice)
+autosaver = st.session_state.get('autosaver')
+if autosaver is None or autosaver.dm is not dm:
+    was_enabled = autosaver is not None and autosaver.enabled
+    if autosaver is not None:
+        autosaver.disable()
+    autosaver = autosave.Autosaver(dm, st.session_state['autosave_owner'])
+    if was_enabled:
+        autosaver.enable()
+    st.session_state['autosaver'] = autosaver
 
 st.title("Welcome to Retro FIFA Stats ⚽")
 
-st.info("This app runs in your browser. Data is NOT saved to the server. Please DOWNLOAD your save file before closing the tab.")
+if autosaver.enabled:
+    st.info("Autosave is on: changes are snapshotted to the server's disk a few seconds after each edit. Download your save file to keep a copy of your own.")
+else:
+    st.info("This app runs in your browser. Data is NOT saved to the server. Please DOWNLOAD your save file before closing the tab.")
+
+# --- Restore Autosave ---
+# Offered while the session is still empty (fresh start or after a container restart)
+snapshots = autosave.list_snapshots(st.session_state['autosave_owner'])
+if not snapshots.empty and all(df.empty for df in dm.data.values()):
+    with st.container(border=True):
+        st.subheader("Restore Autosave")
+        labels = [f"{r['Save Name']} ({r['Saved At']:%Y-%m-%d %H:%M} UTC, {r['Rows']} rows)" for _, r in snapshots.iterrows()]
+        choice = st.selectbox("Snapshot", range(len(labels)), format_func=lambda i: labels[i])
+        if st.button("Restore Snapshot", type="primary"):
+            save_name, sheets = autosave.load_snapshot(st.session_state['autosave_owner'], snapshots.loc[choice, "Folder"])
+            success, msg = dm.load_from_frames(sheets)
+            if success:
+                dm.current_save_name = save_name
+                st.session_state['warmup'] = warmup.restart(st.session_state.get('warmup'), dm)
+                st.success(msg)
+                st.rerun()
+            else:
+                st.error(msg)
 
 # --- Sidebar ---
 with st.sidebar:
@@ -30,14 +80,38 @@ with st.sidebar:
     
     # Download Save
     st.subheader("1. Save Data")
-    excel_data = dm.save_to_bytes()
-    st.download_button(
-        label="Download Save File 📥",
-        data=excel_data,
-        file_name=f"{dm.current_save_name}_Stats.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        help="Download your current progress to your computer."
-    )
+    # The workbook is built on a worker thread; reruns for the same data version reuse the job.
+    # Once it finishes its bytes move into this session's state, so they go away with the session.
+    export_key = (id(dm), dm.version)
+    exported = st.session_state.get('export_bytes')
+    if exported is not None and exported[0] != export_key:
+        del st.session_state['export_bytes']  # workbook of an older data version
+        exported = None
+    export_job = None if exported is not None else export_jobs.submit(dm)
+
+    @st.fragment(run_every=None if export_job is None or export_job.done() else 0.5)
+    def export_status():
+        if export_job is not None:
+            if not export_job.done():
+                st.progress(export_job.progress, text=f"Preparing save file... {export_job.progress:.0%}")
+                return
+            if export_job.error():
+                st.error(f"Export failed: {export_job.error()}")
+                if st.button("Retry Export"):
+                    st.rerun()
+                return
+            # First poll after the job finished: keep its bytes and rerun to stop polling
+            st.session_state['export_bytes'] = (export_key, export_jobs.take(dm, export_job))
+            st.rerun()
+        st.download_button(
+            label="Download Save File 📥",
+            data=st.session_state['export_bytes'][1],
+            file_name=f"{dm.current_save_name}_Stats.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            help="Download your current progress to your computer."
+        )
+
+    export_status()
     
     st.divider()
     
@@ -46,20 +120,66 @@ with st.sidebar:
     uploaded_file = st.file_uploader("Upload Save File", type=["xlsx"], label_visibility="collapsed")
     if uploaded_file:
         if st.button("Load Uploaded Save", type="primary"):
+            if st.session_state.get('warmup') is not None:
+                st.session_state['warmup'].cancel()  # its data is about to be replaced
             success, msg = dm.load_from_bytes(uploaded_file)
             if success:
+                # Precompute the default analytics views while the user is still on this page
+                st.session_state['warmup'] = warmup.restart(st.session_state.get('warmup'), dm)
                 st.success(msg)
                 time.sleep(1)
                 st.rerun()
             else:
                 st.error(msg)
 
+    # Analytics cache warm-up (started after a save is loaded)
+    warm = st.session_state.get('warmup')
+    if warm is not None and warm.dm is dm:
+        @st.fragment(run_every=0.5 if warm.running() else None)
+        def warmup_status():
+            status = warm.status()
+            if status == "Warming":
+                st.progress(warm.progress, text=f"Warming analytics cache... {warm.progress:.0%}")
+                return
+            if st.session_state.get('warmup_shown') != (id(warm), status):
+                # First poll after the thread stopped: full rerun to stop polling
+                st.session_state['warmup_shown'] = (id(warm), status)
+                st.rerun()
+            if status == "Warm":
+                st.caption(f"Analytics cache: warm ({warm.finished - warm.started:.1f}s)")
+            elif warm.error is not None:
+                st.caption(f"Analytics cache: cold (warm-up failed: {warm.error})")
+            else:
+                st.caption("Analytics cache: cold (pages build their views on first visit)")
+
+        warmup_status()
+
+    st.divider()
+
+    # Autosave
+    st.subheader("Autosave")
+    autosave_on = st.toggle("Autosave to server disk", value=autosaver.enabled,
+                            help="Writes changed sheets to a local snapshot folder in the background after each edit.")
+    if autosave_on and not autosaver.enabled:
+        autosaver.enable()
+    elif not autosave_on and autosaver.enabled:
+        autosaver.disable()
+    if autosaver.last_error:
+        st.error(f"Autosave failed: {autosaver.last_error}")
+    elif autosaver.last_saved:
+        st.caption(f"Last snapshot: {time.strftime('%H:%M:%S', time.localtime(autosaver.last_saved))}")
+    if autosaver.enabled:
+        st.caption("Snapshots are tied to this page's address (the `owner` in the URL): bookmark it to restore them later.")
+
     st.divider()
     
     # Reset
     st.subheader("3. Reset")
     if st.button("Start New Save (Clear Data)", type="secondary"):
+        if st.session_state.get('warmup') is not None:
+            st.session_state['warmup'].cancel()
         st.session_state['data_manager'] = DataManager()
+        st.session_state['data_manager'].attach_store(get_store(), st.session_state['session_id'])
         st.rerun()
 
 # --- Main Content ---
@@ -82,6 +202,7 @@ st.markdown("""
 - **Player Stats**: Record match stats.
 - **Team Stats**: View analysis (Work in Progress).
 - **Stats Dashboard**: Advanced visualizations.
+- **Player Development**: Growth model and next-season overall projections.
 """)
 
 # Contact Info
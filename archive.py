@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+import pickle
+import re
+import shutil
+import tempfile
+import uuid
+
+import numpy as np
+import pandas as pd
+
+# Archive root; point it at a local disk with room for the whole career history
+ARCHIVE_DIR = os.environ.get("RETRO_FIFA_ARCHIVE_DIR", ".archive")
+# Rows materialized from the memory maps at a time
+CHUNK_ROWS = 20000
+MANIFEST = "manifest.json"
+
+
+def _safe_name(name):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", str(name).strip()).strip("._") or "_"
+
+
+def _folder_name(name):
+    """Readable folder name plus a digest of the exact name, so "A/B" and "A_B" never share a folder."""
+    name = str(name)
+    return f"{_safe_name(name)}-{hashlib.sha1(name.encode()).hexdigest()[:10]}"
+
+
+def _write_column(folder, i, s):
+    """Write one column as .npy (plus .pkl values for dictionary-encoded text); returns its manifest entry."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        s = s.astype(object)
+    values = s.to_numpy()
+    entry = {"name": str(s.name), "file": f"c{i:03d}.npy"}
+    if values.dtype != object and values.dtype.kind in "biufM":
+        # Numbers, flags and datetimes map straight onto disk
+        entry["kind"] = "values"
+    else:
+        # Text (and anything mixed) is stored as int32 codes into its distinct values
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        values = codes.astype(np.int32)
+        entry["kind"] = "codes"
+        entry["values"] = f"c{i:03d}.pkl"
+        with open(os.path.join(folder, entry["values"]), "wb") as f:
+            pickle.dump(np.asarray(uniques, dtype=object), f, protocol=5)
+    np.save(os.path.join(folder, entry["file"]), values, allow_pickle=False)
+    return entry
+
+
+class Partition:
+    """One archived sheet partition (a season of a save), read through memory maps.
+
+    Columns are opened with np.load(mmap_mode="r"), so only the rows of the
+    slice being materialized are paged in.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        with open(os.path.join(folder, MANIFEST)) as f:
+            manifest = json.load(f)
+        self.save = manifest["save"]
+        self.season = manifest["season"]
+        self.sheet = manifest["sheet"]
+        self.rows = manifest["rows"]
+        self.specs = {c["name"]: c for c in manifest["columns"]}
+        self.columns = [c["name"] for c in manifest["columns"]]
+        self._maps = {}
+        self._values = {}
+
+    def __len__(self):
+        return self.rows
+
+    def _map(self, name):
+        if name not in self._maps:
+            self._maps[name] = np.load(os.path.join(self.folder, self.specs[name]["file"]), mmap_mode="r")
+        return self._maps[name]
+
+    def values(self, name):
+        """Distinct values of a text column (read without touching the rows)."""
+        spec = self.specs.get(name)
+        if spec is None:
+            return []
+        if spec["kind"] != "codes":
+            return list(pd.unique(np.asarray(self._map(name))))
+        if name not in self._values:
+            with open(os.path.join(self.folder, spec["values"]), "rb") as f:
+                self._values[name] = pickle.load(f)
+        return list(self._values[name])
+
+    def _column(self, name, start, stop):
+        data = np.array(self._map(name)[start:stop])  # copy the slice out of the map
+        if self.specs[name]["kind"] == "values":
+            return data
+        values = np.asarray(self.values(name), dtype=object)
+        out = values[np.maximum(data, 0)] if len(values) else np.full(len(data), None, dtype=object)
+        out[data < 0] = None
+        return out
+
+    def frame(self, columns=None, start=0, stop=None):
+        """Rows [start:stop] (all by default) as a DataFrame."""
+        columns = [c for c in (columns or self.columns) if c in self.specs]
+        stop = self.rows if stop is None else min(stop, self.rows)
+        return pd.DataFrame({c: self._column(c, start, stop) for c in columns}, columns=columns,
+                            index=pd.RangeIndex(stop - start))
+
+    def chunks(self, columns=None, chunk_rows=CHUNK_ROWS):
+        for start in range(0, self.rows, chunk_rows):
+            yield self.frame(columns, start, start + chunk_rows)
+
+    @property
+    def disk_bytes(self):
+        return sum(os.path.getsize(os.path.join(self.folder, f)) for f in os.listdir(self.folder))
+
+
+class ArchiveStore:
+    """Sheet partitions on local disk: root/<save>/<season>/<sheet>/ with one .npy per column.
+
+    Folder names are the sanitised names plus a digest of the exact ones;
+    each manifest keeps the original save, season and sheet names.
+
+    A store owns everything under its root; use session_store() so sessions
+    sharing ARCHIVE_DIR never see or delete each other's partitions.
+    """
+
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root = root
+
+    def _folder(self, save, season, sheet):
+        return os.path.join(self.root, _folder_name(save), _folder_name(season), _folder_name(sheet))
+
+    def add(self, save, season, df, sheet="MatchStats"):
+        """Write (or replace) one partition; the folder appears complete or not at all."""
+        folder = self._folder(save, season, sheet)
+        os.makedirs(os.path.dirname(folder), exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=os.path.dirname(folder), prefix=".tmp-")
+        try:
+            columns = [_write_column(tmp, i, df[col]) for i, col in enumerate(df.columns)]
+            with open(os.path.join(tmp, MANIFEST), "w") as f:
+                json.dump({"save": str(save), "season": str(season), "sheet": sheet, "rows": len(df), "columns": columns}, f)
+            if os.path.exists(folder):
+                shutil.rmtree(folder)
+            os.replace(tmp, folder)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        return Partition(folder)
+
+    def get(self, save, season, sheet="MatchStats"):
+        folder = self._folder(save, season, sheet)
+        return Partition(folder) if os.path.exists(os.path.join(folder, MANIFEST)) else None
+
+    def remove(self, save, season):
+        shutil.rmtree(os.path.join(self.root, _folder_name(save), _folder_name(season)), ignore_errors=True)
+
+    def partitions(self, sheet="MatchStats"):
+        """Every partition of a sheet, ordered by save then season."""
+        found = []
+        if not os.path.isdir(self.root):
+            return found
+        for save in sorted(os.listdir(self.root)):
+            save_dir = os.path.join(self.root, save)
+            if save.startswith(".") or not os.path.isdir(save_dir):
+                continue
+            for season in sorted(os.listdir(save_dir)):
+                folder = os.path.join(save_dir, season, _folder_name(sheet))
+                if not season.startswith(".") and os.path.exists(os.path.join(folder, MANIFEST)):
+                    found.append(Partition(folder))
+        return sorted(found, key=lambda p: (p.save, p.season))
+
+    def clear(self):
+        """Delete every partition of this store."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def catalog(self):
+        """Save, Season, MatchStats Rows and Disk Bytes per archived season."""
+        rows = [(p.save, p.season, p.rows, p.disk_bytes) for p in self.partitions()]
+        return pd.DataFrame(rows, columns=["Save", "Season", "Rows", "Disk Bytes"])
+
+
+def session_store(root=ARCHIVE_DIR):
+    """An ArchiveStore in a fresh folder of its own under root (one per session)."""
+    return ArchiveStore(os.path.join(root, uuid.uuid4().hex))
+
+
+class ChunkedSheet:
+    """A sheet made of archived partitions followed by an in-memory frame, read chunk by chunk.
+
+    The streaming Excel writer consumes chunks(); frame() materializes it all.
+    """
+
+    def __init__(self, partitions, df):
+        self.partitions = list(partitions)
+        self.df = df
+        self.columns = list(df.columns)
+
+    def __len__(self):
+        return sum(len(p) for p in self.partitions) + len(self.df)
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    def chunks(self, chunk_rows=CHUNK_ROWS):
+        for partition in self.partitions:
+            for chunk in partition.chunks(chunk_rows=chunk_rows):
+                yield chunk.reindex(columns=self.columns)
+        for start in range(0, len(self.df), chunk_rows):
+            yield self.df.iloc[start:start + chunk_rows]
+
+    def frame(self):
+        parts = list(self.chunks())
+        return pd.concat(parts, ignore_index=True) if parts else self.df
@@ -0,0 +1,231 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+import cold_storage
+
+# Snapshot root; point it at a mounted volume to survive container restarts
+SNAPSHOT_DIR = os.environ.get("RETRO_FIFA_AUTOSAVE_DIR", ".autosave")
+# Quiet period after the last write before a snapshot is taken
+DEBOUNCE_SECONDS = 2.0
+MANIFEST = "manifest.json"
+# Owners are random tokens (uuid4 hex); each owner's snapshots live in their own folder
+OWNER_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+def _safe_name(save_name):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", save_name).strip("._") or "MySave"
+
+
+def valid_owner(owner):
+    return isinstance(owner, str) and OWNER_PATTERN.fullmatch(owner) is not None
+
+
+def _owner_dir(directory, owner):
+    if not valid_owner(owner):
+        raise ValueError("Invalid autosave owner.")
+    return os.path.join(directory, owner)
+
+
+def _atomic_write(path, write):
+    """Write via a temp file in the same directory, then rename over the target."""
+    folder = os.path.dirname(path)
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=".tmp-")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class Autosaver:
+    """Debounced background snapshots of a DataManager's sheets.
+
+    Registered as a change listener: each sheet write records the frame just
+    written (on the script thread) and (re)starts a timer. When the timer
+    fires, on its own thread, those frames are pickled next to a manifest,
+    each file written atomically. The timer thread never reads through the
+    DataManager, so it does not decode cold sheets or touch the shared store.
+    Archived seasons are copied from their memory-mapped partitions once each,
+    so a restored snapshot keeps them (as in-memory rows). Snapshots are written under the owner's folder and only offered back to it.
+    """
+
+    def __init__(self, dm, owner, directory=SNAPSHOT_DIR, delay=DEBOUNCE_SECONDS):
+        if not valid_owner(owner):
+            raise ValueError("Invalid autosave owner.")
+        self.dm = dm
+        self.owner = owner
+        self.directory = directory
+        self.delay = delay
+        self.enabled = False
+        self.last_saved = None   # time of the last completed snapshot
+        self.last_error = None
+        self._lock = threading.Lock()        # dirty set / timer
+        self._write_lock = threading.Lock()  # one snapshot on disk at a time
+        self._timer = None
+        self._dirty = {}   # {sheet: frame to write, or None to read it at flush time}
+        self._last_name = None
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self.dm.add_listener(self._on_change)
+        # First snapshot holds every sheet
+        with self._lock:
+            self._dirty.update({name: self.dm.get_data(name) for name in self.dm.worksheet_names if name in self.dm.data})
+            self._schedule()
+
+    def disable(self):
+        self.enabled = False
+        self.dm.remove_listener(self._on_change)
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _on_change(self, dm, worksheet_name):
+        # Runs on the script thread right after the write, so the frame is the decoded one just stored
+        with self._lock:
+            self._dirty[worksheet_name] = dm.data[worksheet_name]
+            self._schedule()
+
+    def _peek(self, name):
+        """A sheet for a snapshot without going through the DataManager (cold sheets decoded privately)."""
+        value = self.dm.data[name]
+        return value.decode() if isinstance(value, cold_storage.ColdSheet) else value
+
+    def _schedule(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """Write the dirty sheets now (called by the timer thread)."""
+        with self._lock:
+            self._timer = None
+            save_name = self.dm.current_save_name
+            if save_name != self._last_name:
+                # New or renamed save: its folder needs every sheet
+                for name in self.dm.worksheet_names:
+                    self._dirty.setdefault(name, None)
+            dirty = {name: df for name, df in self._dirty.items() if name in self.dm.data}
+            self._dirty.clear()
+            version = self.dm.version
+            archived = dict(self.dm.archived_seasons)
+        if not dirty or (all(df.empty for df in self.dm.data.values()) and not archived):
+            # Never replace a snapshot with an empty save (fresh session or reset)
+            return
+        sheets = {name: self._peek(name) if df is None else df for name, df in dirty.items()}
+        try:
+            with self._write_lock:
+                write_snapshot(self.directory, self.owner, save_name, sheets, version, archived)
+            self._last_name = save_name
+            self.last_saved = time.time()
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            with self._lock:
+                for name, df in sheets.items():
+                    self._dirty.setdefault(name, df)  # a newer write wins
+
+
+def _archived_file(season):
+    return f"archived-{hashlib.sha1(str(season).encode()).hexdigest()[:12]}.pkl"
+
+
+def write_snapshot(directory, owner, save_name, sheets, version=None, archived=None):
+    """Atomically write the given sheets and update the save's manifest.
+
+    archived ({season: archive.Partition}) is the save's archived MatchStats
+    seasons: each is written once, and dropped once it is no longer archived
+    (its rows are then back in the MatchStats sheet).
+    """
+    folder = os.path.join(_owner_dir(directory, owner), _safe_name(save_name))
+    os.makedirs(folder, exist_ok=True)
+    manifest_path = os.path.join(folder, MANIFEST)
+    manifest = read_manifest(folder) or {"sheets": {}}
+
+    for name, df in sheets.items():
+        _atomic_write(os.path.join(folder, f"{name}.pkl"), df.to_pickle)
+        manifest["sheets"][name] = len(df)
+
+    stale = []
+    if archived is not None:
+        saved = manifest.setdefault("archived", {})
+        for season, partition in archived.items():
+            if season not in saved:
+                _atomic_write(os.path.join(folder, _archived_file(season)), partition.frame().to_pickle)
+                saved[season] = len(partition)
+        stale = [season for season in saved if season not in archived]
+        for season in stale:
+            del saved[season]
+
+    manifest.update({"save_name": save_name, "saved_at": time.time(), "version": version})
+
+    def dump(path):
+        with open(path, "w") as f:
+            json.dump(manifest, f)
+    _atomic_write(manifest_path, dump)
+    # Only once the manifest no longer lists them
+    for season in stale:
+        path = os.path.join(folder, _archived_file(season))
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def read_manifest(folder):
+    try:
+        with open(os.path.join(folder, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def list_snapshots(owner, directory=SNAPSHOT_DIR):
+    """One row per save the owner has a snapshot of, most recent first."""
+    rows = []
+    directory = _owner_dir(directory, owner)
+    if os.path.isdir(directory):
+        for entry in os.listdir(directory):
+            manifest = read_manifest(os.path.join(directory, entry))
+            if manifest:
+                rows.append({
+                    "Save Name": manifest["save_name"],
+                    "Saved At": pd.Timestamp(manifest["saved_at"], unit="s"),
+                    "Rows": sum(manifest["sheets"].values()) + sum(manifest.get("archived", {}).values()),
+                    "Folder": entry,
+                })
+    if not rows:
+        return pd.DataFrame(columns=["Save Name", "Saved At", "Rows", "Folder"])
+    return pd.DataFrame(rows).sort_values("Saved At", ascending=False, ignore_index=True)
+
+
+def load_snapshot(owner, folder, directory=SNAPSHOT_DIR):
+    """(save name, {sheet: DataFrame}) from one of the owner's snapshot folders.
+
+    Archived seasons come back as MatchStats rows, in front of the rest like
+    DataManager.restore_season puts them.
+    """
+    path = os.path.join(_owner_dir(directory, owner), _safe_name(folder))
+    manifest = read_manifest(path)
+    if manifest is None:
+        raise FileNotFoundError(f"No snapshot in {path}")
+    sheets = {name: pd.read_pickle(os.path.join(path, f"{name}.pkl")) for name in manifest["sheets"]}
+    archived = sorted(manifest.get("archived", {}))
+    if archived:
+        frames = [pd.read_pickle(os.path.join(path, _archived_file(season))) for season in archived]
+        live = [sheets["MatchStats"]] if len(sheets.get("MatchStats", ())) else []
+        sheets["MatchStats"] = pd.concat(frames + live, ignore_index=True)
+    return manifest["save_name"], sheets
@@ -0,0 +1,132 @@
+"""Headless batch reports for many save files.
+
+Loads each save through DataManager (no Streamlit), computes the Player Stats
+table, per-season player aggregates, Team W/D/L and per-season leaderboards,
+and writes them as CSV and/or HTML. Independent saves run in parallel.
+
+Usage:
+    python batch_report.py saves/ other_save.xlsx --out reports --workers 4
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+import analytics
+from data_manager import DataManager
+
+
+def find_saves(paths):
+    """Expand files and directories into a sorted list of .xlsx save files."""
+    saves = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            saves.extend(sorted(p.glob("*.xlsx")))
+        else:
+            saves.append(p)
+    return saves
+
+
+def build_reports(dm, top_n=10):
+    """Compute every report table for one loaded DataManager. Returns {name: DataFrame}."""
+    match_stats_df = dm.get_data("MatchStats")
+    if match_stats_df.empty:
+        return {}
+
+    merged_df = analytics.merge_squad_info(
+        analytics.prepare_match_stats(match_stats_df),
+        analytics.prepare_squad_info(dm.get_data("Squad")),
+    )
+    player_seasons = analytics.aggregate_stats(merged_df, ["Player Name", "Season"])
+
+    return {
+        "player_stats": analytics.player_stats_table(match_stats_df).reset_index(),
+        "player_seasons": player_seasons,
+        "team_record": analytics.team_record_table(match_stats_df, ["Season"]),
+        "team_record_by_competition": analytics.team_record_table(match_stats_df, ["Season", "Competition"]),
+        "leaderboards": analytics.season_leaderboards(player_seasons, top_n=top_n),
+    }
+
+
+def write_reports(reports, out_dir, formats, title):
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if "csv" in formats:
+        for name, df in reports.items():
+            df.to_csv(out_dir / f"{name}.csv", index=False)
+    if "html" in formats:
+        sections = [f"<h2>{name.replace('_', ' ').title()}</h2>\n{df.to_html(index=False, float_format='{:.2f}'.format)}"
+                    for name, df in reports.items()]
+        html = f"<html><head><meta charset='utf-8'><title>{title}</title></head><body><h1>{title}</h1>\n" + "\n".join(sections) + "\n</body></html>"
+        (out_dir / "report.html").write_text(html, encoding="utf-8")
+
+
+def process_save(path, out_root, formats, top_n):
+    """Worker: load one save and write its reports. Never raises; returns a summary row."""
+    start = time.perf_counter()
+    result = {"Save": str(path), "OK": False, "Match Rows": 0, "Seconds": 0.0, "Error": ""}
+    try:
+        dm = DataManager()
+        ok, msg = dm.load_from_bytes(str(path))
+        if not ok:
+            raise ValueError(msg)
+        dm.current_save_name = Path(path).stem
+        reports = build_reports(dm, top_n=top_n)
+        write_reports(reports, Path(out_root) / dm.current_save_name, formats, f"{dm.current_save_name} Report")
+        result["Match Rows"] = len(dm.get_data("MatchStats"))
+        result["OK"] = True
+    except Exception as e:
+        result["Error"] = str(e)
+    result["Seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def run_batch(saves, out_root, formats=("csv", "html"), top_n=10, workers=None):
+    """Process saves in parallel across CPU cores. Returns (summary DataFrame, wall seconds)."""
+    start = time.perf_counter()
+    results = []
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        results = [process_save(p, out_root, formats, top_n) for p in saves]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(process_save, p, out_root, formats, top_n) for p in saves]
+            for future in as_completed(futures):
+                results.append(future.result())
+    summary = pd.DataFrame(results, columns=["Save", "OK", "Match Rows", "Seconds", "Error"])
+    return summary.sort_values("Save").reset_index(drop=True), time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate stats reports for many Retro FIFA save files.")
+    parser.add_argument("paths", nargs="+", help="Save files (.xlsx) or directories containing them")
+    parser.add_argument("--out", default="reports", help="Output directory (one sub-folder per save)")
+    parser.add_argument("--format", nargs="+", choices=["csv", "html"], default=["csv", "html"], dest="formats")
+    parser.add_argument("--top", type=int, default=10, help="Players per stat in the season leaderboards")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    saves = find_saves(args.paths)
+    if not saves:
+        print("No save files found.", file=sys.stderr)
+        return 1
+
+    summary, wall = run_batch(saves, args.out, args.formats, args.top, args.workers)
+    Path(args.out).mkdir(parents=True, exist_ok=True)
+    summary.to_csv(Path(args.out) / "summary.csv", index=False)
+
+    ok = summary[summary["OK"]]
+    failed = summary[~summary["OK"]]
+    print(f"Processed {len(summary)} saves in {wall:.2f}s "
+          f"({len(summary) / wall:.2f} saves/s, {ok['Match Rows'].sum() / wall:,.0f} match rows/s)")
+    print(f"Succeeded: {len(ok)}  Failed: {len(failed)}")
+    for _, row in failed.iterrows():
+        print(f"  FAILED {row['Save']}: {row['Error']}")
+    return 1 if len(failed) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""Benchmark suite for the hot paths.
+
+Builds a synthetic save at the requested scale and times DataManager I/O and
+the page computations. Results are written as JSON so runs from different
+versions can be compared with --compare.
+
+Usage:
+    python benchmark.py --seasons 10 --matches 60 --squad 30 --out bench.json
+    python benchmark.py --out new.json --compare bench.json
+    python benchmark.py --only save_to_bytes save_to_bytes_streaming --export-memory
+"""
+import argparse
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import analytics
+import synthetic
+from data_manager import DataManager
+
+RADAR_PRESET = ["Match Rating", "Goals", "Assists", "Passes Completed", "Dribbles Completed", "Tackles Completed",
+                "Interceptions", "Posession Won", "Posession Lost", "Key Passes"]
+
+
+def time_call(fn, repeat):
+    """Run fn repeat times; returns the list of wall times in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def build_cases(dm, append_batches):
+    """Name -> (callable, rows processed) for every benchmarked path."""
+    match_df = dm.get_data("MatchStats")
+    squad_df = dm.get_data("Squad")
+    save_bytes = dm.save_to_bytes().getvalue()
+
+    merged_df = analytics.merge_squad_info(analytics.prepare_match_stats(match_df), analytics.prepare_squad_info(squad_df))
+    player_seasons = analytics.aggregate_stats(merged_df, ["Player Name", "Season"])
+    latest = merged_df["Season"].max()
+    season_agg = analytics.aggregate_stats(merged_df[merged_df["Season"] == latest], ["Player Name"])
+    pool = season_agg[season_agg["Position 1"] == season_agg["Position 1"].mode().iloc[0]]
+    scout_row = pool.iloc[0]
+    radar_rows = player_seasons.head(5)
+
+    # One match worth of rows, appended repeatedly like the single-match entry form
+    match_chunks = [g for _, g in match_df.groupby(["Season", "Date"], sort=False)][:append_batches]
+
+    def load():
+        DataManager().load_from_bytes(io.BytesIO(save_bytes))
+
+    def append_loop():
+        target = DataManager()
+        for chunk in match_chunks:
+            target.append_data("MatchStats", chunk)
+
+    def dashboard_merge_aggregate():
+        merged = analytics.merge_squad_info(analytics.prepare_match_stats(match_df), analytics.prepare_squad_info(squad_df))
+        analytics.aggregate_stats(merged, ["Player Name", "Season"])
+
+    def team_wdl():
+        analytics.team_record_table(match_df, ["Season", "Competition"])
+        for season in match_df["Season"].astype(str).unique():
+            analytics.team_record(match_df[match_df["Season"].astype(str) == season])
+
+    def percentiles():
+        analytics.percentile_ranks(scout_row, pool, analytics.STAT_COLUMNS)
+
+    def radar():
+        analytics.radar_values(radar_rows, player_seasons, RADAR_PRESET, use_per_90=True, normalize=True)
+
+    n = len(match_df)
+    return {
+        "load_from_bytes": (load, n),
+        "save_to_bytes": (dm.save_to_bytes, n),
+        "save_to_bytes_streaming": (lambda: dm.save_to_bytes(streaming=True), n),
+        "append_data_loop": (append_loop, sum(len(c) for c in match_chunks)),
+        "player_stats_aggregation": (lambda: analytics.player_stats_table(match_df, per_90=True), n),
+        "team_wdl": (team_wdl, n),
+        "dashboard_merge_aggregate": (dashboard_merge_aggregate, n),
+        "percentiles": (percentiles, len(pool)),
+        "radar": (radar, len(player_seasons)),
+    }
+
+
+def export_memory(dm):
+    """Peak traced memory and time of one export with each writer on the same save.
+
+    tracemalloc slows both writers down, so these times are only comparable to each other.
+    """
+    data_bytes = int(sum(df.memory_usage(deep=True).sum() for df in dm.data.values()))
+    results = {}
+    for label, streaming in [("openpyxl", False), ("streaming", True)]:
+        tracemalloc.start()
+        start = time.perf_counter()
+        size = dm.save_to_bytes(streaming=streaming).getbuffer().nbytes
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[label] = {"seconds": seconds, "peak_bytes": peak, "peak_x_data": peak / data_bytes if data_bytes else None, "file_bytes": size}
+    return results
+
+
+def run_benchmarks(seasons=5, matches=40, squad=25, repeat=3, append_batches=50, only=None, seed=0, measure_export=False):
+    dm = synthetic.generate_save(seasons=seasons, matches=matches, squad_size=squad, seed=seed)
+    results = {}
+    for name, (fn, rows) in build_cases(dm, append_batches).items():
+        if only and name not in only:
+            continue
+        times = time_call(fn, repeat)
+        results[name] = {
+            "rows": int(rows),
+            "min_s": min(times),
+            "median_s": statistics.median(times),
+            "mean_s": statistics.fmean(times),
+            "rows_per_s": rows / min(times) if min(times) > 0 else None,
+        }
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "scale": {"seasons": seasons, "matches": matches, "squad": squad, "seed": seed,
+                      "match_rows": len(dm.get_data("MatchStats"))},
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+    if measure_export:
+        report["export_memory"] = export_memory(dm)
+    return report
+
+
+def compare(current, baseline):
+    """Print median time ratios (current / baseline) for benchmarks present in both runs."""
+    print(f"{'benchmark':<28}{'baseline':>12}{'current':>12}{'ratio':>9}")
+    for name, res in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        ratio = res["median_s"] / base["median_s"] if base["median_s"] else float("nan")
+        flag = "  SLOWER" if ratio > 1.1 else ""
+        print(f"{name:<28}{base['median_s']:>12.4f}{res['median_s']:>12.4f}{ratio:>9.2f}{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the Retro FIFA Stats hot paths on a synthetic save.")
+    parser.add_argument("--seasons", type=int, default=5)
+    parser.add_argument("--matches", type=int, default=40, help="Matches per season")
+    parser.add_argument("--squad", type=int, default=25, help="Squad size per season")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--append-batches", type=int, default=50, help="Single-match appends in append_data_loop")
+    parser.add_argument("--only", nargs="+", help="Run only these benchmarks")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--export-memory", action="store_true", help="Also measure peak memory of both Excel writers (slow)")
+    parser.add_argument("--out", help="Write JSON results to this file (default: stdout)")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.seasons, args.matches, args.squad, args.repeat, args.append_batches, args.only, args.seed, args.export_memory)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if "export_memory" in report:
+        for label, res in report["export_memory"].items():
+            print(f"{label:<10} {res['seconds']:8.2f} s  peak {res['peak_bytes'] / 1e6:8.1f} MB  ({res['peak_x_data']:.1f}x data)", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+import re
+import pandas as pd
+from analytics import MATCH_META_COLUMNS as META_COLUMNS, MATCH_BOOLEAN_COLUMNS as BOOLEAN_COLUMNS
+
+REQUIRED_COLUMNS = ["Player Name", "Season", "Competition", "Opponent"]
+
+# Common spellings used by other tools / spreadsheets -> MatchStats column
+COLUMN_ALIASES = {
+    "player": "Player Name",
+    "name": "Player Name",
+    "comp": "Competition",
+    "competition name": "Competition",
+    "vs": "Opponent",
+    "opposition": "Opponent",
+    "score": "Scores",
+    "result": "Scores",
+    "match date": "Date",
+    "minutes": "Minutes Played",
+    "mins": "Minutes Played",
+    "rating": "Match Rating",
+    "og": "Own Goals",
+    "sot": "Shots on Target",
+    "possession won": "Posession Won",
+    "possession lost": "Posession Lost",
+    "motm": "Man of the Match",
+    "player of the match": "Man of the Match",
+    "starter": "Started",
+    "start": "Started",
+}
+
+TRUE_VALUES = {"true", "yes", "y", "1", "x", "1.0"}
+FALSE_VALUES = {"false", "no", "n", "0", "", "0.0", "nan", "none"}
+
+
+def _normalize_header(name):
+    """Lowercase and collapse punctuation/whitespace so headers can be compared loosely."""
+    return re.sub(r"[^a-z0-9]+", " ", str(name).lower()).strip()
+
+
+def read_match_file(uploaded_file):
+    """Read an uploaded CSV or Excel file into a DataFrame of raw (string) cells."""
+    file_name = getattr(uploaded_file, "name", str(uploaded_file)).lower()
+    if file_name.endswith(".csv"):
+        return pd.read_csv(uploaded_file, dtype=str, keep_default_na=False)
+    return pd.read_excel(uploaded_file, dtype=object)
+
+
+def map_columns(df, headers):
+    """Map the file's headers onto the MatchStats schema.
+
+    Returns the renamed DataFrame (schema columns only) and the list of
+    source columns that could not be mapped.
+    """
+    lookup = {_normalize_header(h): h for h in headers}
+    lookup.update({alias: target for alias, target in COLUMN_ALIASES.items() if target in headers})
+
+    rename = {}
+    unmapped = []
+    for col in df.columns:
+        target = lookup.get(_normalize_header(col))
+        # First file column wins if two map to the same schema column
+        if target and target not in rename.values():
+            rename[col] = target
+        else:
+            unmapped.append(col)
+
+    mapped = df[list(rename)].rename(columns=rename)
+    return mapped, unmapped
+
+
+def validate_match_rows(df, headers, known_players=None):
+    """Validate mapped match rows against the MatchStats schema in one vectorized pass.
+
+    Returns (valid_df, errors_df):
+    - valid_df holds the clean, typed rows (schema column order) that passed every check.
+    - errors_df lists one row per problem: Row (spreadsheet row number), Column, Value, Error.
+    """
+    stat_cols = [c for c in headers if c not in META_COLUMNS and c not in BOOLEAN_COLUMNS]
+    count_cols = [c for c in stat_cols if c != "Match Rating"]
+    # File row numbers as the user sees them (header is row 1)
+    row_numbers = pd.Series(df.index + 2, index=df.index)
+    problems = []
+    # Work on a full-schema frame; columns absent from the file are filled with defaults
+    raw = df.reindex(columns=headers)
+
+    def collect(mask_df, message):
+        # mask_df: boolean frame (rows x columns) -> long list of (row, column) hits
+        hits = mask_df.stack()
+        hits = hits[hits]
+        if hits.empty:
+            return
+        idx = hits.index.get_level_values(0)
+        cols = hits.index.get_level_values(1)
+        values = raw.to_numpy()[raw.index.get_indexer(idx), raw.columns.get_indexer(cols)]
+        problems.append(pd.DataFrame({
+            "Row": row_numbers.loc[idx].to_numpy(),
+            "Column": cols,
+            "Value": values,
+            "Error": message,
+        }))
+
+    missing_cols = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing_cols:
+        errors = pd.DataFrame({
+            "Row": [None] * len(missing_cols),
+            "Column": missing_cols,
+            "Value": [None] * len(missing_cols),
+            "Error": "Required column missing from file",
+        })
+        return pd.DataFrame(columns=headers), errors
+
+    text = raw.astype(str).apply(lambda s: s.str.strip())
+    blank = raw.isna() | text.eq("")
+
+    # --- Metadata ---
+    meta = text[META_COLUMNS].where(~blank[META_COLUMNS], "")
+    collect(blank[REQUIRED_COLUMNS], "Required value is blank")
+
+    # --- Numeric stats ---
+    numbers = raw[stat_cols].apply(pd.to_numeric, errors="coerce")
+    collect(numbers.isna() & ~blank[stat_cols], "Not a number")
+    collect(numbers < 0, "Negative value")
+    collect(numbers[["Match Rating"]] > 10, "Match Rating must be between 0 and 10")
+    collect(numbers[count_cols].notna() & (numbers[count_cols] % 1 != 0), "Must be a whole number")  # blanks default to 0 below
+    numbers = numbers.fillna(0)
+
+    # --- Boolean flags ---
+    lowered = text[BOOLEAN_COLUMNS].apply(lambda s: s.str.lower())
+    is_true = lowered.isin(TRUE_VALUES)
+    is_false = lowered.isin(FALSE_VALUES) | blank[BOOLEAN_COLUMNS]
+    collect(~is_true & ~is_false, "Not a yes/no value")
+
+    # --- Duplicate match rows within the file ---
+    key_cols = ["Player Name", "Season", "Competition", "Opponent", "Date"]
+    dupes = meta.duplicated(subset=key_cols, keep="first")
+    collect(pd.DataFrame({"Player Name": dupes}), "Duplicate row for this player and match")
+
+    # --- Players not in the squad ---
+    if known_players is not None:
+        unknown = ~meta["Player Name"].str.lower().isin({str(p).strip().lower() for p in known_players})
+        collect(pd.DataFrame({"Player Name": unknown & ~blank["Player Name"]}), "Player not found in Squad")
+
+    errors = pd.concat(problems, ignore_index=True) if problems else pd.DataFrame(columns=["Row", "Column", "Value", "Error"])
+    errors = errors.sort_values(["Row", "Column"], kind="stable").reset_index(drop=True)
+
+    valid = pd.concat([meta, numbers, is_true], axis=1)[headers]
+    bad_rows = set(errors["Row"].dropna())
+    valid = valid[~row_numbers.isin(bad_rows)].reset_index(drop=True)
+    valid[count_cols] = valid[count_cols].astype("int64")
+    return valid, errors
+
+
+def prepare_match_import(uploaded_file, headers, known_players=None):
+    """Read, map and validate a bulk match file.
+
+    Returns (valid_df, errors_df, unmapped_columns).
+    """
+    raw = read_match_file(uploaded_file)
+    mapped, unmapped = map_columns(raw, headers)
+    valid, errors = validate_match_rows(mapped, headers, known_players)
+    return valid, errors, unmapped
@@ -0,0 +1,107 @@
+import pickle
+import time
+import zlib
+
+import pandas as pd
+
+# Sheets unread for this long are compressed on the next sweep
+IDLE_SECONDS = 10 * 60
+# Sheets smaller than this stay decoded (compressing them saves next to nothing)
+MIN_BYTES = 256 * 1024
+# zlib level: 1 is fast and already gets most of the gain on repetitive sheet data
+COMPRESSION_LEVEL = 1
+
+
+class ColdSheet:
+    """A sheet held as independently compressed columns.
+
+    len() and .empty work without decoding, so row counts and emptiness
+    checks do not bring a sheet back.
+    """
+
+    def __init__(self, df, level=COMPRESSION_LEVEL):
+        self.columns = list(df.columns)
+        self.index = df.index
+        self.raw_bytes = int(df.memory_usage(deep=True).sum())
+        self.blobs = [
+            zlib.compress(pickle.dumps(df[col].array, protocol=5), level)
+            for col in self.columns
+        ]
+        self.nbytes = sum(len(b) for b in self.blobs)
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def empty(self):
+        return len(self.index) == 0 or not self.columns
+
+    def decode(self):
+        return pd.DataFrame(
+            {col: pickle.loads(zlib.decompress(blob)) for col, blob in zip(self.columns, self.blobs)},
+            index=self.index,
+            columns=self.columns,
+        )
+
+
+class ColdStorage:
+    """Policy and counters for compressing a DataManager's idle sheets.
+
+    DataManager records every sheet read here. sweep() compresses sheets
+    that have not been read for idle_seconds, and reads of a compressed
+    sheet decode it again (a miss). Reads of decoded sheets are hits.
+    """
+
+    def __init__(self, idle_seconds=IDLE_SECONDS, min_bytes=MIN_BYTES, level=COMPRESSION_LEVEL):
+        self.idle_seconds = idle_seconds
+        self.min_bytes = min_bytes
+        self.level = level
+        self.last_read = {}   # {sheet: time of last read}
+        self.hits = 0
+        self.misses = 0
+        self.frozen = 0
+        self.decode_seconds = 0.0
+
+    def touch(self, name):
+        """Count a write as a use, so fresh sheets are not compressed straight away."""
+        self.last_read[name] = time.time()
+
+    def read(self, data, name):
+        """The decoded sheet, decoding (and keeping decoded) a cold one."""
+        self.last_read[name] = time.time()
+        value = data[name]
+        if isinstance(value, ColdSheet):
+            start = time.perf_counter()
+            value = data[name] = value.decode()
+            self.decode_seconds += time.perf_counter() - start
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def sweep(self, data, now=None, skip=()):
+        """Compress idle sheets in place (except those in skip); returns the names compressed."""
+        now = time.time() if now is None else now
+        frozen = []
+        for name, value in list(data.items()):
+            if name in skip or isinstance(value, ColdSheet) or now - self.last_read.get(name, now) < self.idle_seconds:
+                continue
+            if value.memory_usage(deep=True).sum() < self.min_bytes:
+                continue
+            data[name] = ColdSheet(value, self.level)
+            frozen.append(name)
+        self.frozen += len(frozen)
+        return frozen
+
+    def stats(self, data):
+        """Counters plus the decoded/compressed size of every sheet currently cold."""
+        cold = {name: v for name, v in data.items() if isinstance(v, ColdSheet)}
+        return {
+            "Hits": self.hits,
+            "Misses": self.misses,
+            "Sheets Compressed": self.frozen,
+            "Cold Sheets": ", ".join(cold) or "-",
+            "Cold Raw Bytes": sum(v.raw_bytes for v in cold.values()),
+            "Cold Compressed Bytes": sum(v.nbytes for v in cold.values()),
+            "Decode Seconds": round(self.decode_seconds, 3),
+        }
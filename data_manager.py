@@ -1,5 +1,31 @@
+import numpy as np
 import pandas as pd
 import io
+import threading
+import weakref
+from contextlib import contextmanager
+import analytics
+import archive
+import cold_storage
+import development
+import dimensions
+import excel_export
+import integrity
+import memory
+import partitions
+import reconcile
+import transfers
+from analytics import MATCH_BOOLEAN_COLUMNS, MATCH_META_COLUMNS
+from filter_index import FilterIndex
+from head_to_head import HeadToHeadIndex
+from leaderboard import LeaderboardIndex
+from profiling import Profiler, profiled
+from similarity import SimilarityIndex
+
+# Rows per to_excel call when an export reports progress
+EXPORT_CHUNK_ROWS = 5000
+# Cache miss marker (None is a valid cached value)
+_MISSING = object()
 
 class DataManager:
     def __init__(self):
@@ -35,40 +61,637 @@ class DataManager:
         }
         self.data = {name: pd.DataFrame(columns=self.headers[name]) for name in self.worksheet_names}
         self.current_save_name = "MySave"
+        # {rule name: Index of violating MatchStats rows}, refreshed whenever MatchStats changes
+        self.integrity_report = {}
+        # Stage timings (off by default; toggled from the dashboard's profile panel)
+        self.profiler = Profiler()
+        # Per-column before/after table from the last optimize_memory() call
+        self.last_memory_report = None
+        # Bumped on every sheet change; derived structures are cached per version
+        self.version = 0
+        self._cache = {}
+        # Guards version bumps against cache stores from worker threads (warm-up)
+        self._cache_lock = threading.Lock()
+        # Per-thread flag set by background_reads()
+        self._local = threading.local()
+        # Serializes sheet replacement with compression by another session's thread (store eviction)
+        self._sheet_lock = threading.Lock()
+        # Process-wide SharedStore this session's sheets are interned in (None = private copies)
+        self.store = None
+        self.session_id = None
+        # Idle sheets are compressed in place; every internal read goes through _sheet()
+        self.cold = cold_storage.ColdStorage()
+        # {dimension: Index of values} once surrogate keys are enabled; keyed columns then hold integer ids
+        self.dims = None
+        # Callables fn(dm, worksheet_name) run after every sheet replacement (e.g. autosave)
+        self._listeners = []
+        # {season: FrozenSeason} for closed MatchStats seasons (their rows can no longer be edited)
+        self.closed_seasons = {}
+        # ArchiveStore once archive mode is on; {season: Partition} for this save's seasons moved to disk
+        self.archive = None
+        self.archived_seasons = {}
 
+    @profiled("DataManager.load_from_bytes", rows=lambda self, *_: sum(len(df) for df in self.data.values()))
     def load_from_bytes(self, file_bytes):
         """Load data from an Excel byte stream (uploaded file)."""
         try:
             # Load all sheets
-            xls = pd.read_excel(file_bytes, sheet_name=None)
-            for sheet in self.worksheet_names:
-                if sheet in xls:
-                    self.data[sheet] = xls[sheet]
-                else:
-                    self.data[sheet] = pd.DataFrame(columns=self.headers[sheet])
+            with self.profiler.stage("Excel parsing"):
+                xls = pd.read_excel(file_bytes, sheet_name=None)
+            self._load_sheets(xls)
             return True, "Data loaded successfully."
         except Exception as e:
             return False, f"Error loading data: {e}"
 
-    def save_to_bytes(self):
-        """Save current data to an Excel byte stream for download."""
+    def load_from_frames(self, sheets):
+        """Load data from {sheet: DataFrame} (e.g. an autosave snapshot)."""
+        try:
+            self._load_sheets(sheets)
+            return True, "Snapshot restored successfully."
+        except Exception as e:
+            return False, f"Error restoring snapshot: {e}"
+
+    def _load_sheets(self, sheets):
+        self.closed_seasons = {}
+        # Archived seasons belong to the save being replaced (other saves archived for comparison stay)
+        for partition in self.archived_seasons.values():
+            self.archive.remove(partition.save, partition.season)
+        self.archived_seasons = {}
+        if self.dims is not None:
+            # Fresh ids for the new save
+            self.dims = dimensions.build(sheets)
+        for sheet in self.worksheet_names:
+            if sheet in sheets:
+                self._set_sheet(sheet, sheets[sheet])
+            else:
+                self._set_sheet(sheet, pd.DataFrame(columns=self.headers[sheet]))
+        self._touch()
+        self.check_integrity()
+
+    @profiled("DataManager.save_to_bytes", rows=lambda self, *_: sum(len(df) for df in self.data.values()))
+    def save_to_bytes(self, progress=None, streaming=False):
+        """Save current data to an Excel byte stream for download.
+
+        progress(rows_written, total_rows) is called as chunks of rows are written.
+        streaming=True uses the write-only exporter (lower peak memory on big saves).
+        """
+        sheets = {name: self._sheet(name) for name in list(self.data)}  # sheets are replaced, never edited, so this is a stable snapshot
+        if self.archived_seasons:
+            # Archived seasons are exported too, read from disk chunk by chunk
+            sheets["MatchStats"] = archive.ChunkedSheet(self._archived_partitions(), sheets["MatchStats"])
         output = io.BytesIO()
+        if streaming:
+            excel_export.write_streaming(sheets, output, progress)
+            output.seek(0)
+            return output
+        # The default writer needs whole frames
+        sheets = {name: df.frame() if isinstance(df, archive.ChunkedSheet) else df for name, df in sheets.items()}
+        total = sum(len(df) for df in sheets.values())
+        written = 0
         with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            for name, df in self.data.items():
-                df.to_excel(writer, sheet_name=name, index=False)
+            for name, df in sheets.items():
+                if progress is None or len(df) <= EXPORT_CHUNK_ROWS:
+                    df.to_excel(writer, sheet_name=name, index=False)
+                else:
+                    for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+                        chunk = df.iloc[start:start + EXPORT_CHUNK_ROWS]
+                        # Row 0 is the header, so data chunk k starts at row start + 1
+                        chunk.to_excel(writer, sheet_name=name, index=False, header=start == 0,
+                                       startrow=0 if start == 0 else start + 1)
+                        if start + EXPORT_CHUNK_ROWS < len(df):
+                            progress(written + start + len(chunk), total)
+                written += len(df)
+                if progress is not None:
+                    progress(written, total)
         output.seek(0)
         return output
 
     def get_data(self, worksheet_name) -> pd.DataFrame:
         """Fetch all records from a worksheet in memory."""
-        return self.data.get(worksheet_name, pd.DataFrame(columns=self.headers.get(worksheet_name, [])))
+        df = self._sheet(worksheet_name)
+        if self.store is not None:
+            # Shared frames are never edited in place: callers get a copy-on-write view
+            return df.copy(deep=False)
+        return df
 
+    @profiled("DataManager.write_data", rows=lambda self, result, worksheet_name, df: len(df))
     def write_data(self, worksheet_name, df: pd.DataFrame):
         """Overwrite a specific worksheet in memory."""
-        self.data[worksheet_name] = df
+        if worksheet_name == "MatchStats":
+            self._check_closed_unchanged(df)
+        self._set_sheet(worksheet_name, df)
+        self._touch()
+        if worksheet_name == "MatchStats":
+            self.check_integrity()
 
+    @profiled("DataManager.append_data", rows=lambda self, result, worksheet_name, df: len(df))
     def append_data(self, worksheet_name, df: pd.DataFrame):
         """Append rows to a specific worksheet in memory."""
-        current = self.data.get(worksheet_name, pd.DataFrame(columns=self.headers.get(worksheet_name, [])))
+        if worksheet_name == "MatchStats" and self.closed_seasons and "Season" in df.columns:
+            closed = sorted(set(partitions.season_key(df["Season"])) & set(self.closed_seasons))
+            if closed:
+                raise ValueError(f"Season {closed[0]} is closed; reopen it before adding matches to it.")
+        current = self._sheet(worksheet_name)
         updated = pd.concat([current, df], ignore_index=True)
-        self.data[worksheet_name] = updated
+        # Appends extend the head-to-head index instead of rebuilding it for the new version.
+        # The new index is built before anything is committed and replaces (never edits) the old one.
+        h2h = self._cache.get("head_to_head") if worksheet_name == "MatchStats" else None
+        if h2h is not None:
+            h2h = h2h.extended(df)
+        self._set_sheet(worksheet_name, updated)
+        self._touch()
+        if h2h is not None:
+            with self._cache_lock:
+                self._cache["head_to_head"] = h2h
+        if worksheet_name == "MatchStats":
+            self.check_integrity()
+
+    def _set_sheet(self, worksheet_name, df):
+        """Replace one sheet, going through the shared store when attached."""
+        grown = set()
+        if self.dims is not None:
+            sizes = {dim: len(values) for dim, values in self.dims.items()}
+            df = dimensions.encode_sheet(worksheet_name, df, self.dims)
+            grown = {dim for dim, values in self.dims.items() if len(values) != sizes.get(dim, 0)}
+        if self.store is not None:
+            df = self.store.replace(self.session_id, worksheet_name, df)
+        with self._sheet_lock:
+            self.data[worksheet_name] = df
+        self.cold.touch(worksheet_name)
+        for listener in list(self._listeners):
+            listener(self, worksheet_name)
+        if grown:
+            # New ids were appended: re-key the other sheets on the same dimensions so joins stay on codes
+            for other in list(self.data):
+                if other != worksheet_name and grown & set(dimensions.sheet_columns(other).values()):
+                    self._set_sheet(other, self._sheet(other))
+
+    def enable_surrogate_keys(self):
+        """Store players, seasons, competitions and opponents as integer ids into shared dimensions."""
+        self.dims = dimensions.build(self._decoded())
+        for name, df in self._decoded().items():
+            self._set_sheet(name, df)
+        self._touch()
+
+    def dimension_table(self, dim) -> pd.DataFrame:
+        """ID, value and row counts of one dimension (players, seasons, competitions, opponents)."""
+        if self.dims is None:
+            return pd.DataFrame(columns=["ID", "Value"])
+        return dimensions.table(self.dims, dim, self._decoded())
+
+    def rename_dimension_value(self, dim, old, new):
+        """Rename a player/opponent/competition/season everywhere by changing its dimension row.
+
+        Returns the sheets that changed.
+        """
+        if self.dims is None:
+            raise ValueError("Surrogate keys are not enabled.")
+        changed = dimensions.rename(self.dims, dim, old, new, self._decoded())
+        for sheet, df in changed.items():
+            self._set_sheet(sheet, df)
+        if changed:
+            self._touch()
+            self.check_integrity()
+            if "MatchStats" in changed:
+                # Frozen aggregates are keyed by the old value
+                for season in list(self.closed_seasons):
+                    if season not in self.archived_seasons:  # archived seasons keep the names they were archived with
+                        self.close_season(season)
+        return list(changed)
+
+    def add_listener(self, fn):
+        """Call fn(dm, worksheet_name) after every sheet replacement."""
+        if fn not in self._listeners:
+            self._listeners.append(fn)
+
+    def remove_listener(self, fn):
+        if fn in self._listeners:
+            self._listeners.remove(fn)
+
+    def attach_store(self, store, session_id):
+        """Share this session's sheets through a process-wide SharedStore."""
+        self.store = store
+        self.session_id = session_id
+        self.data = store.register(session_id, self._decoded(), on_evict=self._release_frames)
+
+    def keep_alive(self):
+        """Mark the session active in the shared store, registering again if it was evicted."""
+        if self.store is not None and not self.store.touch(self.session_id):
+            self.data = self.store.register(self.session_id, self._decoded(), on_evict=self._release_frames)
+        self.compress_idle()
+
+    def _release_frames(self):
+        """Called by the store (on another session's thread) when this session is evicted.
+
+        The store no longer counts our frames, so keep them only compressed;
+        the next keep_alive() decodes and registers them again.
+        """
+        for name, value in list(self.data.items()):
+            if isinstance(value, cold_storage.ColdSheet):
+                continue
+            cold = cold_storage.ColdSheet(value, self.cold.level)
+            with self._sheet_lock:
+                if self.data.get(name) is value:  # not replaced while compressing
+                    self.data[name] = cold
+
+    def compress_idle(self):
+        """Move sheets that have not been read for a while into cold storage."""
+        if self.store is None:
+            return self.cold.sweep(self.data)
+        # Frames other sessions also use stay decoded; compressing only this session's view would add a copy
+        shared = [name for name in self.data if not self.store.exclusive(self.session_id, name)]
+        frozen = self.cold.sweep(self.data, skip=shared)
+        for name in frozen:
+            self.store.swap(self.session_id, name, self.data[name])
+        return frozen
+
+    @contextmanager
+    def background_reads(self):
+        """Sheet reads on this thread (a worker) decode cold sheets privately.
+
+        Nothing is written back to self.data or the shared store and last-read
+        times are left alone, so workers cannot overwrite a sheet the script
+        thread just replaced, nor keep idle sheets from going cold.
+        """
+        self._local.background = True
+        try:
+            yield
+        finally:
+            self._local.background = False
+
+    def _sheet(self, worksheet_name):
+        """Decoded sheet (brought back from cold storage if needed)."""
+        if worksheet_name not in self.data:
+            return pd.DataFrame(columns=self.headers.get(worksheet_name, []))
+        if getattr(self._local, "background", False):
+            value = self.data[worksheet_name]
+            return value.decode() if isinstance(value, cold_storage.ColdSheet) else value
+        was_cold = isinstance(self.data[worksheet_name], cold_storage.ColdSheet)
+        df = self.cold.read(self.data, worksheet_name)
+        if was_cold and self.store is not None:
+            self.store.swap(self.session_id, worksheet_name, df)
+        return df
+
+    def _decoded(self):
+        return {name: self._sheet(name) for name in list(self.data)}
+
+    def _touch(self):
+        """Mark the data as changed so everything cached for the old version is rebuilt."""
+        with self._cache_lock:
+            self.version += 1
+            self._cache.clear()
+
+    def cached(self, key, builder):
+        """Return builder() computed once per data version.
+
+        Safe to call from worker threads: a result built while the data
+        changed underneath it is returned but not cached for the new version.
+        """
+        value = self._cache.get(key, _MISSING)
+        if value is _MISSING:
+            version = self.version
+            value = builder()
+            # Check and store under the lock so a _touch() cannot slip in between
+            with self._cache_lock:
+                if version == self.version:
+                    self._cache[key] = value
+        return value
+
+    def filter_index(self) -> FilterIndex:
+        """Bitmap index over the MatchStats Season/Competition/Opponent columns."""
+        return self.cached("filter_index", lambda: FilterIndex(self._sheet("MatchStats")))
+
+    def prepared_match_stats(self):
+        """MatchStats with numeric stats and stripped Name/Season keys (analytics.prepare_match_stats)."""
+        return self.cached("prepared_match_stats", lambda: analytics.prepare_match_stats(self._sheet("MatchStats")))
+
+    def merged_match_stats(self):
+        """Prepared MatchStats with Squad info (positions, nationality, age) merged in."""
+        return self.cached("merged_match_stats", lambda: analytics.merge_squad_info(
+            self.prepared_match_stats(), analytics.prepare_squad_info(self._sheet("Squad"))))
+
+    def aggregate(self, season=None):
+        """Merged stats aggregated per (Player Name, Season), or per Player Name within one season."""
+        group_cols = ("Player Name",) if season is not None else ("Player Name", "Season")
+        def build():
+            if season in self.archived_seasons:
+                return self._partition_aggregate(self.archived_seasons[season], group_cols)
+            merged = self.merged_match_stats()
+            if season is not None:
+                idx = self.filter_index()
+                # Index masks line up with merged rows as long as the left merge kept one row per match row
+                merged = merged[idx.mask({"Season": season})] if len(merged) == idx.n_rows else merged[merged["Season"] == season]
+            agg = analytics.aggregate_stats(merged, list(group_cols))
+            if season is None and self.archived_seasons:
+                # Player-season groups never span seasons: archived seasons aggregate one at a time
+                parts = [self._partition_aggregate(p, group_cols) for p in self._archived_partitions()]
+                # An empty live aggregate would turn the stat columns into object dtype
+                agg = pd.concat(parts + ([agg] if len(agg) else []), ignore_index=True).sort_values(list(group_cols), kind="stable", ignore_index=True)
+            return agg
+        return self.cached(("aggregate", season or "All Seasons", group_cols), build)
+
+    def _partition_aggregate(self, partition, group_cols, squad_df=None):
+        """aggregate_stats over one archived partition (merged with squad_df, default the Squad sheet)."""
+        squad_df = self._sheet("Squad") if squad_df is None else squad_df
+        merged = analytics.merge_squad_info(analytics.prepare_match_stats(partition.frame()), analytics.prepare_squad_info(squad_df))
+        return analytics.aggregate_stats(merged, list(group_cols))
+
+    def player_seasons(self):
+        """Stats aggregated per (Player Name, Season) with Squad info merged in."""
+        return self.aggregate()
+
+    def leaderboard_index(self, season=None) -> LeaderboardIndex:
+        """Top/bottom stat rankings over aggregate(season)."""
+        return self.cached(("leaderboard", season or "All Seasons"),
+                           lambda: LeaderboardIndex(self.aggregate(season), analytics.STAT_COLUMNS))
+
+    def similarity_index(self, stats, min_minutes=0) -> SimilarityIndex:
+        """Nearest-neighbour index over per-90 profiles for the given stats."""
+        key = ("similarity", tuple(stats), min_minutes)
+        return self.cached(key, lambda: SimilarityIndex(self.player_seasons(), stats, min_minutes))
+
+    def development_frame(self):
+        """Squad player-seasons with growth, minutes and average rating (see development.development_frame)."""
+        return self.cached("development_frame", lambda: development.development_frame(self._sheet("Squad"), self.player_seasons()))
+
+    def development_model(self, min_minutes=0) -> development.DevelopmentModel:
+        """Growth model fitted over every player-season with at least min_minutes played."""
+        return self.cached(("development", min_minutes), lambda: development.DevelopmentModel(self.development_frame(), min_minutes))
+
+    def head_to_head(self) -> HeadToHeadIndex:
+        """Record, goals, scorers and fixtures per opponent and competition (extended in place on append)."""
+        def build():
+            index = HeadToHeadIndex()
+            for chunk in self._archived_chunks():
+                index.add(chunk)
+            index.add(self._sheet("MatchStats"))
+            return index
+        return self.cached("head_to_head", build)
+
+    def transfer_ledger(self):
+        """Parsed Transfers plus spend/wage aggregates per season and type (see transfers.build_ledger)."""
+        return self.cached("transfer_ledger", lambda: transfers.build_ledger(self._sheet("Transfers"), self._sheet("Squad")))
+
+    # --- Season partitions ---
+    def _season_rows(self, seasons):
+        df = self._sheet("MatchStats")
+        return df[self.filter_index().mask({"Season": list(seasons)})]
+
+    def close_season(self, season):
+        """Freeze one MatchStats season: aggregate it once and refuse further edits to its rows."""
+        season = str(season).strip()
+        rows = self._season_rows([season])
+        if rows.empty:
+            raise ValueError(f"No match stats for season {season}.")
+        self.closed_seasons[season] = partitions.FrozenSeason(season, rows)
+        return self.closed_seasons[season]
+
+    def reopen_season(self, season):
+        """Drop a season's frozen aggregates so its rows can be edited again (restoring it first if archived)."""
+        season = str(season).strip()
+        if season in self.archived_seasons:
+            self.restore_season(season)
+        self.closed_seasons.pop(season, None)
+
+    def _check_closed_unchanged(self, df):
+        if not self.closed_seasons or "Season" not in df.columns:
+            return
+        keys = partitions.season_key(df["Season"])
+        for season, frozen in self.closed_seasons.items():
+            rows = df[(keys == season).to_numpy()]
+            if season in self.archived_seasons:
+                if len(rows):
+                    raise ValueError(f"Season {season} is archived; restore it before editing its rows.")
+                continue
+            if len(rows) != frozen.rows or partitions.fingerprint(rows) != frozen.fingerprint:
+                raise ValueError(f"Season {season} is closed; reopen it before editing its rows.")
+
+    def season_partitions(self) -> pd.DataFrame:
+        """Season, Rows and Status (Open/Closed) for every MatchStats season."""
+        counts = {s: p.rows for s, p in self.archived_seasons.items()}
+        counts.update(self.filter_index().counts("Season"))
+        status = {s: "Archived" if s in self.archived_seasons else "Closed" if s in self.closed_seasons else "Open" for s in counts}
+        return pd.DataFrame({
+            "Season": list(counts),
+            "Rows": list(counts.values()),
+            "Status": [status[s] for s in counts],
+        })
+
+    def _open_rows(self):
+        """MatchStats rows of the seasons that are still open."""
+        def build():
+            seasons = [s for s in self.filter_index().values("Season") if s not in self.closed_seasons]
+            return self._season_rows(seasons)
+        return self.cached(("open_rows", tuple(sorted(self.closed_seasons))), build)
+
+    def player_totals(self, competitions=None, opponents=None):
+        """analytics.player_totals over all seasons (optionally some competitions and opponents).
+
+        Closed seasons contribute their frozen sums; only open seasons are aggregated.
+        Frozen sums are per competition, so an opponent filter aggregates rows
+        (archived seasons chunk by chunk).
+        """
+        competitions = tuple(competitions or ())
+        opponents = tuple(opponents or ())
+        if opponents:
+            return self.cached(("player_totals", competitions, opponents), lambda: self._filtered_player_totals(competitions, opponents))
+        def build():
+            live = self._open_rows()
+            if competitions:
+                live = live[live["Competition"].astype(str).isin([str(c) for c in competitions]).to_numpy()]
+            parts = [frozen.player_totals(competitions) for frozen in self.closed_seasons.values()]
+            parts.append(analytics.player_sums(live))
+            return analytics.finish_totals(partitions.combine_player_sums(parts))
+        return self.cached(("player_totals", competitions, tuple(sorted(self.closed_seasons))), build)
+
+    def _filtered_player_totals(self, competitions, opponents):
+        df = self._sheet("MatchStats")
+        parts = [analytics.player_sums(df[self.filter_index().mask({"Competition": list(competitions), "Opponent": list(opponents)})])]
+        wanted = {"Competition": {str(c) for c in competitions}, "Opponent": {str(o) for o in opponents}}
+        for chunk in self._archived_chunks():
+            keep = np.ones(len(chunk), dtype=bool)
+            for col, values in wanted.items():
+                if values:
+                    keep &= chunk[col].astype(str).isin(values).to_numpy()
+            if keep.any():
+                parts.append(analytics.player_sums(chunk[keep]))
+        return analytics.finish_totals(partitions.combine_player_sums(parts))
+
+    def team_record(self, season, competition=None):
+        """W/D/L for one season (and competition), from frozen aggregates when the season is closed."""
+        frozen = self.closed_seasons.get(str(season).strip())
+        if frozen is not None:
+            return frozen.team_record([competition] if competition else None)
+        return self.cached(("team_record", season, competition),
+                           lambda: analytics.team_record(self._team_rows(season, competition)))
+
+    def team_totals(self, season, competition=None):
+        """Team stat totals for one season (and competition)."""
+        frozen = self.closed_seasons.get(str(season).strip())
+        if frozen is not None:
+            return frozen.team_totals([competition] if competition else None)
+        return self.cached(("team_totals", season, competition),
+                           lambda: analytics.team_totals(self._team_rows(season, competition)))
+
+    def _team_rows(self, season, competition):
+        df = self._sheet("MatchStats")
+        return df[self.filter_index().mask({"Season": season, "Competition": competition})]
+
+    # --- Archive ---
+    def enable_archive(self, root=None):
+        """Keep archived seasons as memory-mapped column files under root (default archive.ARCHIVE_DIR).
+
+        Files go to a folder of this DataManager's own, deleted when it is garbage collected.
+        """
+        if self.archive is None:
+            self.archive = archive.session_store(root or archive.ARCHIVE_DIR)
+            weakref.finalize(self, self.archive.clear)
+        return self.archive
+
+    def _archived_partitions(self):
+        return [self.archived_seasons[s] for s in sorted(self.archived_seasons)]
+
+    def _archived_chunks(self, columns=None):
+        """MatchStats rows of the archived seasons, one bounded chunk at a time."""
+        for partition in self._archived_partitions():
+            yield from partition.chunks(columns)
+
+    def archive_season(self, season):
+        """Close a season, write its rows to the archive and drop them from memory.
+
+        Its frozen aggregates keep serving totals and W/D/L; row-level queries
+        read it back from disk one chunk at a time.
+        """
+        if self.archive is None:
+            raise ValueError("Archive mode is not enabled.")
+        season = str(season).strip()
+        if season in self.archived_seasons:
+            return self.archived_seasons[season]
+        if season not in self.closed_seasons:
+            self.close_season(season)
+        df = self._sheet("MatchStats")
+        in_season = self.filter_index().mask({"Season": season})
+        partition = self.archive.add(self.current_save_name, season, df[in_season].reset_index(drop=True))
+        squad = self._sheet("Squad")
+        self.archive.add(self.current_save_name, season, squad[(partitions.season_key(squad["Season"]) == season).to_numpy()], sheet="Squad")
+        self.archived_seasons[season] = partition
+        self._set_sheet("MatchStats", df[~in_season].reset_index(drop=True))
+        self._touch()
+        self.check_integrity()
+        return partition
+
+    def restore_season(self, season):
+        """Bring an archived season's rows back into memory (it stays closed) and delete its files."""
+        season = str(season).strip()
+        partition = self.archived_seasons.pop(season)
+        rows = partition.frame()
+        self._set_sheet("MatchStats", pd.concat([rows, self._sheet("MatchStats")], ignore_index=True))
+        self._touch()
+        self.check_integrity()
+        self.archive.remove(partition.save, season)
+
+    def archive_save(self, save_name, sheets):
+        """Archive another save's MatchStats and Squad season by season (for cross-save comparison).
+
+        Nothing is loaded into this session. Returns the seasons archived.
+        """
+        if self.archive is None:
+            raise ValueError("Archive mode is not enabled.")
+        if save_name == self.current_save_name:
+            raise ValueError("Use a different name from the save you are working on.")
+        match_df = sheets.get("MatchStats", pd.DataFrame(columns=self.headers["MatchStats"]))
+        squad_df = sheets.get("Squad", pd.DataFrame(columns=self.headers["Squad"]))
+        match_keys = partitions.season_key(match_df["Season"])
+        squad_keys = partitions.season_key(squad_df["Season"])
+        seasons = list(dict.fromkeys(match_keys))
+        for season in seasons:
+            self.archive.add(save_name, season, match_df[(match_keys == season).to_numpy()].reset_index(drop=True))
+            self.archive.add(save_name, season, squad_df[(squad_keys == season).to_numpy()].reset_index(drop=True), sheet="Squad")
+        self._touch()
+        return seasons
+
+    def compare_saves(self):
+        """Player-season aggregates of this save plus every other archived save, with a Save column.
+
+        Other saves are aggregated one season partition at a time, each merged with its own archived Squad rows.
+        """
+        def build():
+            own = {p.folder for p in self.archived_seasons.values()}
+            frames = [self.aggregate().assign(Save=self.current_save_name)]
+            for partition in self.archive.partitions() if self.archive is not None else []:
+                if partition.folder in own:
+                    continue
+                squad = self.archive.get(partition.save, partition.season, sheet="Squad")
+                squad_df = squad.frame() if squad is not None else pd.DataFrame(columns=self.headers["Squad"])
+                frames.append(self._partition_aggregate(partition, ("Player Name", "Season"), squad_df).assign(Save=partition.save))
+            return pd.concat(frames, ignore_index=True)
+        return self.cached("compare_saves", build)
+
+    def filter_values(self, column):
+        """Distinct Season/Competition/Opponent values, archived seasons included."""
+        values = self.filter_index().values(column)
+        if column == "Season":
+            extra = sorted(self.archived_seasons)
+            return extra + [v for v in values if v not in self.archived_seasons]
+        seen = set(values)
+        for partition in self._archived_partitions():
+            for v in partition.values(column):
+                if v not in seen and v is not None:
+                    seen.add(v)
+                    values.append(v)
+        return values
+
+    def stat_columns(self):
+        """Numeric stat columns of the MatchStats sheet (everything but metadata and flags)."""
+        return [c for c in self.headers["MatchStats"] if c not in MATCH_META_COLUMNS and c not in MATCH_BOOLEAN_COLUMNS]
+
+    @profiled("DataManager.check_integrity", rows=lambda self, *_: len(self.data["MatchStats"]))
+    def check_integrity(self):
+        """Run the MatchStats integrity rules over the whole sheet and store the report."""
+        self.integrity_report = integrity.check_match_stats(self._sheet("MatchStats"), self.stat_columns())
+        return self.integrity_report
+
+    def rename_players(self, renames: pd.DataFrame):
+        """Batch-rename players across MatchStats and Transfers.
+
+        renames has columns Player Name, Season, New Name. Returns {sheet: rows changed}.
+        """
+        changed = {}
+        for sheet in ["MatchStats", "Transfers"]:
+            updated, count = reconcile.apply_renames(self._sheet(sheet), renames)
+            if count:
+                self.write_data(sheet, updated)
+            changed[sheet] = count
+        return changed
+
+    def memory_usage(self) -> pd.DataFrame:
+        """Deep memory usage (bytes) per sheet and column.
+
+        Cold sheets are reported at their compressed size (Dtype "compressed")
+        without being decoded.
+        """
+        decoded = {name: df for name, df in self.data.items() if not isinstance(df, cold_storage.ColdSheet)}
+        usage = memory.deep_usage(decoded)
+        cold = [
+            (name, col, "compressed", len(blob))
+            for name, sheet in self.data.items() if isinstance(sheet, cold_storage.ColdSheet)
+            for col, blob in zip(sheet.columns, sheet.blobs)
+        ]
+        if not cold:
+            return usage
+        usage = pd.concat([usage, pd.DataFrame(cold, columns=usage.columns)], ignore_index=True)
+        return usage.astype({"Bytes": "int64"})
+
+    @profiled("DataManager.optimize_memory", rows=lambda self, *_: sum(len(df) for df in self.data.values()))
+    def optimize_memory(self):
+        """Downcast numeric columns and turn repeated strings into categoricals in every sheet.
+
+        Values are unchanged. Returns (and keeps) a per-column before/after usage table.
+        """
+        decoded = self._decoded()
+        before = memory.deep_usage(decoded)
+        for name, df in decoded.items():
+            self._set_sheet(name, memory.optimize_frame(df))
+        self._touch()
+        self.last_memory_report = memory.compare_usage(before, memory.deep_usage(self._decoded()))
+        return self.last_memory_report
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+# Age enters the model centred here (the curve's terms read as "per year from 25")
+AGE_CENTRE = 25
+# Minutes enter the model in thousands
+MINUTES_SCALE = 1000
+BASE_TERMS = ["Intercept", f"Age - {AGE_CENTRE}", f"(Age - {AGE_CENTRE})²", "Minutes (1000s)", "Avg Rating"]
+
+
+def _key(s):
+    return s.astype(str).str.strip()
+
+
+def development_frame(squad_df, player_seasons):
+    """One row per Squad player-season with Growth (Overall End - Overall Start) and the model inputs.
+
+    Minutes Played and Avg Rating come from the player-season aggregate
+    (0 minutes and no rating for players without match rows).
+    """
+    frame = pd.DataFrame({
+        "Player Name": _key(squad_df["Name"]),
+        "Season": _key(squad_df["Season"]),
+        "Age": pd.to_numeric(squad_df["Age"], errors='coerce'),
+        "Role": _key(squad_df["Role"]).where(squad_df["Role"].notna().to_numpy(), "Unknown"),
+        "Overall Start": pd.to_numeric(squad_df["Overall Start"], errors='coerce'),
+        "Overall End": pd.to_numeric(squad_df["Overall End"], errors='coerce'),
+    }).drop_duplicates(["Player Name", "Season"])
+    played = pd.DataFrame({
+        "_name": _key(player_seasons["Player Name"]).str.lower(),
+        "_season": _key(player_seasons["Season"]).str.lower(),
+        "Minutes Played": pd.to_numeric(player_seasons["Minutes Played"], errors='coerce'),
+        "Avg Rating": pd.to_numeric(player_seasons["Match Rating"], errors='coerce'),
+    }).drop_duplicates(["_name", "_season"])
+    frame["_name"] = frame["Player Name"].str.lower()
+    frame["_season"] = frame["Season"].str.lower()
+    frame = frame.merge(played, on=["_name", "_season"], how="left").drop(columns=["_name", "_season"])
+    frame["Minutes Played"] = frame["Minutes Played"].fillna(0)
+    frame["Growth"] = frame["Overall End"] - frame["Overall Start"]
+    return frame
+
+
+class DevelopmentModel:
+    """Pooled least-squares model of season growth over every player-season.
+
+    Growth ~ age curve + minutes + average rating + role, solved once with
+    np.linalg.lstsq on the stacked design matrix (no per-player fits).
+    Player-seasons without an age or both overalls are left out of the fit;
+    a missing rating is filled with the mean rating of the fitted rows.
+    """
+
+    def __init__(self, frame, min_minutes=0):
+        usable = frame["Age"].notna() & frame["Growth"].notna() & (frame["Minutes Played"] >= min_minutes)
+        self.fitted = frame[usable.to_numpy()].reset_index(drop=True)
+        self.roles = sorted(self.fitted["Role"].unique())
+        rating = self.fitted["Avg Rating"]
+        self.rating_fill = float(rating.mean()) if rating.notna().any() else 0.0
+        # First role is the baseline; the others get an offset each
+        self.terms = BASE_TERMS + [f"Role: {r}" for r in self.roles[1:]]
+        self.n = len(self.fitted)
+        self.coef = np.full(len(self.terms), np.nan)
+        self.r2 = np.nan
+        self.rmse = np.nan
+        self.rank = 0
+        if self.n == 0:
+            return
+        X = self.design(self.fitted)
+        y = self.fitted["Growth"].to_numpy(dtype=float)
+        self.coef, _, self.rank, _ = np.linalg.lstsq(X, y, rcond=None)
+        predicted = X @ self.coef
+        self.fitted["Predicted Growth"] = predicted
+        self.fitted["Residual"] = y - predicted
+        ss_res = float(np.sum((y - predicted) ** 2))
+        ss_tot = float(np.sum((y - y.mean()) ** 2))
+        self.r2 = 1 - ss_res / ss_tot if ss_tot > 0 else np.nan
+        self.rmse = float(np.sqrt(ss_res / self.n))
+
+    def design(self, frame, age_offset=0):
+        """Design matrix (rows x terms) for frame; age_offset shifts every age (1 = next season)."""
+        age = frame["Age"].to_numpy(dtype=float) + age_offset - AGE_CENTRE
+        rating = frame["Avg Rating"].fillna(self.rating_fill).to_numpy(dtype=float)
+        role = frame["Role"].to_numpy()
+        columns = [
+            np.ones(len(frame)),
+            age,
+            age ** 2,
+            frame["Minutes Played"].to_numpy(dtype=float) / MINUTES_SCALE,
+            rating,
+        ] + [(role == r).astype(float) for r in self.roles[1:]]
+        return np.column_stack(columns)
+
+    def coefficients(self):
+        return pd.DataFrame({"Term": self.terms, "Coefficient": self.coef})
+
+    def project(self, frame):
+        """Projected next-season overall for each player's latest season.
+
+        Next season is the latest one with age + 1 and the same minutes, rating
+        and role; the start overall is taken as the latest Overall End.
+        """
+        columns = ["Player Name", "Season", "Age", "Role", "Minutes Played", "Avg Rating",
+                   "Overall End", "Projected Growth", "Projected Overall"]
+        latest = frame[frame["Age"].notna() & frame["Overall End"].notna()]
+        latest = latest.sort_values("Season").drop_duplicates("Player Name", keep="last").reset_index(drop=True)
+        if latest.empty or self.n == 0:
+            return pd.DataFrame(columns=columns)
+        growth = self.design(latest, age_offset=1) @ self.coef
+        latest["Projected Growth"] = growth
+        latest["Projected Overall"] = np.clip(latest["Overall End"].to_numpy(dtype=float) + growth, 1, 99)
+        return latest[columns].sort_values("Projected Overall", ascending=False, ignore_index=True)
@@ -0,0 +1,103 @@
+import pandas as pd
+
+# Dimension -> (sheet, column) pairs whose values it keys.
+# A dimension's integer ids are shared by every column listed, so the same
+# player has the same id in Squad, Transfers and MatchStats.
+DIMENSIONS = {
+    "players": [("Squad", "Name"), ("Transfers", "Player Name"), ("MatchStats", "Player Name")],
+    "seasons": [("Squad", "Season"), ("Transfers", "Season"), ("MatchStats", "Season")],
+    "competitions": [("MatchStats", "Competition")],
+    "opponents": [("MatchStats", "Opponent")],
+}
+
+
+def sheet_columns(sheet):
+    """{column: dimension} for the keyed columns of one sheet."""
+    return {col: dim for dim, pairs in DIMENSIONS.items() for s, col in pairs if s == sheet}
+
+
+def _values(s):
+    values = s.cat.categories[s.cat.codes[s.cat.codes >= 0].unique()] if isinstance(s.dtype, pd.CategoricalDtype) else s.dropna().unique()
+    return pd.Index(values, dtype=object)
+
+
+def extend(dims, dim, s):
+    """Append values of s missing from the dimension; existing ids never change."""
+    current = dims.get(dim, pd.Index([], dtype=object))
+    new = _values(s)
+    new = new[~new.isin(current)]
+    if len(new):
+        dims[dim] = current.append(new)
+    else:
+        dims[dim] = current
+    return dims[dim]
+
+
+def encode_sheet(sheet, df, dims):
+    """df with its keyed columns stored as integer codes into the (extended) dimensions.
+
+    The columns become categoricals over the full dimension, so the codes are
+    the surrogate ids and values read back unchanged (Excel export stays flat).
+    """
+    columns = {col: dim for col, dim in sheet_columns(sheet).items() if col in df.columns}
+    if not columns:
+        return df
+    out = df.copy(deep=False)
+    for col, dim in columns.items():
+        categories = extend(dims, dim, df[col])
+        s = df[col]
+        if isinstance(s.dtype, pd.CategoricalDtype) and s.cat.categories.equals(categories):
+            continue  # already keyed on the current dimension
+        out[col] = pd.Categorical(s.astype(object), categories=categories)
+    return out
+
+
+def build(sheets):
+    """Dimensions over all sheets ({sheet: df}), in first-appearance order."""
+    dims = {}
+    for dim, pairs in DIMENSIONS.items():
+        for sheet, col in pairs:
+            if sheet in sheets and col in sheets[sheet].columns:
+                extend(dims, dim, sheets[sheet][col])
+    return dims
+
+
+def table(dims, dim, sheets):
+    """Dimension table: ID, Value and the number of rows using it per sheet."""
+    values = dims.get(dim, pd.Index([], dtype=object))
+    out = pd.DataFrame({"ID": range(len(values)), "Value": values})
+    for sheet, col in DIMENSIONS[dim]:
+        if sheet in sheets and col in sheets[sheet].columns and isinstance(sheets[sheet][col].dtype, pd.CategoricalDtype):
+            codes = sheets[sheet][col].cat.codes.to_numpy()
+            out[f"{sheet} Rows"] = pd.Series(codes[codes >= 0]).value_counts().reindex(out["ID"], fill_value=0).to_numpy()
+    return out
+
+
+def rename(dims, dim, old, new, sheets):
+    """Rename one dimension value in place; returns the re-keyed sheets that use it.
+
+    When new is not yet a value this is a single dimension-row change (the ids
+    stay put). If it already exists the two ids are merged onto the existing one.
+    """
+    values = dims[dim]
+    if old not in values:
+        return {}
+    merge = new in values
+    if not merge:
+        dims[dim] = pd.Index([new if v == old else v for v in values], dtype=object)
+    else:
+        dims[dim] = values[values != old]
+    changed = {}
+    for sheet, col in DIMENSIONS[dim]:
+        if sheet not in sheets or col not in sheets[sheet].columns:
+            continue
+        s = sheets[sheet][col]
+        if not isinstance(s.dtype, pd.CategoricalDtype) or old not in s.cat.categories:
+            continue
+        out = sheets[sheet].copy(deep=False)
+        if merge:
+            out[col] = pd.Categorical(s.astype(object).replace({old: new}), categories=dims[dim])
+        else:
+            out[col] = s.cat.rename_categories({old: new})
+        changed[sheet] = out
+    return changed
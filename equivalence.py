@@ -0,0 +1,431 @@
+"""Equivalence harness for the optimized aggregation paths.
+
+Builds randomized saves with edge cases (zero minutes, zero attempts, names
+that differ from the Squad only by case/whitespace or not at all in the
+Squad, int and text Season values, unreadable stat cells) and runs the
+reference: a frozen copy of the original pandas page logic of the Player
+Stats page (sums, calc_acc, per 90 / per game) and the Stats Dashboard
+(aggregate_stats, percentile ranks, radar normalization). It shares no
+code with analytics, so regressions in the shared functions are caught
+too. Every engine must produce the same outputs within tolerance;
+differences are reported column by column.
+
+An engine is a callable engine(match_df, squad_df) -> {output: DataFrame}
+with the outputs of reference_engine.
+
+Usage:
+    python equivalence.py
+    python equivalence.py --engines datamanager closed_seasons archived --seeds 0 1 2 3 --seasons 4
+"""
+import argparse
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import analytics
+import synthetic
+from data_manager import DataManager
+
+RADAR_ATTRS = ["Match Rating", "Goals", "Assists", "Passes Completed", "Dribbles Completed", "Tackles Completed",
+               "Interceptions", "Posession Won", "Posession Lost", "Key Passes"]
+PERCENTILE_STATS = ["Goals", "Assists", "Key Passes", "Tackles Completed", "Match Rating"]
+# Row key columns of each output (index levels are used when these are absent)
+OUTPUT_KEYS = {
+    "player_seasons": ["Player Name", "Season"],
+    "season_aggregate": ["Player Name"],
+    "percentiles": ["Player Name", "Stat"],
+    "radar": ["Player Name", "Season"],
+}
+
+
+# --- Data ---
+def edge_case_save(seed=0, seasons=3, matches=12, squad_size=18):
+    """(match_df, squad_df) from the synthetic generator with edge cases mixed in."""
+    rng = np.random.default_rng(seed)
+    labels = synthetic.season_labels(seasons)
+    squad_df, _ = synthetic.generate_squads(rng, labels, squad_size)
+    match_df = synthetic.generate_match_stats(rng, squad_df, labels, matches, players_per_match=min(14, squad_size))
+    match_df = match_df.astype({c: object for c in analytics.STAT_COLUMNS})
+    squad_df = squad_df.astype({"Season": object})
+    match_df["Season"] = match_df["Season"].astype(object)
+    n = len(match_df)
+
+    def pick(share):
+        return rng.random(n) < share
+
+    # Zero minutes (a 90s Played of 0) and zero attempts (0/0 accuracies)
+    match_df.loc[pick(0.05), "Minutes Played"] = 0
+    for attempted, completed, *_ in synthetic.ATTEMPT_PAIRS + [("Passes Attempted", "Passes Completed")]:
+        rows = pick(0.05)
+        match_df.loc[rows, [attempted, completed]] = 0
+
+    # Names differing from the Squad by case/whitespace, and names missing from the Squad
+    names = match_df["Player Name"].astype(str)
+    match_df.loc[pick(0.05), "Player Name"] = names.str.upper()
+    match_df.loc[pick(0.05), "Player Name"] = "  " + names + " "
+    match_df.loc[pick(0.02), "Player Name"] = "Unknown Trialist"
+
+    # Mixed Season types: the first season as an int in both sheets, some text seasons padded
+    first = labels[0]
+    match_df.loc[match_df["Season"] == first, "Season"] = int(first[:4])
+    squad_df.loc[squad_df["Season"] == first, "Season"] = int(first[:4])
+    padded = pick(0.05) & (match_df["Season"] != int(first[:4])).to_numpy()
+    match_df.loc[padded, "Season"] = match_df.loc[padded, "Season"].astype(str) + " "
+
+    # Unreadable stat cells (read as 0 by the pages)
+    for col in ["Goals", "Shots", "Passes Attempted"]:
+        match_df.loc[pick(0.01), col] = rng.choice(["", "n/a", "-"])
+
+    return match_df.reset_index(drop=True), squad_df.reset_index(drop=True)
+
+
+def _latest_season(agg):
+    return sorted(agg["Season"].astype(str).unique())[-1]
+
+
+def _dashboard_outputs(player_seasons, season_agg):
+    """Percentile and radar tables from the aggregates (same calls as the dashboard)."""
+    records = []
+    for _, row in season_agg.iterrows():
+        ranks = analytics.percentile_ranks(row, season_agg, PERCENTILE_STATS)
+        ranks.insert(0, "Player Name", row["Player Name"])
+        records.append(ranks)
+    percentiles = pd.concat(records, ignore_index=True) if records else pd.DataFrame(columns=["Player Name", "Stat", "Value", "Percentile"])
+    radar = analytics.radar_values(player_seasons, player_seasons, RADAR_ATTRS, use_per_90=True, normalize=True)
+    radar.insert(0, "Season", player_seasons["Season"])
+    radar.insert(0, "Player Name", player_seasons["Player Name"])
+    return {"percentiles": percentiles, "radar": radar}
+
+
+def _player_stats_outputs(match_df, totals=None):
+    return {
+        "player_stats": analytics.player_stats_table(match_df, totals=totals),
+        "player_stats_per_90": analytics.player_stats_table(match_df, per_90=True, totals=totals),
+        "player_stats_per_game": analytics.player_stats_table(match_df, per_game=True, totals=totals),
+    }
+
+
+# --- Frozen baseline (the original page code; do not refactor onto analytics) ---
+BASELINE_STAT_COLUMNS = [
+    "Minutes Played", "Match Rating", "Goals", "Own Goals", "Assists",
+    "Shots", "Shots on Target",
+    "Passes Attempted", "Passes Completed",
+    "Short Passes Attempted", "Short Passes Completed",
+    "Medium Passes Attempted", "Medium Passes Completed",
+    "Long Passes Attempted", "Long Passes Completed",
+    "Dribbles Attempted", "Dribbles Completed",
+    "Crosses Attempted", "Crosses Completed",
+    "Tackles Attempted", "Tackles Completed",
+    "Interceptions", "Key Passes", "Key Dribbles", "Fouled",
+    "Successful 1 on 1 Dribbles", "Fouls", "Penalties Conceded",
+    "Blocks", "Out of Position", "Posession Won", "Posession Lost",
+    "Clearances", "Headers Won", "Headers Lost",
+    "Saves", "Shots Caught", "Shots Parried", "Crosses Caught", "Balls Stripped"
+]
+
+
+def _baseline_player_stats(match_stats_df, per_90=False, per_game=False):
+    """Player Stats page table (no filters selected)."""
+    filtered_df = match_stats_df.copy()
+    numeric_cols = BASELINE_STAT_COLUMNS
+    for col in numeric_cols:
+        filtered_df[col] = pd.to_numeric(filtered_df[col], errors='coerce').fillna(0)
+    games_played = filtered_df.groupby("Player Name").size().rename("Games Played")
+    agg_df = filtered_df.groupby("Player Name")[numeric_cols].sum()
+    agg_df = agg_df.join(games_played)
+
+    def calc_acc(df, num, den, name):
+        df[name] = (df[num] / df[den].replace(0, 1)) * 100
+        df.loc[df[den] == 0, name] = 0
+        return df
+
+    agg_df = calc_acc(agg_df, "Passes Completed", "Passes Attempted", "Pass Accuracy %")
+    agg_df = calc_acc(agg_df, "Shots on Target", "Shots", "Shot Accuracy %")
+    agg_df = calc_acc(agg_df, "Crosses Completed", "Crosses Attempted", "Cross Accuracy %")
+    agg_df = calc_acc(agg_df, "Tackles Completed", "Tackles Attempted", "Tackle Accuracy %")
+    agg_df = calc_acc(agg_df, "Dribbles Completed", "Dribbles Attempted", "Dribble Accuracy %")
+    agg_df = calc_acc(agg_df, "Short Passes Completed", "Short Passes Attempted", "Short Pass %")
+    agg_df = calc_acc(agg_df, "Medium Passes Completed", "Medium Passes Attempted", "Medium Pass %")
+    agg_df = calc_acc(agg_df, "Long Passes Completed", "Long Passes Attempted", "Long Pass %")
+
+    display_df = agg_df.copy()
+    if per_90:
+        mins = display_df["Minutes Played"] / 90
+        for col in numeric_cols:
+            if col != "Minutes Played" and col != "Match Rating":
+                display_df[col] = display_df[col] / mins.replace(0, 1)
+    elif per_game:
+        games = display_df["Games Played"]
+        for col in numeric_cols:
+            if col != "Match Rating":
+                display_df[col] = display_df[col] / games
+        display_df["Match Rating"] = display_df["Match Rating"] / games
+    if not per_game:
+        display_df["Match Rating"] = display_df["Match Rating"] / display_df["Games Played"]
+    return display_df
+
+
+def _baseline_merged(match_stats_df, squad_df):
+    """Stats Dashboard preprocessing: numeric coercion and the Squad merge."""
+    match_stats_df = match_stats_df.copy()
+    for col in BASELINE_STAT_COLUMNS:
+        if col in match_stats_df.columns:
+            match_stats_df[col] = pd.to_numeric(match_stats_df[col], errors='coerce').fillna(0)
+    squad_info = squad_df[["Name", "Season", "Position 1", "Position 2", "Position 3", "Position 4", "Nationality", "Age"]]
+    squad_info = squad_info.rename(columns={"Name": "Player Name"})
+    squad_info["Season"] = squad_info["Season"].astype(str).str.strip()
+    match_stats_df["Season"] = match_stats_df["Season"].astype(str).str.strip()
+    squad_info["Player Name"] = squad_info["Player Name"].astype(str).str.strip()
+    match_stats_df["Player Name"] = match_stats_df["Player Name"].astype(str).str.strip()
+    squad_info["_merge_name"] = squad_info["Player Name"].str.lower()
+    squad_info["_merge_season"] = squad_info["Season"].str.lower()
+    match_stats_df["_merge_name"] = match_stats_df["Player Name"].str.lower()
+    match_stats_df["_merge_season"] = match_stats_df["Season"].str.lower()
+    merged_df = pd.merge(match_stats_df, squad_info, left_on=["_merge_name", "_merge_season"], right_on=["_merge_name", "_merge_season"], how="left", suffixes=("", "_squad"))
+    merged_df = merged_df.drop(columns=["_merge_name", "_merge_season"])
+    if "Player Name_squad" in merged_df.columns:
+        merged_df = merged_df.drop(columns=["Player Name_squad"])
+    if "Season_squad" in merged_df.columns:
+        merged_df = merged_df.drop(columns=["Season_squad"])
+    return merged_df
+
+
+def _baseline_aggregate(df, group_cols):
+    agg_funcs = {col: 'sum' for col in BASELINE_STAT_COLUMNS if col != "Match Rating"}
+    agg_funcs["Match Rating"] = 'mean'
+    meta_cols = ["Position 1", "Position 2", "Position 3", "Position 4", "Nationality", "Age", "Season"]
+    for mc in meta_cols:
+        if mc in df.columns and mc not in group_cols:
+            agg_funcs[mc] = 'first'
+    games = df.groupby(group_cols).size().rename("Games Played")
+    agg = df.groupby(group_cols).agg(agg_funcs)
+    agg = agg.join(games)
+    agg["90s Played"] = agg["Minutes Played"] / 90
+    return agg.reset_index()
+
+
+def _baseline_percentiles(season_agg):
+    """Scout report percentiles of every player vs the season pool."""
+    from scipy import stats
+    rows = []
+    for _, player_row in season_agg.iterrows():
+        for stat in PERCENTILE_STATS:
+            p_val = player_row[stat]
+            p_90s = player_row["90s Played"] if player_row["90s Played"] > 0 else 1
+            p_metric = p_val / p_90s if stat != "Match Rating" else p_val
+            pool_vals = season_agg[stat]
+            if stat != "Match Rating":
+                pool_vals = pool_vals / season_agg["90s Played"].replace(0, 1)
+            percentile = stats.percentileofscore(pool_vals, p_metric) if len(pool_vals) > 0 else 0
+            rows.append((player_row["Player Name"], stat, p_metric, percentile))
+    return pd.DataFrame(rows, columns=["Player Name", "Stat", "Value", "Percentile"])
+
+
+def _baseline_radar(all_players_agg):
+    """Player Comparison radar values (per 90, normalized) for every player-season."""
+    rows = []
+    for _, row in all_players_agg.iterrows():
+        record = {"Player Name": row["Player Name"], "Season": row["Season"]}
+        for attr in RADAR_ATTRS:
+            val = row[attr]
+            if attr != "Match Rating":
+                val = val / (row["90s Played"] if row["90s Played"] > 0 else 1)
+            all_vals = all_players_agg[attr]
+            if attr != "Match Rating":
+                all_vals = all_vals / all_players_agg["90s Played"].replace(0, 1)
+            max_val = all_vals.max()
+            min_val = all_vals.min()
+            record[attr] = (val - min_val) / (max_val - min_val) if max_val - min_val > 0 else 0
+        rows.append(record)
+    return pd.DataFrame(rows, columns=["Player Name", "Season"] + RADAR_ATTRS)
+
+
+def reference_engine(match_df, squad_df):
+    """The frozen baseline page logic on the raw frames."""
+    outputs = {
+        "player_stats": _baseline_player_stats(match_df),
+        "player_stats_per_90": _baseline_player_stats(match_df, per_90=True),
+        "player_stats_per_game": _baseline_player_stats(match_df, per_game=True),
+    }
+    merged = _baseline_merged(match_df, squad_df)
+    player_seasons = _baseline_aggregate(merged, ["Player Name", "Season"])
+    latest = _latest_season(player_seasons)
+    season_agg = _baseline_aggregate(merged[merged["Season"] == latest], ["Player Name"])
+    outputs["player_seasons"] = player_seasons
+    outputs["season_aggregate"] = season_agg
+    outputs["percentiles"] = _baseline_percentiles(season_agg)
+    outputs["radar"] = _baseline_radar(player_seasons)
+    return outputs
+
+
+# --- Engines ---
+def analytics_engine(match_df, squad_df):
+    """The shared analytics functions straight on the raw frames."""
+    outputs = _player_stats_outputs(match_df)
+    merged = analytics.merge_squad_info(analytics.prepare_match_stats(match_df), analytics.prepare_squad_info(squad_df))
+    player_seasons = analytics.aggregate_stats(merged, ["Player Name", "Season"])
+    latest = _latest_season(player_seasons)
+    season_agg = analytics.aggregate_stats(merged[merged["Season"] == latest], ["Player Name"])
+    outputs["player_seasons"] = player_seasons
+    outputs["season_aggregate"] = season_agg
+    outputs.update(_dashboard_outputs(player_seasons, season_agg))
+    return outputs
+
+
+def datamanager_engine(match_df, squad_df, surrogate_keys=False, optimize=False, close_seasons=0, archive_seasons=0):
+    """The DataManager paths the pages use (cached aggregates, filter index masks, partitions, the archive)."""
+    dm = DataManager()
+    dm.write_data("Squad", squad_df)
+    dm.write_data("MatchStats", match_df)
+    if surrogate_keys:
+        dm.enable_surrogate_keys()
+    if optimize:
+        dm.optimize_memory()
+    seasons = sorted(dm.filter_index().values("Season"))
+    for season in seasons[:close_seasons]:
+        dm.close_season(season)
+    if not archive_seasons:
+        return _datamanager_outputs(dm)
+    with tempfile.TemporaryDirectory() as root:
+        dm.enable_archive(root)
+        for season in seasons[:archive_seasons]:
+            dm.archive_season(season)
+        return _datamanager_outputs(dm)
+
+
+def _datamanager_outputs(dm):
+    outputs = _player_stats_outputs(None, totals=dm.player_totals())
+    player_seasons = dm.aggregate()
+    season_agg = dm.aggregate(_latest_season(player_seasons))
+    outputs["player_seasons"] = player_seasons
+    outputs["season_aggregate"] = season_agg
+    outputs.update(_dashboard_outputs(player_seasons, season_agg))
+    return outputs
+
+
+ENGINES = {
+    "analytics": analytics_engine,
+    "datamanager": datamanager_engine,
+    "surrogate_keys": lambda m, s: datamanager_engine(m, s, surrogate_keys=True),
+    "optimized_memory": lambda m, s: datamanager_engine(m, s, optimize=True),
+    "closed_seasons": lambda m, s: datamanager_engine(m, s, close_seasons=2),
+    "archived": lambda m, s: datamanager_engine(m, s, archive_seasons=2),
+    "all": lambda m, s: datamanager_engine(m, s, surrogate_keys=True, optimize=True, close_seasons=2),
+}
+
+
+# --- Comparison ---
+def _keyed(df, keys):
+    """df indexed by its row keys as text, sorted, so row order and key dtypes do not matter."""
+    if keys and all(k in df.columns for k in keys):
+        df = df.set_index(keys)
+    index = df.index.to_frame(index=False).astype(str)
+    df = df.set_axis(pd.MultiIndex.from_frame(index) if index.shape[1] > 1 else pd.Index(index.iloc[:, 0], name=index.columns[0]), axis=0)
+    return df.sort_index()
+
+
+def compare_frames(output, ref, alt, rtol=1e-9, atol=1e-9):
+    """Column-by-column differences between two versions of one output.
+
+    Returns rows of Output, Column, Issue, Rows Differing, Max Abs Diff, Example.
+    """
+    keys = OUTPUT_KEYS.get(output)
+    ref, alt = _keyed(ref, keys), _keyed(alt, keys)
+    issues = []
+
+    def issue(column, text, rows=0, max_diff=np.nan, example=""):
+        issues.append({"Output": output, "Column": column, "Issue": text, "Rows Differing": rows,
+                       "Max Abs Diff": max_diff, "Example": example})
+
+    missing_rows = ref.index.difference(alt.index)
+    extra_rows = alt.index.difference(ref.index)
+    if len(missing_rows) or len(extra_rows):
+        issue("(rows)", f"{len(missing_rows)} missing, {len(extra_rows)} extra",
+              len(missing_rows) + len(extra_rows), example=str((list(missing_rows) + list(extra_rows))[0]))
+    common = ref.index.intersection(alt.index)
+    if ref.index.has_duplicates or alt.index.has_duplicates:
+        issue("(rows)", "duplicate row keys")
+        return issues
+
+    for col in ref.columns:
+        if col not in alt.columns:
+            issue(col, "missing column")
+            continue
+        a, b = ref.loc[common, col], alt.loc[common, col]
+        if pd.api.types.is_numeric_dtype(a.dtype) and pd.api.types.is_numeric_dtype(b.dtype):
+            x, y = a.to_numpy(dtype=float), b.to_numpy(dtype=float)
+            same = np.isclose(x, y, rtol=rtol, atol=atol, equal_nan=True)
+            diff = np.abs(x - y)
+            max_diff = float(np.nanmax(np.where(same, 0, diff))) if len(diff) else 0.0
+        else:
+            same = (a.astype(str).to_numpy() == b.astype(str).to_numpy()) | (a.isna().to_numpy() & b.isna().to_numpy())
+            max_diff = np.nan
+        if not same.all():
+            bad = common[~same][0]
+            issue(col, "values differ", int((~same).sum()), max_diff, f"{bad}: {a.loc[bad]!r} vs {b.loc[bad]!r}")
+    for col in alt.columns.difference(ref.columns):
+        issue(col, "extra column")
+    return issues
+
+
+def compare_outputs(ref, alt, rtol=1e-9, atol=1e-9):
+    issues = []
+    for output, frame in ref.items():
+        if output not in alt:
+            issues.append({"Output": output, "Column": "", "Issue": "missing output", "Rows Differing": 0, "Max Abs Diff": np.nan, "Example": ""})
+            continue
+        issues.extend(compare_frames(output, frame, alt[output], rtol, atol))
+    return issues
+
+
+def run(engines=None, seeds=(0, 1, 2), rtol=1e-9, atol=1e-9, **save_args):
+    """Differences of every engine against the reference over several random saves (empty = equivalent)."""
+    engines = engines or ENGINES
+    rows = []
+    for seed in seeds:
+        match_df, squad_df = edge_case_save(seed, **save_args)
+        ref = reference_engine(match_df.copy(), squad_df.copy())
+        for name, engine in engines.items():
+            try:
+                issues = compare_outputs(ref, engine(match_df.copy(), squad_df.copy()), rtol, atol)
+            except Exception as e:
+                issues = [{"Output": "", "Column": "", "Issue": f"engine raised {type(e).__name__}: {e}",
+                           "Rows Differing": 0, "Max Abs Diff": np.nan, "Example": ""}]
+            rows.extend({"Engine": name, "Seed": seed, **i} for i in issues)
+    return pd.DataFrame(rows, columns=["Engine", "Seed", "Output", "Column", "Issue", "Rows Differing", "Max Abs Diff", "Example"])
+
+
+def assert_equivalent(engines=None, seeds=(0, 1, 2), rtol=1e-9, atol=1e-9, **save_args):
+    """Raise AssertionError with the column-by-column report when any engine drifts."""
+    report = run(engines, seeds, rtol, atol, **save_args)
+    if not report.empty:
+        raise AssertionError("Engines differ from the reference:\n" + report.to_string(index=False))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that the optimized aggregation paths match the reference pandas logic.")
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), help="Engines to check (default: all)")
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0, 1, 2])
+    parser.add_argument("--seasons", type=int, default=3)
+    parser.add_argument("--matches", type=int, default=12, help="Matches per season")
+    parser.add_argument("--squad", type=int, default=18, help="Squad size per season")
+    parser.add_argument("--rtol", type=float, default=1e-9)
+    parser.add_argument("--atol", type=float, default=1e-9)
+    args = parser.parse_args(argv)
+
+    engines = {name: ENGINES[name] for name in args.engines} if args.engines else ENGINES
+    report = run(engines, args.seeds, args.rtol, args.atol, seasons=args.seasons, matches=args.matches, squad_size=args.squad)
+    checked = ", ".join(engines)
+    if report.empty:
+        print(f"OK: {checked} match the reference on seeds {args.seeds}.")
+        return 0
+    with pd.option_context("display.max_colwidth", 80, "display.width", 200):
+        print(report.to_string(index=False))
+    print(f"\n{len(report)} difference(s) across {report['Engine'].nunique()} engine(s).", file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
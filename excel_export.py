@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+# Rows converted to Python values at a time (bounds the per-sheet temporary lists)
+STREAM_CHUNK_ROWS = 5000
+
+
+def _column_values(s):
+    """Cell values for one column chunk: native ints/floats/bools/datetimes, None for blanks."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        s = s.astype(object)
+    if pd.api.types.is_bool_dtype(s.dtype) or pd.api.types.is_integer_dtype(s.dtype):
+        if not s.hasnans:
+            return s.tolist()
+    if pd.api.types.is_float_dtype(s.dtype):
+        values = s.to_numpy(dtype=float)
+        return [None if np.isnan(v) else v for v in values.tolist()]
+    if pd.api.types.is_datetime64_any_dtype(s.dtype):
+        return [None if pd.isna(v) else v.to_pydatetime() for v in s]
+    return [None if pd.isna(v) else v for v in s.astype(object).tolist()]
+
+
+def write_streaming(sheets, output, progress=None):
+    """Write {sheet: DataFrame} to output as .xlsx with openpyxl's write-only mode.
+
+    Rows are appended chunk by chunk and never held as a workbook object model.
+    The header row is bold and frozen; cells keep their types (numbers stay
+    numbers, booleans stay booleans). progress(rows_written, total_rows) as in
+    DataManager.save_to_bytes. A sheet may also be any object with columns,
+    len() and chunks(rows) (e.g. archive.ChunkedSheet).
+    """
+    total = sum(len(df) for df in sheets.values())
+    written = 0
+    wb = Workbook(write_only=True)
+    bold = Font(bold=True)
+    for name, df in sheets.items():
+        ws = wb.create_sheet(title=name)
+        ws.freeze_panes = "A2"
+        header = []
+        for col in df.columns:
+            cell = WriteOnlyCell(ws, value=str(col))
+            cell.font = bold
+            header.append(cell)
+        ws.append(header)
+        if hasattr(df, "chunks"):
+            chunks = df.chunks(STREAM_CHUNK_ROWS)
+        else:
+            chunks = (df.iloc[start:start + STREAM_CHUNK_ROWS] for start in range(0, len(df), STREAM_CHUNK_ROWS))
+        for chunk in chunks:
+            for row in zip(*(_column_values(chunk[col]) for col in chunk.columns)):
+                ws.append(row)
+            written += len(chunk)
+            if progress is not None:
+                progress(written, total)
+        if progress is not None:
+            progress(written, total)
+    wb.save(output)
+    return output
@@ -0,0 +1,91 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Workbook builds run here instead of on the Streamlit script thread
+EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="export")
+# Finished jobs nobody collected (e.g. the session closed mid-export) are dropped after this
+JOB_TTL_SECONDS = 10 * 60
+
+
+class ExportJob:
+    """One Excel export of a DataManager at a given data version."""
+
+    def __init__(self, version):
+        self.version = version
+        self.progress = 0.0
+        self.started = time.time()
+        self.finished = None
+        self.future = None
+
+    def _report(self, written, total):
+        self.progress = written / total if total else 1.0
+
+    def _run(self, dm):
+        try:
+            with dm.background_reads():
+                return dm.save_to_bytes(progress=self._report, streaming=True).getvalue()
+        finally:
+            self.finished = time.time()
+
+    def done(self):
+        return self.future.done()
+
+    def error(self):
+        return self.future.exception() if self.done() else None
+
+    def result(self):
+        """Workbook bytes (blocks until the job finishes)."""
+        return self.future.result()
+
+
+_jobs = {}   # {owner key: ExportJob for that owner's latest requested version, until collected}
+_lock = threading.Lock()
+
+
+def _owner(dm):
+    return dm.session_id or id(dm)
+
+
+def _prune(now=None):
+    """Drop finished jobs older than JOB_TTL_SECONDS (call with _lock held)."""
+    now = time.time() if now is None else now
+    for key in [k for k, job in _jobs.items() if job.finished is not None and now - job.finished > JOB_TTL_SECONDS]:
+        del _jobs[key]
+
+
+def submit(dm):
+    """Export job for dm's current data version, starting one only if none exists.
+
+    Repeated requests (reruns, several clicks) for the same version share the
+    running job; a request for a newer version replaces the owner's old job.
+    """
+    with _lock:
+        _prune()
+        key = _owner(dm)
+        job = _jobs.get(key)
+        if job is not None and job.version == dm.version and not job.error():
+            return job
+        job = ExportJob(dm.version)
+        job.future = EXECUTOR.submit(job._run, dm)
+        _jobs[key] = job
+        return job
+
+
+def current(dm):
+    """The owner's job for the current data version, or None."""
+    with _lock:
+        job = _jobs.get(_owner(dm))
+        return job if job is not None and job.version == dm.version else None
+
+
+def take(dm, job):
+    """Workbook bytes of a finished job, removing it from the registry.
+
+    The caller keeps the bytes (e.g. in its session state) from here on, so
+    they are freed with the session instead of living as long as the process.
+    """
+    with _lock:
+        if _jobs.get(_owner(dm)) is job:
+            del _jobs[_owner(dm)]
+    return job.result()
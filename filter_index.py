@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+# Categorical filter columns of MatchStats and how their values are keyed.
+# Season is compared as stripped text everywhere in the app (mixed int/str seasons).
+FILTER_COLUMNS = {
+    "Season": lambda s: s.astype(str).str.strip(),
+    "Competition": lambda s: s,
+    "Opponent": lambda s: s,
+}
+
+
+class FilterIndex:
+    """Per-value bitmap index over a sheet's categorical filter columns.
+
+    Each distinct value of each column owns a packed bitmap (one bit per row).
+    Selections combine bitmaps with OR inside a column and AND across columns,
+    so any mix of season/competition/opponent filters resolves without
+    rescanning the data. Build once per data version.
+    """
+
+    def __init__(self, df, columns=FILTER_COLUMNS):
+        self.n_rows = len(df)
+        self.bitmaps = {}   # {column: {value: packed uint8 bitmap}}
+        self.uniques = {}   # {column: [values in first-appearance order]}
+        for col, key in columns.items():
+            if col not in df.columns:
+                continue
+            codes, uniques = pd.factorize(key(df[col]), use_na_sentinel=False)
+            self.uniques[col] = list(uniques)
+            self.bitmaps[col] = {
+                value: np.packbits(codes == code)
+                for code, value in enumerate(self.uniques[col])
+            }
+
+    def values(self, column):
+        """Distinct values of a column (same order as Series.unique())."""
+        return list(self.uniques.get(column, []))
+
+    def counts(self, column):
+        """Rows per distinct value."""
+        return {value: int(np.unpackbits(bits, count=self.n_rows).sum()) for value, bits in self.bitmaps.get(column, {}).items()}
+
+    def _column_bitmap(self, column, selected):
+        empty = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        bitmaps = self.bitmaps.get(column, {})
+        result = empty
+        for value in selected:
+            bits = bitmaps.get(value)
+            if bits is not None:
+                result = result | bits
+        return result
+
+    def mask(self, selections):
+        """Boolean row mask for {column: selected values}.
+
+        A scalar selects one value; None or an empty list leaves the column unfiltered.
+        """
+        combined = None
+        for column, selected in selections.items():
+            if selected is None:
+                continue
+            if pd.api.types.is_scalar(selected):  # includes numpy scalars (np.int64, np.str_)
+                selected = [selected]
+            if len(selected) == 0:
+                continue
+            bits = self._column_bitmap(column, selected)
+            combined = bits if combined is None else combined & bits
+        if combined is None:
+            return np.ones(self.n_rows, dtype=bool)
+        return np.unpackbits(combined, count=self.n_rows).astype(bool)
@@ -0,0 +1,132 @@
+import heapq
+
+import pandas as pd
+
+from analytics import MATCH_KEY_COLUMNS, parse_scores
+
+FIXTURE_COLUMNS = ["Season", "Competition", "Opponent", "Date", "Scores", "Result"]
+
+
+class HeadToHead:
+    """Running record against one opponent (or competition, or both)."""
+
+    __slots__ = ("games", "wins", "draws", "losses", "goals_for", "goals_against", "scorers", "fixtures")
+
+    def __init__(self):
+        self.games = self.wins = self.draws = self.losses = 0
+        self.goals_for = self.goals_against = 0
+        self.scorers = {}    # {player: goals}
+        self.fixtures = []   # fixture dicts in the order they were added
+
+    def add_fixture(self, fixture, us, them):
+        self.games += 1
+        if us == us and them == them:  # both parsed (not NaN)
+            self.goals_for += int(us)
+            self.goals_against += int(them)
+            self.wins += int(us > them)
+            self.draws += int(us == them)
+            self.losses += int(us < them)
+        self.fixtures.append(fixture)
+
+    def copy(self):
+        other = HeadToHead()
+        for name in ("games", "wins", "draws", "losses", "goals_for", "goals_against"):
+            setattr(other, name, getattr(self, name))
+        other.scorers = dict(self.scorers)
+        other.fixtures = list(self.fixtures)
+        return other
+
+    def add_goals(self, player, goals):
+        self.scorers[player] = self.scorers.get(player, 0) + goals
+
+    def record(self):
+        """Games Played, W/D/L (as analytics.team_record) plus Goals For/Against."""
+        return {
+            "Games Played": self.games, "Wins": self.wins, "Draws": self.draws, "Losses": self.losses,
+            "Goals For": self.goals_for, "Goals Against": self.goals_against,
+        }
+
+    def top_scorers(self, n=5):
+        top = heapq.nlargest(n, self.scorers.items(), key=lambda item: item[1])
+        return pd.DataFrame(top, columns=["Player Name", "Goals"])
+
+
+class HeadToHeadIndex:
+    """Head-to-head records keyed by opponent, competition and (opponent, competition).
+
+    Built once per data version; when match rows are appended, extended()
+    makes the next version's index from this one without rescanning the
+    history, so a lookup is a dict access whatever the length of the history.
+    Matches are the unique (Season, Competition, Opponent, Scores, Date) rows;
+    a match whose key is already indexed only adds its scorers.
+    """
+
+    def __init__(self, match_df=None):
+        self.by_opponent = {}
+        self.by_competition = {}
+        self.by_pair = {}
+        self._seen = set()
+        if match_df is not None and len(match_df):
+            self.add(match_df)
+
+    def _entries(self, opponent, competition):
+        for table, key in ((self.by_opponent, opponent), (self.by_competition, competition), (self.by_pair, (opponent, competition))):
+            entry = table.get(key)
+            if entry is None:
+                entry = table[key] = HeadToHead()
+            yield entry
+
+    def add(self, rows):
+        """Index new MatchStats rows (e.g. the batch just appended)."""
+        keys = pd.DataFrame({col: rows[col].astype(str).str.strip() for col in MATCH_KEY_COLUMNS})
+        matches = keys.drop_duplicates()
+        matches = matches[[key not in self._seen for key in matches.itertuples(index=False, name=None)]]
+        goals = parse_scores(matches["Scores"])
+        for key, us, them in zip(matches.itertuples(index=False, name=None), goals["Us"], goals["Them"]):
+            self._seen.add(key)
+            fixture = dict(zip(MATCH_KEY_COLUMNS, key))
+            fixture["Result"] = "W" if us > them else "D" if us == them else "L" if us < them else None
+            for entry in self._entries(fixture["Opponent"], fixture["Competition"]):
+                entry.add_fixture(fixture, us, them)
+
+        if "Goals" not in rows.columns:
+            return
+        scored = pd.to_numeric(rows["Goals"], errors='coerce').fillna(0)
+        scorers = pd.DataFrame({
+            "Opponent": keys["Opponent"], "Competition": keys["Competition"],
+            "Player Name": rows["Player Name"].astype(str).str.strip(), "Goals": scored,
+        })[scored.to_numpy() > 0]
+        totals = scorers.groupby(["Opponent", "Competition", "Player Name"]).sum()["Goals"]
+        for (opponent, competition, player), n in totals.items():
+            for entry in self._entries(opponent, competition):
+                entry.add_goals(player, int(n))
+
+    def extended(self, rows):
+        """A new index with rows added; this one (still cached for the old version) is unchanged."""
+        other = HeadToHeadIndex()
+        other.by_opponent = {k: v.copy() for k, v in self.by_opponent.items()}
+        other.by_competition = {k: v.copy() for k, v in self.by_competition.items()}
+        other.by_pair = {k: v.copy() for k, v in self.by_pair.items()}
+        other._seen = set(self._seen)
+        other.add(rows)
+        return other
+
+    def lookup(self, opponent=None, competition=None):
+        """HeadToHead for an opponent, a competition or both (None when never played)."""
+        if opponent is None and competition is None:
+            return None
+        if competition is None:
+            return self.by_opponent.get(str(opponent).strip())
+        if opponent is None:
+            return self.by_competition.get(str(competition).strip())
+        return self.by_pair.get((str(opponent).strip(), str(competition).strip()))
+
+    def opponents(self):
+        return sorted(self.by_opponent)
+
+    def fixtures(self, opponent=None, competition=None):
+        """Fixture list (newest first by Date text) for a lookup."""
+        entry = self.lookup(opponent, competition)
+        if entry is None:
+            return pd.DataFrame(columns=FIXTURE_COLUMNS)
+        return pd.DataFrame(entry.fixtures, columns=FIXTURE_COLUMNS).iloc[::-1].sort_values("Date", ascending=False, kind="stable", ignore_index=True)
@@ -0,0 +1,72 @@
+import pandas as pd
+
+# (Completed, Attempted) pairs where the completed count can never exceed attempts
+COMPLETION_PAIRS = [
+    ("Passes Completed", "Passes Attempted"),
+    ("Short Passes Completed", "Short Passes Attempted"),
+    ("Medium Passes Completed", "Medium Passes Attempted"),
+    ("Long Passes Completed", "Long Passes Attempted"),
+    ("Dribbles Completed", "Dribbles Attempted"),
+    ("Crosses Completed", "Crosses Attempted"),
+    ("Tackles Completed", "Tackles Attempted"),
+    ("Shots on Target", "Shots"),
+]
+
+MAX_MINUTES = 120  # 90 + extra time
+MAX_RATING = 10
+
+
+def _numeric(df, cols):
+    """Coerce the given columns to numbers in one pass (missing columns are skipped)."""
+    present = [c for c in cols if c in df.columns]
+    return df[present].apply(pd.to_numeric, errors="coerce")
+
+
+def build_rules():
+    """Return the list of (rule name, mask function) pairs checked against MatchStats.
+
+    Each mask function takes the coerced numeric frame and returns a boolean
+    Series that is True on violating rows.
+    """
+    rules = []
+    for completed, attempted in COMPLETION_PAIRS:
+        rules.append((
+            f"{completed} > {attempted}",
+            lambda n, c=completed, a=attempted: n[c] > n[a],
+        ))
+    rules.append(("Match Rating outside 0-10", lambda n: (n["Match Rating"] < 0) | (n["Match Rating"] > MAX_RATING)))
+    rules.append((f"Minutes Played above {MAX_MINUTES}", lambda n: n["Minutes Played"] > MAX_MINUTES))
+    rules.append(("Negative stat value", lambda n: (n < 0).any(axis=1)))
+    return rules
+
+
+RULES = build_rules()
+
+
+def check_match_stats(df, stat_cols):
+    """Check every cross-column constraint over the whole MatchStats sheet.
+
+    Returns {rule name: Index of violating rows}. Rules whose columns are not
+    present in the sheet are skipped.
+    """
+    if df.empty:
+        return {name: pd.Index([]) for name, _ in RULES}
+
+    numbers = _numeric(df, stat_cols)
+    report = {}
+    for name, rule in RULES:
+        try:
+            mask = rule(numbers)
+        except KeyError:
+            continue
+        # NaN comparisons are False, so non-numeric cells never count as violations here
+        report[name] = df.index[mask.to_numpy()]
+    return report
+
+
+def summarize(report):
+    """Turn an integrity report into a small table of rule -> violation count."""
+    return pd.DataFrame({
+        "Rule": list(report),
+        "Violations": [len(idx) for idx in report.values()],
+    })
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+from analytics import per_90
+
+# Entries kept at each end of every stat (the dashboard slider goes up to 50)
+DEFAULT_DEPTH = 50
+
+
+def _ranked(values, positions, lowest=False):
+    """positions ordered by value (descending, or ascending when lowest), ties by row order."""
+    keys = values[positions] if lowest else -values[positions]
+    return positions[np.lexsort((positions, keys))]
+
+
+def _select(values, valid, k, lowest=False):
+    """The k valid positions a stable sort would rank first (boundary ties go to the earliest rows)."""
+    v = values[valid] if lowest else -values[valid]
+    kth = np.partition(v, k - 1)[k - 1]
+    ties = valid[v == kth]
+    return np.concatenate([valid[v < kth], ties[:k - int((v < kth).sum())]])
+
+
+class LeaderboardIndex:
+    """Top and bottom K rows of an aggregate table for every stat, raw and per 90.
+
+    Built with np.argpartition (linear time per stat) and only the K selected
+    rows are sorted, so switching stat, direction or N is a slice of a
+    precomputed array. Positions refer to rows of the aggregate table.
+    """
+
+    def __init__(self, agg, stats, depth=DEFAULT_DEPTH):
+        self.n_rows = len(agg)
+        self.depth = min(depth, self.n_rows)
+        self.top = {}      # {(stat, per_90): positions, best first}
+        self.bottom = {}   # {(stat, per_90): positions, lowest first}
+        self.values = {}   # {(stat, per_90): values of every row}
+        for stat in stats:
+            if stat not in agg.columns:
+                continue
+            for use_per_90 in (False, True):
+                values = (per_90(agg, stat) if use_per_90 else agg[stat]).to_numpy(dtype=float)
+                self._add((stat, use_per_90), values)
+
+    def _add(self, key, values):
+        self.values[key] = values
+        valid = np.flatnonzero(~np.isnan(values))
+        k = min(self.depth, len(valid))
+        if k == 0:
+            self.top[key] = self.bottom[key] = valid
+            return
+        if k < len(valid):
+            high = _select(values, valid, k)
+            low = _select(values, valid, k, lowest=True)
+        else:
+            high = low = valid
+        self.top[key] = _ranked(values, high)
+        self.bottom[key] = _ranked(values, low, lowest=True)
+
+    def positions(self, stat, n, use_per_90=False, lowest=False):
+        """Row positions of the top (or lowest) n for a stat, in ranking order."""
+        if stat == "Match Rating":
+            use_per_90 = False  # already an average
+        ranked = (self.bottom if lowest else self.top).get((stat, use_per_90))
+        if ranked is None:
+            return np.array([], dtype=int)
+        return ranked[:n]
+
+    def value(self, stat, positions, use_per_90=False):
+        if stat == "Match Rating":
+            use_per_90 = False
+        return self.values[(stat, use_per_90)][positions]
+
+    def leaders(self, labels, stats, n=3, use_per_90=False):
+        """Stat, Rank, Player, Value for the top n of every stat (labels: one per aggregate row)."""
+        labels = np.asarray(labels)
+        frames = []
+        for stat in stats:
+            positions = self.positions(stat, n, use_per_90)
+            frames.append(pd.DataFrame({
+                "Stat": stat,
+                "Rank": np.arange(1, len(positions) + 1),
+                "Player": labels[positions],
+                "Value": self.value(stat, positions, use_per_90),
+            }))
+        if not frames:
+            return pd.DataFrame(columns=["Stat", "Rank", "Player", "Value"])
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,63 @@
+import pandas as pd
+
+# Text columns with few distinct values; always stored as categoricals once optimized
+LOW_CARDINALITY_COLUMNS = [
+    "Season", "Competition", "Opponent",
+    "Position 1", "Position 2", "Position 3", "Position 4",
+    "Role", "Nationality", "Strong Foot", "Transfer Type",
+]
+
+# Other text columns become categoricals when at most this share of values is distinct
+CATEGORY_RATIO = 0.5
+
+
+def deep_usage(frames):
+    """Deep memory usage (bytes) per sheet and column for a {sheet: DataFrame} mapping."""
+    rows = []
+    for sheet, df in frames.items():
+        usage = df.memory_usage(deep=True, index=False)
+        for col, nbytes in usage.items():
+            rows.append((sheet, col, str(df[col].dtype), int(nbytes)))
+    return pd.DataFrame(rows, columns=["Sheet", "Column", "Dtype", "Bytes"])
+
+
+def _is_text(s):
+    return pd.api.types.is_object_dtype(s.dtype) or pd.api.types.is_string_dtype(s.dtype)
+
+
+def optimize_column(s, name):
+    """Smallest safe dtype for one column; values are unchanged."""
+    if s.empty or pd.api.types.is_bool_dtype(s.dtype) or isinstance(s.dtype, pd.CategoricalDtype):
+        return s
+    if pd.api.types.is_integer_dtype(s.dtype):
+        return pd.to_numeric(s, downcast="integer")
+    if pd.api.types.is_float_dtype(s.dtype):
+        # Whole-number floats (e.g. counts read from Excel) become small ints; real decimals are kept
+        if s.notna().all() and (s % 1 == 0).all():
+            return pd.to_numeric(s.astype("int64"), downcast="integer")
+        return s
+    if _is_text(s):
+        if name in LOW_CARDINALITY_COLUMNS or s.nunique(dropna=True) <= CATEGORY_RATIO * len(s):
+            # One copy of each distinct string plus small integer codes
+            return s.astype("category")
+    return s
+
+
+def optimize_frame(df):
+    """Downcast numbers and store repeated strings once (as categoricals)."""
+    return pd.DataFrame({col: optimize_column(df[col], col) for col in df.columns}, index=df.index)
+
+
+def compare_usage(before, after):
+    """Per-column before/after table with the bytes saved."""
+    table = before.merge(after, on=["Sheet", "Column"], suffixes=(" Before", " After"))
+    table["Saved"] = table["Bytes Before"] - table["Bytes After"]
+    return table[["Sheet", "Column", "Dtype Before", "Dtype After", "Bytes Before", "Bytes After", "Saved"]]
+
+
+def sheet_totals(usage):
+    """Sum a deep_usage / compare_usage table per sheet (plus an overall total row)."""
+    numeric = usage.select_dtypes("number").columns
+    totals = usage.groupby("Sheet", sort=False)[list(numeric)].sum()
+    totals.loc["Total"] = totals.sum()
+    return totals.reset_index()
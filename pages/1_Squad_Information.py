@@ -11,6 +11,7 @@ if 'data_manager' not in st.session_state:
     st.switch_page("app.py") # Redirect to home to init
 
 dm = st.session_state['data_manager']
+dm.keep_alive()
 
 
 
@@ -80,7 +81,9 @@ st.subheader("Current Squad")
 st.write("Edit values directly in the table below.")
 
 if not squad_df.empty:
-    edited_df = st.data_editor(squad_df, num_rows="dynamic", width='stretch')
+    # Categorical columns (after a memory optimization) would limit the editor to existing values
+    editable_df = squad_df.astype({c: "object" for c in squad_df.select_dtypes("category").columns})
+    edited_df = st.data_editor(editable_df, num_rows="dynamic", width='stretch')
     
     if st.button("Save Changes"):
         try:
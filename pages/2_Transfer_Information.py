@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+import plotly.express as px
 from datetime import date
 
 st.set_page_config(page_title="Transfer Information", page_icon="💸", layout="wide")
@@ -11,6 +12,7 @@ if 'data_manager' not in st.session_state:
     st.switch_page("app.py")
 
 dm = st.session_state['data_manager']
+dm.keep_alive()
 
 
 # --- Load Data ---
@@ -77,3 +79,35 @@ if not transfers_df.empty:
 else:
     st.info("No transfers recorded yet.")
 
+# --- Transfer Ledger ---
+# Values/dates are parsed once per data version; the tables below are grouped aggregates
+ledger = dm.transfer_ledger()
+by_season = ledger["by_season"]
+if not by_season.empty:
+    st.subheader("Transfer Ledger")
+    st.caption("Fees are parsed from Transfer Value (e.g. $5M, €750K, €10M + 20%). Percentage splits are listed separately and not counted as spend.")
+
+    latest = by_season.iloc[-1]
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric(f"Net Spend ({latest['Season']})", f"{latest['Net Spend']:,.0f}")
+    m2.metric("Wage Bill", f"{latest['Wage Bill']:,.0f}")
+    m3.metric("Transfers In / Out", f"{latest['In']} / {latest['Out']}")
+    m4.metric("Net Spend (All Seasons)", f"{by_season['Net Spend'].sum():,.0f}")
+
+    fig = px.bar(by_season, x="Season", y=["Spend", "Income"], barmode="group", template="plotly_dark", title="Spend vs Income per Season")
+    fig.add_scatter(x=by_season["Season"], y=by_season["Net Spend"], mode="lines+markers", name="Net Spend")
+    fig.update_layout(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)")
+    st.plotly_chart(fig, width="stretch")
+
+    money_format = {c: "{:,.0f}" for c in ["Spend", "Income", "Net Spend", "Wage Bill", "Incoming Wages"]}
+    st.write("#### Per Season")
+    st.dataframe(by_season.style.format(money_format), width='stretch', hide_index=True)
+    st.write("#### Per Season and Transfer Type")
+    st.dataframe(ledger["by_type"].style.format({"Fees": "{:,.0f}", "Avg Split %": "{:.1f}"}), width='stretch', hide_index=True)
+
+    parsed = ledger["parsed"]
+    problems = parsed[parsed["Value Error"] | parsed["Date Error"]]
+    if not problems.empty:
+        st.warning(f"{len(problems)} transfer(s) have a value or date that could not be read; they count as 0 in the ledger.")
+        st.dataframe(problems[["Season", "Player Name", "Transfer Date", "Transfer Type", "Transfer Value", "Value Error", "Date Error"]], width='stretch', hide_index=True)
+
@@ -1,6 +1,8 @@
 import streamlit as st
 import pandas as pd
 from datetime import date
+from bulk_import import prepare_match_import
+from analytics import STAT_COLUMNS, player_stats_table
 
 st.set_page_config(page_title="Player Stats", page_icon="📊", layout="wide")
 
@@ -11,6 +13,8 @@ if 'data_manager' not in st.session_state:
     st.switch_page("app.py")
 
 dm = st.session_state['data_manager']
+dm.keep_alive()
+dm.profiler.start_run("Player Stats")
 
 
 # --- Load Data ---
@@ -19,25 +23,7 @@ squad_df = dm.get_data("Squad")
 match_stats_df = dm.get_data("MatchStats")
 
 # --- Tabs for Entry vs View ---
-tab1, tab2 = st.tabs(["Enter Match Stats", "View Player Stats"])
-
-# List of stat columns based on user request
-STAT_COLUMNS = [
-    "Minutes Played", "Match Rating", "Goals", "Own Goals", "Assists",
-    "Shots", "Shots on Target", 
-    "Passes Attempted", "Passes Completed",
-    "Short Passes Attempted", "Short Passes Completed",
-    "Medium Passes Attempted", "Medium Passes Completed",
-    "Long Passes Attempted", "Long Passes Completed",
-    "Dribbles Attempted", "Dribbles Completed",
-    "Crosses Attempted", "Crosses Completed",
-    "Tackles Attempted", "Tackles Completed",
-    "Interceptions", "Key Passes", "Key Dribbles", "Fouled",
-    "Successful 1 on 1 Dribbles", "Fouls", "Penalties Conceded",
-    "Blocks", "Out of Position", "Posession Won", "Posession Lost",
-    "Clearances", "Headers Won", "Headers Lost",
-    "Saves", "Shots Caught", "Shots Parried", "Crosses Caught", "Balls Stripped"
-]
+tab1, tab2, tab3 = st.tabs(["Enter Match Stats", "View Player Stats", "Bulk Import"])
 
 BOOLEAN_COLUMNS = ["Man of the Match", "Started"]
 
@@ -78,19 +64,11 @@ with tab1:
         
         # Initialize DataFrame for entry
         # We need rows for each player, cols for STAT_COLUMNS (ints) + BOOLs
-        initial_data = []
-        for p in st.session_state['current_match_players']:
-            row = {"Player Name": p}
-            for col in STAT_COLUMNS:
-                if col == "Match Rating":
-                    row[col] = 0.0
-                else:
-                    row[col] = 0
-            for col in BOOLEAN_COLUMNS:
-                row[col] = False
-            initial_data.append(row)
-        
-        df_entry = pd.DataFrame(initial_data)
+        entry_players = st.session_state['current_match_players']
+        df_entry = pd.DataFrame(0, index=range(len(entry_players)), columns=STAT_COLUMNS)
+        df_entry["Match Rating"] = 0.0
+        df_entry[BOOLEAN_COLUMNS] = False
+        df_entry.insert(0, "Player Name", entry_players)
         
         edited_stats = st.data_editor(
             df_entry, 
@@ -132,81 +110,69 @@ with tab1:
 with tab2:
     st.header("Player Statistics Analysis")
     
-    if match_stats_df.empty:
+    if match_stats_df.empty and not dm.archived_seasons:
         st.info("No match stats recorded.")
     else:
         # Filters
         filter_col1, filter_col2 = st.columns(2)
-        competitions = match_stats_df["Competition"].unique().tolist()
-        matches = match_stats_df["Opponent"].unique().tolist()
+        # Option lists come from the per-version bitmap index plus any archived seasons
+        competitions = dm.filter_values("Competition")
+        matches = dm.filter_values("Opponent")
         
         selected_comps = filter_col1.multiselect("Filter by Competition", competitions)
         selected_matches = filter_col2.multiselect("Filter by Match (Opponent)", matches)
-        
-        filtered_df = match_stats_df.copy()
-        if selected_comps:
-            filtered_df = filtered_df[filtered_df["Competition"].isin(selected_comps)]
-        if selected_matches:
-            filtered_df = filtered_df[filtered_df["Opponent"].isin(selected_matches)]
             
         # Toggles
         per_90 = st.toggle("Per 90 Stats")
         per_game = st.toggle("Per Game Stats")
         
-        # Aggregation
-        # Group by Player Name and sum numerical columns
-        # First ensure numeric types
-        numeric_cols = STAT_COLUMNS  # These should be numeric
-        for col in numeric_cols:
-            filtered_df[col] = pd.to_numeric(filtered_df[col], errors='coerce').fillna(0)
-            
-        # Count games played (rows per player)
-        games_played = filtered_df.groupby("Player Name").size().rename("Games Played")
-        
-        agg_df = filtered_df.groupby("Player Name")[numeric_cols].sum()
-        agg_df = agg_df.join(games_played)
-        
-        # Calculate Accuracies (Percentages)
-        # Function to safe divide
-        def calc_acc(df, num, den, name):
-            df[name] = (df[num] / df[den].replace(0, 1)) * 100
-            # Handle 0/0 -> 0 (or keep as is, but users prefer 0 usually)
-            df.loc[df[den] == 0, name] = 0
-            return df
-
-        agg_df = calc_acc(agg_df, "Passes Completed", "Passes Attempted", "Pass Accuracy %")
-        agg_df = calc_acc(agg_df, "Shots on Target", "Shots", "Shot Accuracy %")
-        agg_df = calc_acc(agg_df, "Crosses Completed", "Crosses Attempted", "Cross Accuracy %")
-        agg_df = calc_acc(agg_df, "Tackles Completed", "Tackles Attempted", "Tackle Accuracy %")
-        agg_df = calc_acc(agg_df, "Dribbles Completed", "Dribbles Attempted", "Dribble Accuracy %")
-        agg_df = calc_acc(agg_df, "Short Passes Completed", "Short Passes Attempted", "Short Pass %")
-        agg_df = calc_acc(agg_df, "Medium Passes Completed", "Medium Passes Attempted", "Medium Pass %")
-        agg_df = calc_acc(agg_df, "Long Passes Completed", "Long Passes Attempted", "Long Pass %")
-        
-        # Handling Per 90 / Per Game
-        display_df = agg_df.copy()
-        
-        if per_90:
-            # Divide all accumulation cols by (Minutes Played / 90)
-            mins = display_df["Minutes Played"] / 90
-            for col in numeric_cols:
-                if col != "Minutes Played" and col != "Match Rating": # Rating shouldn't be per 90
-                   display_df[col] = display_df[col] / mins.replace(0, 1)
-        
-        elif per_game:
-            games = display_df["Games Played"]
-            for col in numeric_cols:
-                if col != "Match Rating":
-                    display_df[col] = display_df[col] / games
-            display_df["Match Rating"] = display_df["Match Rating"] / games # Average rating
-            
-        # Average rating for normal view too if not per_game (sum of ratings makes no sense usually, but prompt said "Added up except percentages")
-        # Creating a specific rule for Rating: Always Average?
-        # Prompt: "All stats would be added up except for Percentage accuracies which would be averaged by number of games"
-        # Rating added up is weird logic (Total Rating?), but I will stick to prompt or common sense. Common sense: Avg Rating. 
-        # I'll enable Average Rating always.
-        if not per_game:
-             display_df["Match Rating"] = display_df["Match Rating"] / display_df["Games Played"]
+        # Aggregation: totals, per 90 or per game (rating is always averaged)
+        with dm.profiler.stage("Aggregation", rows=len(match_stats_df)):
+            # Closed seasons are pre-aggregated per competition; opponent filters aggregate the rows (archived ones in chunks)
+            totals = dm.player_totals(selected_comps, selected_matches)
+            display_df = player_stats_table(match_stats_df, per_90=per_90, per_game=per_game, totals=totals)
 
         st.dataframe(display_df.style.format("{:.2f}"))
 
+with tab3:
+    st.header("Bulk Import Matches")
+    st.write("Upload a CSV or Excel file with one row per player per match. Column names are matched to the Match Stats fields (e.g. 'Player', 'Mins', 'Rating' and 'MOTM' are recognised). Missing stat columns default to 0.")
+
+    import_file = st.file_uploader("Match File", type=["csv", "xlsx"], key="bulk_import_file")
+    require_squad = st.checkbox("Only accept players that exist in the Squad", value=True)
+
+    if import_file:
+        known_players = squad_df["Name"].tolist() if require_squad and not squad_df.empty else None
+        try:
+            valid_rows, import_errors, unmapped = prepare_match_import(
+                import_file, dm.headers["MatchStats"], known_players
+            )
+        except Exception as e:
+            st.error(f"Error reading file: {e}")
+            st.stop()
+
+        if unmapped:
+            st.warning(f"Ignored columns (no matching Match Stats field): {', '.join(map(str, unmapped))}")
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Valid Rows", len(valid_rows))
+        col2.metric("Rows with Errors", import_errors["Row"].nunique())
+        col3.metric("Matches", len(valid_rows[["Season", "Competition", "Opponent", "Date"]].drop_duplicates()))
+
+        if not import_errors.empty:
+            st.subheader("Row Errors")
+            st.dataframe(import_errors, width='stretch', hide_index=True)
+
+        if not valid_rows.empty:
+            st.subheader("Preview")
+            st.dataframe(valid_rows.head(50), width='stretch', hide_index=True)
+
+            if st.button(f"Import {len(valid_rows)} Valid Rows", type="primary"):
+                try:
+                    # Single append + single cache invalidation for the whole file
+                    dm.append_data("MatchStats", valid_rows)
+                    st.success(f"Imported {len(valid_rows)} rows.")
+                    st.cache_data.clear()
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Error importing stats: {e}")
@@ -1,6 +1,5 @@
 import streamlit as st
 import pandas as pd
-import re
 
 st.set_page_config(page_title="Team Stats", page_icon="🏆", layout="wide")
 
@@ -11,85 +10,62 @@ if 'data_manager' not in st.session_state:
     st.switch_page("app.py")
 
 dm = st.session_state['data_manager']
+dm.keep_alive()
+dm.profiler.start_run("Team Stats")
 
 
 # --- Load Data ---
-@st.cache_data(ttl=600)
-def load_match_stats(_dm):
-    return _dm.get_data("MatchStats")
+# Read straight from the DataManager: the filter index below is built for its current data version
+match_stats_df = dm.get_data("MatchStats")
 
-try:
-    match_stats_df = load_match_stats(dm)
-except Exception as e:
-    st.error(f"Error loading data: {e}")
-    st.stop()
-
-if match_stats_df.empty:
+if match_stats_df.empty and not dm.archived_seasons:
     st.info("No match data available.")
 else:
     # Sidebar Filters
     st.sidebar.header("Filters")
-    seasons = match_stats_df["Season"].astype(str).unique()
-    competitions = match_stats_df["Competition"].unique()
+    filter_idx = dm.filter_index()
+    seasons = dm.filter_values("Season")
+    competitions = dm.filter_values("Competition")
     
     selected_season = st.sidebar.selectbox("Season", seasons)
     selected_comp = st.sidebar.selectbox("Competition", ["All"] + list(competitions))
     
+    comp_filter = None if selected_comp == "All" else selected_comp
+
     # Filter Data
-    df = match_stats_df[match_stats_df["Season"].astype(str) == selected_season]
-    if selected_comp != "All":
-        df = df[df["Competition"] == selected_comp]
+    with dm.profiler.stage("Filtering", rows=len(match_stats_df)):
+        if selected_season in dm.archived_seasons:
+            # Archived rows are on disk; their frozen sums count one Games Played per row
+            n_rows = int(dm.closed_seasons[selected_season].player_totals([comp_filter] if comp_filter else None)["Games Played"].sum())
+        else:
+            n_rows = int(filter_idx.mask({"Season": selected_season, "Competition": comp_filter}).sum())
         
-    if df.empty:
+    if n_rows == 0:
         st.warning("No stats for this selection.")
     else:
+        if selected_season in dm.archived_seasons:
+            st.caption(f"Season {selected_season} is archived on disk: figures come from its frozen aggregates.")
+        elif selected_season in dm.closed_seasons:
+            st.caption(f"Season {selected_season} is closed: figures come from its frozen aggregates.")
+
         # --- Team Performance (W/D/L) ---
-        # We need unique matches to calculate W/D/L, but stats are per player.
-        # We can drop duplicates by (Season, Competition, Opponent, Date) to get unique matches.
-        matches_df = df[["Season", "Competition", "Opponent", "Scores", "Date"]].drop_duplicates()
-        
-        wins = 0
-        draws = 0
-        losses = 0
-        
-        for index, row in matches_df.iterrows():
-            score_str = str(row["Scores"])
-            # Try to parse "Home - Away" or "Home-Away"
-            # Assuming user team is always first number per "Scores" field input assumption
-            parts = re.split(r'\D+', score_str) # split by non-digits
-            parts = [p for p in parts if p] # filter empty
-            
-            if len(parts) >= 2:
-                try:
-                    us = int(parts[0])
-                    them = int(parts[1])
-                    if us > them:
-                        wins += 1
-                    elif us == them:
-                        draws += 1
-                    else:
-                        losses += 1
-                except:
-                    pass # cannot parse
-                    
+        # Stats are per player, so W/D/L is computed over unique (Season, Competition, Opponent, Scores, Date) matches.
+        with dm.profiler.stage("W/D/L", rows=n_rows):
+            record = dm.team_record(selected_season, comp_filter)
+
         # Display W/D/L
         col1, col2, col3, col4 = st.columns(4)
-        col1.metric("Games Played", len(matches_df))
-        col2.metric("Wins", wins)
-        col3.metric("Draws", draws)
-        col4.metric("Losses", losses)
+        col1.metric("Games Played", record["Games Played"])
+        col2.metric("Wins", record["Wins"])
+        col3.metric("Draws", record["Draws"])
+        col4.metric("Losses", record["Losses"])
         
         # --- Aggregated Stats ---
         st.subheader("Aggregated Team Stats")
         
-        # Identify numeric columns (Stats)
-        # We need to exclude metadata and booleans
-        numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns.tolist()
-        # Filter out obvious metadata if they got detected as numeric
-        numeric_cols = [c for c in numeric_cols if c not in ["Season", "Year"]]
-        
-        # Sum all stats
-        team_totals = df[numeric_cols].sum()
+        # Sum all numeric stats (metadata excluded)
+        with dm.profiler.stage("Aggregation", rows=n_rows):
+            totals = dm.team_totals(selected_season, comp_filter)
         
         # Divide by Games Played for "Per Game" on Team Level? 
         # Requirement: "Show users complete team stats per season (By adding and averaging for all players and all matches)"
@@ -98,7 +74,74 @@ else:
         # I will show Totals and Per Game Average
         
         st.dataframe(pd.DataFrame({
-            "Total": team_totals,
-            "Per Match Avg": team_totals / len(matches_df) if len(matches_df) > 0 else 0
+            "Total": totals,
+            "Per Match Avg": totals / record["Games Played"] if record["Games Played"] > 0 else 0
         }).style.format("{:.2f}"))
 
+    # --- Opponent History ---
+    st.subheader("Opponent History")
+    # Head-to-head records are indexed per opponent/competition; lookups do not scan the match rows
+    h2h = dm.head_to_head()
+    if not h2h.opponents():
+        st.info("No match data available.")
+    else:
+        hist_col1, hist_col2 = st.columns(2)
+        opponent = hist_col1.selectbox("Opponent", h2h.opponents(), key="h2h_opponent")
+        hist_comp = hist_col2.selectbox("Competition", ["All"] + list(competitions), key="h2h_competition")
+        entry = h2h.lookup(opponent, None if hist_comp == "All" else hist_comp)
+        if entry is None:
+            st.info(f"No matches against {opponent} in {hist_comp}.")
+        else:
+            h2h_record = entry.record()
+            h1, h2, h3, h4, h5 = st.columns(5)
+            h1.metric("Games Played", h2h_record["Games Played"])
+            h2.metric("Wins", h2h_record["Wins"])
+            h3.metric("Draws", h2h_record["Draws"])
+            h4.metric("Losses", h2h_record["Losses"])
+            h5.metric("Goals For / Against", f"{h2h_record['Goals For']} / {h2h_record['Goals Against']}")
+            scorers_col, fixtures_col = st.columns([1, 2])
+            with scorers_col:
+                st.write("#### Top Scorers")
+                st.dataframe(entry.top_scorers(5), width='stretch', hide_index=True)
+            with fixtures_col:
+                st.write("#### Fixtures")
+                st.dataframe(h2h.fixtures(opponent, None if hist_comp == "All" else hist_comp), width='stretch', hide_index=True)
+
+    # --- Season Partitions ---
+    st.subheader("Season Partitions")
+    st.write("Closing a season freezes its match stats: its player, competition and W/D/L aggregates are computed once and reused, and its rows can no longer be edited until it is reopened.")
+    st.dataframe(dm.season_partitions(), width='stretch', hide_index=True)
+
+    # Archive mode moves closed seasons to memory-mapped files on local disk
+    st.caption("Archiving a season closes it and moves its rows to memory-mapped files on local disk, so long careers stay within RAM. "
+               "Archived seasons still count everywhere and are read back in chunks when needed.")
+    if st.toggle("Archive mode", value=dm.archive is not None, key="archive_mode") and dm.archive is None:
+        dm.enable_archive()
+
+    part_col1, part_col2, part_col3 = st.columns([2, 1, 1])
+    partition_season = part_col1.selectbox("Season", seasons, key="partition_season")
+    if partition_season in dm.closed_seasons:
+        if part_col2.button("Reopen Season"):
+            dm.reopen_season(partition_season)
+            st.cache_data.clear()
+            st.rerun()
+    elif part_col2.button("Close Season"):
+        try:
+            dm.close_season(partition_season)
+            st.cache_data.clear()
+            st.rerun()
+        except ValueError as e:
+            st.error(str(e))
+    if dm.archive is not None:
+        if partition_season in dm.archived_seasons:
+            if part_col3.button("Restore Season"):
+                dm.restore_season(partition_season)
+                st.cache_data.clear()
+                st.rerun()
+        elif part_col3.button("Archive Season"):
+            try:
+                dm.archive_season(partition_season)
+                st.cache_data.clear()
+                st.rerun()
+            except ValueError as e:
+                st.error(str(e))
@@ -2,8 +2,12 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from scipy import stats
 import numpy as np
+import integrity
+import memory
+import reconcile
+import scatter_sampling
+from analytics import STAT_COLUMNS, correlation_matrix, prepare_squad_info, per_90, radar_values, percentile_ranks
 
 st.set_page_config(page_title="Stats Dashboard", page_icon="📈", layout="wide")
 
@@ -16,99 +20,32 @@ if 'data_manager' not in st.session_state:
 
 # --- Data Loading ---
 dm = st.session_state['data_manager']
+dm.keep_alive()
+dm.profiler.start_run("Stats Dashboard")
 
 
 squad_df = dm.get_data("Squad")
 match_stats_df = dm.get_data("MatchStats")
 transfers_df = dm.get_data("Transfers")
 
-if match_stats_df.empty:
+if match_stats_df.empty and not dm.archived_seasons:
     st.info("No match stats available to analyze.")
     st.stop()
 
 # --- Data Preprocessing ---
-# Convert numeric columns
-numeric_cols = [
-    "Minutes Played", "Match Rating", "Goals", "Own Goals", "Assists",
-    "Shots", "Shots on Target", "Passes Attempted", "Passes Completed",
-    "Short Passes Attempted", "Short Passes Completed",
-    "Medium Passes Attempted", "Medium Passes Completed",
-    "Long Passes Attempted", "Long Passes Completed",
-    "Dribbles Attempted", "Dribbles Completed",
-    "Crosses Attempted", "Crosses Completed",
-    "Tackles Attempted", "Tackles Completed",
-    "Interceptions", "Key Passes", "Key Dribbles", "Fouled",
-    "Successful 1 on 1 Dribbles", "Fouls", "Penalties Conceded",
-    "Blocks", "Out of Position", "Posession Won", "Posession Lost",
-    "Clearances", "Headers Won", "Headers Lost",
-    "Saves", "Shots Caught", "Shots Parried", "Crosses Caught", "Balls Stripped"
-]
-
-for col in numeric_cols:
-    if col in match_stats_df.columns:
-        match_stats_df[col] = pd.to_numeric(match_stats_df[col], errors='coerce').fillna(0)
-
-# Merge Squad info (Position, Nationality, etc.)
-# We need to handle potential duplicates in Squad if same player is in multiple seasons
-# We merge on Name and Season
-squad_info = squad_df[["Name", "Season", "Position 1", "Position 2", "Position 3", "Position 4", "Nationality", "Age"]]
-squad_info = squad_info.rename(columns={"Name": "Player Name"})
-
-# Ensure Season columns match type and clean strings for matching
-squad_info["Season"] = squad_info["Season"].astype(str).str.strip()
-match_stats_df["Season"] = match_stats_df["Season"].astype(str).str.strip()
-squad_info["Player Name"] = squad_info["Player Name"].astype(str).str.strip()
-match_stats_df["Player Name"] = match_stats_df["Player Name"].astype(str).str.strip()
-
-# Create normalized keys for merging
-squad_info["_merge_name"] = squad_info["Player Name"].str.lower()
-squad_info["_merge_season"] = squad_info["Season"].str.lower()
-match_stats_df["_merge_name"] = match_stats_df["Player Name"].str.lower()
-match_stats_df["_merge_season"] = match_stats_df["Season"].str.lower()
-
-merged_df = pd.merge(match_stats_df, squad_info, left_on=["_merge_name", "_merge_season"], right_on=["_merge_name", "_merge_season"], how="left", suffixes=("", "_squad"))
-
-# Drop helper columns and duplicate columns if any (suffixes handle name/season duplicates but we want to keep original MatchStats name/season usually)
-# Actually, since we join on name/season, we should be careful.
-# The merge will keep both if headers differ, or use suffixes.
-# We want to keep the canonical name from one of them.
-# Drop _merge columns
-merged_df = merged_df.drop(columns=["_merge_name", "_merge_season"])
-# If suffixes created duplicate Name/Season columns, we might need to clean up.
-# right_on/left_on keeps the key columns from both if they have different names. Here they are _merge_*.
-# But "Player Name" and "Season" exist in both. list(match_stats) and list(squad).
-# pandas merge with on=... keeps 1. with left_on/right_on it keeps both?
-# We used separate specific columns for keys. The original "Player Name" and "Season" columns are NOT used as keys.
-# So "Player Name" from match_stats and "Player Name" from squad will both be present as "Player Name" and "Player Name_squad".
-# We should coalesce them or just use match_stats one.
-# Let's drop the _squad versions.
-if "Player Name_squad" in merged_df.columns:
-    merged_df = merged_df.drop(columns=["Player Name_squad"])
-if "Season_squad" in merged_df.columns:
-    merged_df = merged_df.drop(columns=["Season_squad"])
-
-# Aggregation helper
-def aggregate_stats(df, group_cols):
-    agg_funcs = {col: 'sum' for col in numeric_cols if col != "Match Rating"}
-    agg_funcs["Match Rating"] = 'mean'
-    
-    # Metadata to preserve (taking first value found in group)
-    meta_cols = ["Position 1", "Position 2", "Position 3", "Position 4", "Nationality", "Age", "Season"]
-    for mc in meta_cols:
-        if mc in df.columns and mc not in group_cols:
-            agg_funcs[mc] = 'first'
-    
-    # Games played
-    games = df.groupby(group_cols).size().rename("Games Played")
-    
-    # Sums
-    agg = df.groupby(group_cols).agg(agg_funcs)
-    agg = agg.join(games)
-    
-    # Recalculate Per 90
-    agg["90s Played"] = agg["Minutes Played"] / 90
-    
-    return agg.reset_index()
+# Numeric stats, stripped Name/Season keys and Squad info (Position, Nationality, etc.) merged on (Name, Season).
+# Both frames are built once per data version (possibly already by the background warm-up); the stored sheets are left untouched.
+numeric_cols = STAT_COLUMNS
+with dm.profiler.stage("Numeric coercion", rows=len(match_stats_df)):
+    match_stats_df = dm.prepared_match_stats()
+
+with dm.profiler.stage("Squad merge") as rec:
+    merged_df = dm.merged_match_stats()
+    rec.rows = len(merged_df)
+
+# merged_df only holds the in-memory seasons; every aggregate below comes from dm.aggregate, which adds the archived ones
+if dm.archived_seasons:
+    st.caption(f"Archived seasons (read from disk): {', '.join(sorted(dm.archived_seasons))}")
 
 # Constants
 CATEGORY_PRESETS = {
@@ -126,37 +63,35 @@ if "Goals Conceded" not in match_stats_df.columns:
 
 
 # --- UI Structure ---
-tab1, tab2, tab3 = st.tabs(["Stats Dashboard", "Player Comparison", "Player Scout Report"])
+tab1, tab2, tab3, tab4 = st.tabs(["Stats Dashboard", "Player Comparison", "Player Scout Report", "Similar Players"])
 
 # === TAB 1: STATS DASHBOARD ===
 with tab1:
     st.header("Stats Dashboard")
     
-    menu = st.radio("View", ["Overall Player Performance", "Multi-Stat Comparison"], horizontal=True)
+    menu = st.radio("View", ["Overall Player Performance", "Season Leaders", "Multi-Stat Comparison"], horizontal=True)
     
     # Global Filter for this tab
     multi_season = st.toggle("Compare Across Seasons", value=True)
     
-    if multi_season:
-        df_to_use = merged_df
-        # If multiple seasons, grouping by Name + Season? Or just Name to aggregate career?
-        # "Allows comparing players across seasons" -> implies we see Player X (2023) vs Player Y (2024) OR Player X (Total).
-        # Standard: Group by Player Name + Season to treat them as separate entities for comparison
-        group_cols = ["Player Name", "Season"]
-    else:
-        seasons = sorted(merged_df["Season"].unique())
-        if seasons:
-            selected_season = st.selectbox("Select Season", seasons, index=len(seasons)-1)
-            df_to_use = merged_df[merged_df["Season"] == selected_season]
-        else:
-            df_to_use = merged_df
-        group_cols = ["Player Name"]
-
-    # Aggregate
-    agg_data = aggregate_stats(df_to_use, group_cols)
-    
-    # Aggregate
-    agg_data = aggregate_stats(df_to_use, group_cols)
+    scope = "All Seasons"
+    selected_season = None
+    # Across seasons, players are grouped by Player Name + Season so Player X (2023) and Player Y (2024) are separate entities
+    if not multi_season:
+        seasons = sorted(dm.filter_values("Season"))
+        selected_season = st.selectbox("Select Season", seasons, index=len(seasons)-1)
+        scope = selected_season
+
+    # Aggregate (once per data version and scope; the views below only read it)
+    with dm.profiler.stage("Aggregation") as rec:
+        agg_data = dm.aggregate(selected_season)
+        rec.rows = len(agg_data)
+
+    def leaderboard_index():
+        """Top/bottom 50 of every stat for this scope, built on first use per data version."""
+        return dm.leaderboard_index(selected_season)
+
+    row_labels = (agg_data["Player Name"] + " (" + agg_data["Season"] + ")") if multi_season else agg_data["Player Name"]
     
     if menu == "Overall Player Performance":
         col1, col2, col3, col4 = st.columns(4)
@@ -166,36 +101,29 @@ with tab1:
         lower_is_better = col3.toggle("Lower is Better", value=False)
         show_per_90 = col4.toggle("Per 90", value=False)
         
-        # Prepare Data
-        plot_df = agg_data.copy()
+        # Top / bottom N straight from the leaderboard index (no copy or full sort of the table)
+        # If lower_is_better is True (Rank 1 is best), we want the smallest values.
+        board = leaderboard_index()
+        positions = board.positions(stat, top_n, use_per_90=show_per_90, lowest=lower_is_better)
+        plot_df = agg_data.iloc[positions].copy()
         y_col = stat
-        
         if show_per_90 and stat != "Match Rating":
-            plot_df[f"{stat} per 90"] = plot_df[stat] / plot_df["90s Played"].replace(0, 1)
             y_col = f"{stat} per 90"
-            
-        # Sort
-        # If lower_is_better is True (Rank 1 is best), we want smallest values. ascending=True.
-        # If lower_is_better is False (Goals 30 is best), we want largest values. ascending=False.
-        plot_df = plot_df.sort_values(by=y_col, ascending=lower_is_better).head(top_n)
-        
-        # Label
-        if multi_season:
-            plot_df["Label"] = plot_df["Player Name"] + " (" + plot_df["Season"] + ")"
-        else:
-            plot_df["Label"] = plot_df["Player Name"]
+            plot_df[y_col] = board.value(stat, positions, use_per_90=True)
+        plot_df["Label"] = row_labels.iloc[positions].to_numpy()
             
         # Chart
-        fig = px.bar(
-            plot_df, 
-            x="Label", 
-            y=y_col,
-            color="Position 1" if "Position 1" in plot_df.columns else None,
-            title=f"Top {top_n} {stat}{' (Per 90)' if show_per_90 else ''}",
-            text_auto='.2f'
-        )
-        # Ensure visual sorting follows value
-        fig.update_layout(xaxis={'categoryorder':'total descending' if not lower_is_better else 'total ascending'})
+        with dm.profiler.stage("Figure construction", rows=len(plot_df)):
+            fig = px.bar(
+                plot_df, 
+                x="Label", 
+                y=y_col,
+                color="Position 1" if "Position 1" in plot_df.columns else None,
+                title=f"Top {top_n} {stat}{' (Per 90)' if show_per_90 else ''}",
+                text_auto='.2f'
+            )
+            # Ensure visual sorting follows value
+            fig.update_layout(xaxis={'categoryorder':'total descending' if not lower_is_better else 'total ascending'})
         st.plotly_chart(fig, width="stretch")
         
         # Table
@@ -205,6 +133,20 @@ with tab1:
             cols_to_show.append(y_col)
         st.dataframe(plot_df[cols_to_show].style.format({y_col: "{:.2f}"}))
 
+    elif menu == "Season Leaders":
+        lead_col1, lead_col2, lead_col3 = st.columns([3, 1, 1])
+        leader_stats = lead_col1.multiselect("Stats", numeric_cols, default=[c for c in numeric_cols if c != "Minutes Played"])
+        leader_n = lead_col2.slider("Leaders per Stat", 1, 10, 3)
+        leaders_per_90 = lead_col3.toggle("Per 90", value=False, key="leaders_p90")
+
+        with dm.profiler.stage("Leaderboard lookup", rows=len(agg_data)):
+            leaders = leaderboard_index().leaders(row_labels, leader_stats, leader_n, use_per_90=leaders_per_90)
+            leaders["Leader"] = leaders["Player"] + " — " + leaders["Value"].map("{:.2f}".format)
+            overview = leaders.pivot(index="Stat", columns="Rank", values="Leader").reindex(leader_stats)
+            overview.columns = [f"#{rank}" for rank in overview.columns]
+        st.caption(f"Leaders for {scope}" + (" (per 90; Match Rating is an average)" if leaders_per_90 else ""))
+        st.dataframe(overview, width='stretch')
+
     elif menu == "Multi-Stat Comparison":
         col1, col2, col3 = st.columns(3)
         stat_x = col1.selectbox("Stat X", numeric_cols, index=numeric_cols.index("Passes Attempted") if "Passes Attempted" in numeric_cols else 0)
@@ -215,6 +157,13 @@ with tab1:
         show_trend = extra_col1.toggle("Trendline (OLS)", value=True)
         show_median = extra_col2.toggle("Median Lines", value=True)
         show_per_90_scatter = extra_col3.toggle("Show Per 90", key="scatter_p90")
+        # Large saves: plot a sample (outliers always kept) or server-side density bins instead of every point
+        point_mode = extra_col4.selectbox("Points", ["All", "Sample", "Density"], key="scatter_points",
+                                          help="Sample keeps the most extreme points and a random share of the rest; Density bins the points on the server (2D only).")
+        if point_mode != "All":
+            red_col1, red_col2 = st.columns(2)
+            scatter_min_minutes = red_col1.number_input("Minimum Minutes", min_value=0, value=0, step=90, key="scatter_min_minutes")
+            scatter_budget = red_col2.number_input("Max Points", min_value=100, value=scatter_sampling.MAX_POINTS, step=100, key="scatter_budget")
         
         # Prepare Data
         scatter_df = agg_data.copy()
@@ -238,58 +187,112 @@ with tab1:
             if stat_z != "None":
                 z_val = stat_z
 
-        if multi_season:
-            scatter_df["Label"] = scatter_df["Player Name"] + " (" + scatter_df["Season"] + ")"
-        else:
-            scatter_df["Label"] = scatter_df["Player Name"]
+        # Full correlation matrix for the current filters, computed once per data version
+        def correlations(per_90_values, position="All"):
+            rows = agg_data if position == "All" else agg_data[agg_data["Position 1"] == position]
+            key = ("correlation", scope, per_90_values, position)
+            return dm.cached(key, lambda: correlation_matrix(rows, numeric_cols, use_per_90=per_90_values))
+
+        scatter_df["Label"] = row_labels
             
         hover_data = ["Player Name", "Season", "Position 1", "Age", "Minutes Played"]
 
-        if stat_z == "None":
+        # Points sent to the browser (median lines, trend line and correlation still use every row)
+        plot_cols = [c for c in [x_val, y_val, z_val] if c]
+        plot_df = scatter_df
+        if point_mode == "Sample" or (point_mode == "Density" and z_val):
+            with dm.profiler.stage("Downsampling", rows=len(scatter_df)):
+                plot_df, _ = scatter_sampling.downsample(scatter_df, plot_cols, scatter_budget, scatter_min_minutes)
+        elif point_mode == "Density":
+            plot_df = scatter_df[scatter_df["Minutes Played"] >= scatter_min_minutes]
+        large = len(plot_df) > scatter_sampling.WEBGL_THRESHOLD
+        if point_mode == "Density" and not z_val:
+            st.caption(f"Binning {len(plot_df):,} of {len(scatter_df):,} points on the server; the most extreme are labelled.")
+        elif point_mode != "All" or large:
+            st.caption(f"Plotting {len(plot_df):,} of {len(scatter_df):,} points" + (" with WebGL" if large or z_val else "") + ".")
+
+        if stat_z == "None" and point_mode == "Density":
+            # Server-side 2D histogram plus the labelled outliers
+            with dm.profiler.stage("Figure construction", rows=len(plot_df)):
+                bin_x, bin_y, counts = scatter_sampling.density_bins(plot_df, x_val, y_val)
+                fig = go.Figure(go.Heatmap(x=bin_x, y=bin_y, z=counts, colorscale="Blues", colorbar=dict(title="Players"),
+                                           hovertemplate=f"{x_val}: %{{x:.2f}}<br>{y_val}: %{{y:.2f}}<br>Players: %{{z}}<extra></extra>"))
+                extremes = plot_df[scatter_sampling.outlier_mask(plot_df, plot_cols)]
+                fig.add_trace(go.Scatter(
+                    x=extremes[x_val], y=extremes[y_val], mode="markers+text", text=extremes["Label"],
+                    textposition="top center", marker=dict(size=8, color="orange"), name="Outliers",
+                ))
+                fig.update_layout(xaxis_title=x_val, yaxis_title=y_val)
+
+                if show_trend:
+                    line = scatter_sampling.ols_line(scatter_df, x_val, y_val)
+                    if line is not None:
+                        fig.add_trace(go.Scatter(x=line[x_val], y=line[y_val], mode="lines", line=dict(color="white"), name="Overall Trend"))
+
+                if show_median:
+                    fig.add_hline(y=scatter_df[y_val].median(), line_dash="dash", line_color="gray", annotation_text="Median Y")
+                    fig.add_vline(x=scatter_df[x_val].median(), line_dash="dash", line_color="gray", annotation_text="Median X")
+
+            st.plotly_chart(fig, width="stretch")
+
+            corr = correlations(show_per_90_scatter).loc[stat_x, stat_y]
+            st.metric("Correlation (Pearson)", f"{corr:.3f}")
+
+        elif stat_z == "None":
             # 2D Plot
-            fig = px.scatter(
-                scatter_df, 
-                x=x_val, 
-                y=y_val, 
-                color="Position 1",
-                hover_name="Label",
-                hover_data=hover_data
-            )
-            # Increased marker size to 20
-            fig.update_traces(marker=dict(size=20, opacity=0.8, line=dict(width=1, color='DarkSlateGrey')))
+            with dm.profiler.stage("Figure construction", rows=len(plot_df)):
+                fig = px.scatter(
+                    plot_df, 
+                    x=x_val, 
+                    y=y_val, 
+                    color="Position 1",
+                    hover_name="Label",
+                    hover_data=hover_data,
+                    render_mode="webgl" if large else "svg",
+                )
+                # Marker size 20, shrinking once there are enough points to need WebGL
+                fig.update_traces(marker=dict(size=scatter_sampling.marker_size(len(plot_df)), opacity=0.8, line=dict(width=0 if large else 1, color='DarkSlateGrey')))
             
-            if show_trend:
-                # Calculate overall trendline (ignoring groups)
-                fig_trend = px.scatter(scatter_df, x=x_val, y=y_val, trendline="ols")
-                # The second trace is the trendline (first is points)
-                if len(fig_trend.data) > 1:
-                    trend_trace = fig_trend.data[1]
-                    trend_trace.line.color = 'white' # Visible on dark/light
-                    trend_trace.name = "Overall Trend"
-                    trend_trace.showlegend = True
-                    fig.add_trace(trend_trace)
+                if show_trend and not large and point_mode == "All":
+                    # Calculate overall trendline (ignoring groups)
+                    fig_trend = px.scatter(scatter_df, x=x_val, y=y_val, trendline="ols")
+                    # The second trace is the trendline (first is points)
+                    if len(fig_trend.data) > 1:
+                        trend_trace = fig_trend.data[1]
+                        trend_trace.line.color = 'white' # Visible on dark/light
+                        trend_trace.name = "Overall Trend"
+                        trend_trace.showlegend = True
+                        fig.add_trace(trend_trace)
+                elif show_trend:
+                    # Same OLS fit over every row, drawn as two points instead of one per player
+                    line = scatter_sampling.ols_line(scatter_df, x_val, y_val)
+                    if line is not None:
+                        fig.add_trace(go.Scatter(x=line[x_val], y=line[y_val], mode="lines", line=dict(color="white"), name="Overall Trend"))
             
-            if show_median:
-                fig.add_hline(y=scatter_df[y_val].median(), line_dash="dash", line_color="gray", annotation_text="Median Y")
-                fig.add_vline(x=scatter_df[x_val].median(), line_dash="dash", line_color="gray", annotation_text="Median X")
+                if show_median:
+                    fig.add_hline(y=scatter_df[y_val].median(), line_dash="dash", line_color="gray", annotation_text="Median Y")
+                    fig.add_vline(x=scatter_df[x_val].median(), line_dash="dash", line_color="gray", annotation_text="Median X")
                 
             st.plotly_chart(fig, width="stretch")
             
             # Correlation
-            corr, _ = stats.pearsonr(scatter_df[x_val], scatter_df[y_val])
+            corr = correlations(show_per_90_scatter).loc[stat_x, stat_y]
             st.metric("Correlation (Pearson)", f"{corr:.3f}")
             
         else:
             # 3D Plot
-            fig = px.scatter_3d(
-                scatter_df,
-                x=x_val,
-                y=y_val,
-                z=z_val,
-                color="Position 1",
-                hover_name="Label",
-                hover_data=hover_data
-            )
+            with dm.profiler.stage("Figure construction", rows=len(plot_df)):
+                fig = px.scatter_3d(
+                    plot_df,
+                    x=x_val,
+                    y=y_val,
+                    z=z_val,
+                    color="Position 1",
+                    hover_name="Label",
+                    hover_data=hover_data
+                )
+                if large:
+                    fig.update_traces(marker=dict(size=3))
             st.plotly_chart(fig, width="stretch")
 
         # Table - Show only selected stats
@@ -299,6 +302,25 @@ with tab1:
             
         st.dataframe(scatter_df[cols_to_show_scatter].style.format({x_val: "{:.2f}", y_val: "{:.2f}", z_val if z_val else "": "{:.2f}"}))
 
+        st.subheader("Correlation Matrix")
+        heat_col1, heat_col2 = st.columns(2)
+        heat_per_90 = heat_col1.toggle("Per 90", value=show_per_90_scatter, key="corr_p90")
+        heat_positions = sorted(str(p) for p in agg_data["Position 1"].dropna().unique())
+        heat_position = heat_col2.selectbox("Position", ["All"] + heat_positions, key="corr_position")
+
+        with dm.profiler.stage("Correlation matrix", rows=len(agg_data)):
+            corr_df = correlations(heat_per_90, heat_position)
+            fig_corr = px.imshow(
+                corr_df,
+                zmin=-1,
+                zmax=1,
+                color_continuous_scale="RdBu",
+                aspect="auto",
+                template="plotly_dark",
+            )
+            fig_corr.update_layout(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)", height=900)
+        st.plotly_chart(fig_corr, width="stretch")
+
 # === TAB 2: PLAYER COMPARISON ===
 with tab2:
     st.header("Player Comparison (Radar)")
@@ -311,7 +333,9 @@ with tab2:
     # Or just raw values? The prompt asks for Normalization.
     
     # Re-aggregate everything by Player+Season first
-    all_players_agg = aggregate_stats(merged_df, ["Player Name", "Season"])
+    with dm.profiler.stage("Aggregation") as rec:
+        all_players_agg = dm.aggregate().copy()  # gets a label column below; the cached table stays as is
+        rec.rows = len(all_players_agg)
     all_players_agg["Unique Name"] = all_players_agg["Player Name"] + " (" + all_players_agg["Season"] + ")"
     
     col1, col2 = st.columns(2)
@@ -338,60 +362,38 @@ with tab2:
         
         # Calculate max for normalization across entire dataset (filtered by position maybe? keeping simple for now)
         
-        radar_data = []
+        with dm.profiler.stage("Radar normalization + figure", rows=len(all_players_agg)):
+            radar_df = radar_values(comparison_data, all_players_agg, selected_attrs, use_per_90=use_per_90, normalize=normalize)
+            radar_data = []
         
-        for idx, row in comparison_data.iterrows():
-            r_vals = []
-            theta_vals = []
-            
-            for attr in selected_attrs:
-                val = row[attr]
-                
-                if use_per_90 and attr != "Match Rating":
-                    val = val / (row["90s Played"] if row["90s Played"] > 0 else 1)
-                
-                # Normalization
-                if normalize:
-                    # Get max of this attribute in the whole dataset
-                    all_vals = all_players_agg[attr]
-                    if use_per_90 and attr != "Match Rating":
-                        all_vals = all_vals / all_players_agg["90s Played"].replace(0, 1)
-                    
-                    max_val = all_vals.max()
-                    min_val = all_vals.min()
-                    
-                    if max_val - min_val > 0:
-                        val = (val - min_val) / (max_val - min_val)
-                    else:
-                        val = 0
-                
-                r_vals.append(val)
-                theta_vals.append(attr)
+            for idx, row in comparison_data.iterrows():
+                r_vals = radar_df.loc[idx].tolist()
+                theta_vals = list(selected_attrs)
             
-            # Close the loop
-            r_vals.append(r_vals[0])
-            theta_vals.append(theta_vals[0])
+                # Close the loop
+                r_vals.append(r_vals[0])
+                theta_vals.append(theta_vals[0])
             
-            radar_data.append(go.Scatterpolar(
-                r=r_vals,
-                theta=theta_vals,
-                fill='toself' if fill_area else 'none',
-                name=row["Unique Name"]
-            ))
-
-        # Radar Chart
-        fig = go.Figure(data=radar_data)
-        fig.update_layout(
-            template="plotly_dark",
-            polar=dict(
-                radialaxis=dict(visible=True, range=[0, 1] if normalize else None),
-                bgcolor="rgba(0,0,0,0)"
-            ),
-            showlegend=True,
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            height=600 # Bigger Radar
-        )
+                radar_data.append(go.Scatterpolar(
+                    r=r_vals,
+                    theta=theta_vals,
+                    fill='toself' if fill_area else 'none',
+                    name=row["Unique Name"]
+                ))
+
+            # Radar Chart
+            fig = go.Figure(data=radar_data)
+            fig.update_layout(
+                template="plotly_dark",
+                polar=dict(
+                    radialaxis=dict(visible=True, range=[0, 1] if normalize else None),
+                    bgcolor="rgba(0,0,0,0)"
+                ),
+                showlegend=True,
+                paper_bgcolor="rgba(0,0,0,0)",
+                plot_bgcolor="rgba(0,0,0,0)",
+                height=600 # Bigger Radar
+            )
         st.plotly_chart(fig, width="stretch")
         
         # Breakdown Table
@@ -414,17 +416,17 @@ with tab3:
     
     # Filters
     scout_col1, scout_col2 = st.columns(2)
-    scout_seasons = sorted(merged_df["Season"].unique())
+    scout_seasons = sorted(dm.filter_values("Season"))
     if scout_seasons:
         scout_season = scout_col1.selectbox("Season", scout_seasons, index=len(scout_seasons)-1, key="scout_season")
     else:
         st.info("No seasons available.")
         st.stop()
     
-    # Filter players by season
-    season_players_df = merged_df[merged_df["Season"] == scout_season]
-    # Re-aggregate for this season
-    season_agg = aggregate_stats(season_players_df, ["Player Name"])
+    # Aggregate this season (archived seasons are read from their partition)
+    with dm.profiler.stage("Aggregation") as rec:
+        season_agg = dm.aggregate(scout_season)
+        rec.rows = len(season_agg)
     
     scout_player = scout_col2.selectbox("Select Player", season_agg["Player Name"].unique())
     
@@ -462,83 +464,67 @@ with tab3:
         
         cat_colors = {"Passing": "skyblue", "Attacking": "salmon", "Defending": "lightgreen"}
         
-        for cat_name, items in selected_cats.items():
-            for stat in items:
-                # Player val
-                p_val = player_row[stat]
-                p_90s = player_row["90s Played"] if player_row["90s Played"] > 0 else 1
-                p_metric = p_val / p_90s if stat != "Match Rating" else p_val
-                
-                # Pool vals
-                pool_vals = pool_df[stat]
-                if stat != "Match Rating":
-                    pool_vals = pool_vals / pool_df["90s Played"].replace(0, 1)
-                
-                # Percentile
-                if len(pool_vals) > 0:
-                    percentile = stats.percentileofscore(pool_vals, p_metric)
-                else:
-                    percentile = 0
-                
-                pizza_labels.append(stat)
-                pizza_values.append(percentile)
-                # Value AND Percentile
-                pizza_texts.append(f"{p_metric:.1f}<br>({int(percentile)}%)")
+        with dm.profiler.stage("Percentile ranking", rows=len(pool_df)):
+            for cat_name, items in selected_cats.items():
+                ranks = percentile_ranks(player_row, pool_df, items)
+                for stat, p_metric, percentile in ranks.itertuples(index=False):
+                    pizza_labels.append(stat)
+                    pizza_values.append(percentile)
+                    # Value AND Percentile
+                    pizza_texts.append(f"{p_metric:.1f}<br>({int(percentile)}%)")
                 
-                if color_mode == "Category":
-                    colors.append(cat_colors[cat_name])
-                else:
-                    # Will use colorscale in marker
-                    pass
+                    if color_mode == "Category":
+                        colors.append(cat_colors[cat_name])
                 
         # Plot Pizza (Bar Polar)
-        marker_dict = dict(line=dict(color='white', width=1))
-        if color_mode == "Category":
-            marker_dict["color"] = colors
-        else:
-            marker_dict["color"] = pizza_values
-            marker_dict["colorscale"] = "RdYlGn"
-            marker_dict["cmin"] = 0
-            marker_dict["cmax"] = 100
-            marker_dict["showscale"] = True
-
-        fig_pizza = go.Figure()
+        with dm.profiler.stage("Figure construction"):
+            marker_dict = dict(line=dict(color='white', width=1))
+            if color_mode == "Category":
+                marker_dict["color"] = colors
+            else:
+                marker_dict["color"] = pizza_values
+                marker_dict["colorscale"] = "RdYlGn"
+                marker_dict["cmin"] = 0
+                marker_dict["cmax"] = 100
+                marker_dict["showscale"] = True
+
+            fig_pizza = go.Figure()
         
-        # BarPolar Layer
-        fig_pizza.add_trace(go.Barpolar(
-            r=pizza_values,
-            theta=pizza_labels,
-            # text=pizza_texts, # Not needed in Barpolar if using Scatter for text
-            marker=marker_dict,
-            hoverinfo="text+theta+r", 
-            hovertemplate="%{theta}: %{r:.1f}th Percentile<extra></extra>",
-            name="Percentile"
-        ))
+            # BarPolar Layer
+            fig_pizza.add_trace(go.Barpolar(
+                r=pizza_values,
+                theta=pizza_labels,
+                # text=pizza_texts, # Not needed in Barpolar if using Scatter for text
+                marker=marker_dict,
+                hoverinfo="text+theta+r", 
+                hovertemplate="%{theta}: %{r:.1f}th Percentile<extra></extra>",
+                name="Percentile"
+            ))
         
-        # Overlay Scatterpolar for Text Labels
-        fig_pizza.add_trace(go.Scatterpolar(
-            r=[v if v > 15 else 15 for v in pizza_values], # Ensure text is visible even for low values
-            theta=pizza_labels,
-            text=pizza_texts,
-            mode="text",
-            textfont=dict(size=11, color="white"),
-            hoverinfo="skip", # Static labels
-            showlegend=False
-        ))
+            # Overlay Scatterpolar for Text Labels
+            fig_pizza.add_trace(go.Scatterpolar(
+                r=[v if v > 15 else 15 for v in pizza_values], # Ensure text is visible even for low values
+                theta=pizza_labels,
+                text=pizza_texts,
+                mode="text",
+                textfont=dict(size=11, color="white"),
+                hoverinfo="skip", # Static labels
+                showlegend=False
+            ))
         
-        fig_pizza.update_layout(
-            template="plotly_dark",
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            height=700, # Bigger chart
-            font=dict(size=14),
-            polar=dict(
-                radialaxis=dict(visible=True, range=[0, 100], showticklabels=False), # Hide radial ticks to unclutter
-                angularaxis=dict(direction="clockwise"),
-                bgcolor="rgba(0,0,0,0)"
-            ),
-            title=f"Scout Report: {scout_player} (vs {', '.join(comp_pos)})"
-        )
+            fig_pizza.update_layout(
+                template="plotly_dark",
+                paper_bgcolor="rgba(0,0,0,0)",
+                plot_bgcolor="rgba(0,0,0,0)",
+                height=700, # Bigger chart
+                font=dict(size=14),
+                polar=dict(
+                    radialaxis=dict(visible=True, range=[0, 100], showticklabels=False), # Hide radial ticks to unclutter
+                    angularaxis=dict(direction="clockwise"),
+                    bgcolor="rgba(0,0,0,0)"
+                ),
+                title=f"Scout Report: {scout_player} (vs {', '.join(comp_pos)})"
+            )
         st.plotly_chart(fig_pizza, width="stretch")
         
         # Report Card
@@ -597,6 +583,87 @@ with tab3:
             width='stretch'
         )
 
+# === TAB 4: SIMILAR PLAYERS ===
+with tab4:
+    st.header("Similar Players")
+    st.caption("Nearest (player, season) profiles across the whole save, using standardized per 90 values of the chosen preset.")
+
+    sim_col1, sim_col2, sim_col3, sim_col4 = st.columns(4)
+    sim_preset = sim_col1.selectbox("Category Preset", list(CATEGORY_PRESETS.keys()), key="sim_preset")
+    sim_stats = [c for c in CATEGORY_PRESETS[sim_preset] if c in numeric_cols]
+    min_minutes = sim_col2.number_input("Min. Minutes Played", min_value=0, value=270, step=90)
+    sim_k = sim_col3.slider("Matches to show", 5, 50, 10)
+    include_self = sim_col4.toggle("Include same player's other seasons", value=False)
+
+    # Built once per data version and preset; queries only walk the KD-tree
+    with dm.profiler.stage("Similarity index") as rec:
+        sim_index = dm.similarity_index(sim_stats, min_minutes)
+        rec.rows = len(sim_index)
+
+    if len(sim_index) == 0:
+        st.info("No player-seasons meet the minutes threshold.")
+    else:
+        sim_options = (sim_index.keys["Player Name"] + " (" + sim_index.keys["Season"].astype(str) + ")").tolist()
+        sim_choice = st.selectbox("Player", range(len(sim_options)), format_func=lambda i: sim_options[i], key="sim_player")
+        target = sim_index.keys.iloc[sim_choice]
+
+        with dm.profiler.stage("Similarity query", rows=len(sim_index)):
+            similar_df = sim_index.query(target["Player Name"], target["Season"], k=sim_k, same_player=include_self)
+
+        st.dataframe(
+            similar_df,
+            column_config={
+                "Similarity": st.column_config.ProgressColumn("Similarity", format="%.1f", min_value=0, max_value=100),
+                "Distance": st.column_config.NumberColumn("Distance", format="%.2f"),
+            },
+            width='stretch'
+        )
+
+        if not similar_df.empty:
+            # Per 90 profile of the target next to its closest match
+            profiles = dm.player_seasons().set_index(["Player Name", "Season"])
+            closest = similar_df.iloc[0]
+            pair = profiles.loc[[(target["Player Name"], target["Season"]), (closest["Player Name"], closest["Season"])]]
+            pair_90 = pd.DataFrame({stat: per_90(pair, stat) for stat in sim_stats})
+            pair_90.index = [f"{n} ({s})" for n, s in pair_90.index]
+            st.subheader("Per 90 Profile vs Closest Match")
+            st.dataframe(pair_90.transpose().style.format("{:.2f}"), width='stretch')
+
+# --- Save Archive ---
+st.markdown("---")
+with st.expander("Save Archive: Compare Saves"):
+    st.write("Archived seasons live in memory-mapped column files on local disk. Other saves can be archived too, "
+             "without loading them, and compared with this one season by season.")
+    if dm.archive is None:
+        if st.button("Enable Archive Mode"):
+            dm.enable_archive()
+            st.rerun()
+    else:
+        st.dataframe(dm.archive.catalog(), width='stretch', hide_index=True)
+
+        with st.form("archive_other_save"):
+            other_file = st.file_uploader("Save File to Archive", type=["xlsx"])
+            other_name = st.text_input("Save Name")
+            if st.form_submit_button("Archive Save") and other_file and other_name.strip():
+                try:
+                    archived = dm.archive_save(other_name.strip(), pd.read_excel(other_file, sheet_name=None))
+                    st.cache_data.clear()
+                    st.success(f"Archived {len(archived)} seasons of {other_name.strip()}.")
+                except ValueError as e:
+                    st.error(str(e))
+
+        with dm.profiler.stage("Save comparison"):
+            compare_df = dm.compare_saves()
+        if compare_df["Save"].nunique() > 1:
+            compare_stat = st.selectbox("Stat", [c for c in STAT_COLUMNS if c in compare_df.columns], key="compare_stat")
+            by_season = compare_df.groupby(["Save", "Season"], as_index=False)[compare_stat].sum()
+            fig = px.line(by_season, x="Season", y=compare_stat, color="Save", markers=True, template="plotly_dark")
+            fig.update_layout(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)")
+            st.plotly_chart(fig, width="stretch")
+            st.dataframe(compare_df.groupby("Save")[list(dict.fromkeys([compare_stat, "Minutes Played"]))].sum(), width='stretch')
+        else:
+            st.info("Archive another save to compare it with this one.")
+
 # --- Debug Section ---
 st.markdown("---")
 with st.expander("Debug: Data Diagnostics"):
@@ -612,8 +679,134 @@ with st.expander("Debug: Data Diagnostics"):
         
     with c2:
         st.write("#### Squad Keys (Name + Season)")
-        sq_keys = squad_info[["Player Name", "Season"]].drop_duplicates().astype(str).sort_values("Player Name")
+        sq_keys = prepare_squad_info(squad_df)[["Player Name", "Season"]].drop_duplicates().astype(str).sort_values("Player Name")
         st.dataframe(sq_keys, width='stretch')
         
+    st.write("### Name Reconciliation")
+    unmatched_keys = reconcile.find_unmatched(match_stats_df, squad_df)
+    if unmatched_keys.empty:
+        st.success("Every Match Stats (Name, Season) has a Squad entry.")
+    else:
+        st.write(f"{len(unmatched_keys)} Match Stats (Name, Season) keys have no Squad entry. Review the suggested names and apply the ones you accept.")
+        suggestions = reconcile.suggest_matches(unmatched_keys, squad_df)
+        reviewed = st.data_editor(
+            suggestions,
+            column_config={
+                "Player Name": st.column_config.TextColumn("Player Name", disabled=True),
+                "Season": st.column_config.TextColumn("Season", disabled=True),
+                "Rows": st.column_config.NumberColumn("Rows", disabled=True),
+                "Suggestion": st.column_config.TextColumn("Rename To"),
+                "Score": st.column_config.ProgressColumn("Score", min_value=0.0, max_value=1.0, format="%.2f"),
+                "Accept": st.column_config.CheckboxColumn("Accept"),
+            },
+            hide_index=True,
+            width='stretch',
+            key="reconcile_editor"
+        )
+        accepted = reviewed[reviewed["Accept"] & reviewed["Suggestion"].notna()].rename(columns={"Suggestion": "New Name"})
+        if st.button(f"Apply {len(accepted)} Accepted Renames", disabled=accepted.empty):
+            try:
+                changed = dm.rename_players(accepted)
+                st.success(f"Renamed {changed['MatchStats']} Match Stats rows and {changed['Transfers']} Transfer rows.")
+                st.cache_data.clear()
+                st.rerun()
+            except Exception as e:
+                st.error(f"Error applying renames: {e}")
+
+    st.write("### Data Integrity Checks")
+    integrity_summary = integrity.summarize(dm.integrity_report)
+    if integrity_summary["Violations"].sum() == 0:
+        st.success("No integrity problems found in Match Stats.")
+    else:
+        st.warning("Some Match Stats rows break basic rules (e.g. more completed than attempted). These rows skew every aggregate.")
+        st.dataframe(integrity_summary[integrity_summary["Violations"] > 0], width='stretch', hide_index=True)
+        failed_rules = [rule for rule, idx in dm.integrity_report.items() if len(idx) > 0]
+        inspect_rule = st.selectbox("Inspect Rule", failed_rules)
+        bad_rows = dm.get_data("MatchStats").loc[dm.integrity_report[inspect_rule]]
+        st.dataframe(bad_rows.head(200), width='stretch')
+
+    st.write("### Memory Usage")
+    st.write("Deep memory held by this session's sheets (cold sheets at their compressed size, without decoding them). Optimizing downcasts numbers and stores repeated text (Season, Competition, Positions, ...) once as categories; values are unchanged.")
+    mem_col1, mem_col2 = st.columns(2)
+    mem_col1.dataframe(memory.sheet_totals(dm.memory_usage()), width='stretch', hide_index=True)
+    if mem_col2.button("Optimize Memory"):
+        dm.optimize_memory()
+        st.rerun()
+    if dm.last_memory_report is not None:
+        st.write("#### Last Optimization (Before / After)")
+        st.dataframe(memory.sheet_totals(dm.last_memory_report), width='stretch', hide_index=True)
+        st.dataframe(dm.last_memory_report.sort_values("Saved", ascending=False), width='stretch', hide_index=True)
+    st.write("#### Cold Storage")
+    st.write("Sheets not read for a while are kept compressed and decoded again on their next read.")
+    cold_col1, cold_col2 = st.columns(2)
+    dm.cold.idle_seconds = 60 * cold_col1.number_input("Compress sheets idle for (minutes)", min_value=1, value=max(1, int(dm.cold.idle_seconds // 60)))
+    dm.cold.min_bytes = 1024 * cold_col2.number_input("Minimum sheet size (KB)", min_value=0, value=int(dm.cold.min_bytes // 1024))
+    cold_stats = dm.cold.stats(dm.data)
+    cold_cols = st.columns(len(cold_stats))
+    for col, (label, value) in zip(cold_cols, cold_stats.items()):
+        col.metric(label, f"{value / 1e6:.2f} MB" if label.endswith("Bytes") else value)
+    if dm.store is not None:
+        st.caption("Sheets that other sessions share through the process store stay decoded.")
+
+    if dm.store is not None:
+        st.write("#### Shared Store (all sessions in this process)")
+        store_metrics = dm.store.metrics()
+        store_cols = st.columns(len(store_metrics))
+        for col, (label, value) in zip(store_cols, store_metrics.items()):
+            col.metric(label, f"{value / 1e6:.1f} MB" if label.endswith("Bytes") else value)
+
+    st.write("### Integer Keys")
+    st.write("Players, seasons, competitions and opponents can be stored as integer ids into shared dimension tables, so groupbys and joins run on ints and a global rename changes one dimension row. The Excel export is unchanged.")
+    if dm.dims is None:
+        if st.button("Enable Integer Keys"):
+            dm.enable_surrogate_keys()
+            st.rerun()
+    else:
+        dim_col1, dim_col2 = st.columns([1, 2])
+        dim = dim_col1.selectbox("Dimension", list(dm.dims.keys()))
+        dim_df = dm.dimension_table(dim)
+        dim_col2.dataframe(dim_df, width='stretch', hide_index=True, height=250)
+        with dim_col1.form("rename_dimension"):
+            old_value = st.selectbox("Value", dim_df["Value"].tolist())
+            new_value = st.text_input("Rename to")
+            if st.form_submit_button("Rename Everywhere") and new_value.strip():
+                changed = dm.rename_dimension_value(dim, old_value, new_value.strip())
+                st.cache_data.clear()
+                st.success(f"Renamed in: {', '.join(changed) or 'nothing'}")
+                st.rerun()
+
     st.write("### Raw Combined Data")
     st.dataframe(merged_df.head(50), width='stretch')
+
+with st.expander("Debug: Performance Profile"):
+    st.write("Wall time and row counts per stage of the last rerun of each page. Profiling is off by default and costs almost nothing while off.")
+    dm.profiler.enabled = st.toggle("Enable profiling", value=dm.profiler.enabled)
+
+    profile_runs = dm.profiler.last_runs()
+    if not profile_runs:
+        st.info("No timings recorded yet. Enable profiling and interact with any page.")
+    for run in profile_runs:
+        breakdown = dm.profiler.breakdown(run)
+        top_level = sum(r.seconds for r in run["stages"] if r.depth == 0)
+        st.write(f"#### {run['page']} ({top_level * 1000:.0f} ms recorded)")
+        st.dataframe(
+            breakdown,
+            column_config={
+                "seconds": st.column_config.NumberColumn("Seconds", format="%.4f"),
+                "share %": st.column_config.ProgressColumn("Share", format="%.0f%%", min_value=0, max_value=100),
+            },
+            hide_index=True,
+            width='stretch'
+        )
+
+    prof_col1, prof_col2 = st.columns(2)
+    prof_col1.download_button(
+        "Export Traces (JSON)",
+        data=dm.profiler.to_json(),
+        file_name=f"{dm.current_save_name}_profile.json",
+        mime="application/json",
+        disabled=not dm.profiler.runs
+    )
+    if prof_col2.button("Clear Traces"):
+        dm.profiler.clear()
+        st.rerun()
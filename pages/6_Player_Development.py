@@ -0,0 +1,103 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from development import AGE_CENTRE
+
+st.set_page_config(page_title="Player Development", page_icon="🌱", layout="wide")
+
+st.title("Player Development 🌱")
+
+# Default to MySave content if no user set
+if 'data_manager' not in st.session_state:
+    st.switch_page("app.py")
+
+dm = st.session_state['data_manager']
+dm.keep_alive()
+dm.profiler.start_run("Player Development")
+
+
+# --- Load Data ---
+squad_df = dm.get_data("Squad")
+
+if squad_df.empty:
+    st.info("No squad data available. Add players with their Overall Start / Overall End to model development.")
+    st.stop()
+
+st.write("Season growth (Overall End - Overall Start) is modelled against age, minutes played, average match rating and role, "
+         "in one least-squares fit over every player-season. The fitted model projects each player's overall for next season.")
+
+# --- Model ---
+min_minutes = st.slider("Minimum minutes for a player-season to be used in the fit", 0, 3000, 0, step=90)
+
+# One batched solve per data version and threshold
+with dm.profiler.stage("Development model"):
+    frame = dm.development_frame()
+    model = dm.development_model(min_minutes)
+
+if model.n == 0:
+    st.warning("No player-seasons with an age and both overalls to fit.")
+    st.stop()
+
+m1, m2, m3, m4 = st.columns(4)
+m1.metric("Player-Seasons Fitted", model.n)
+m2.metric("R²", f"{model.r2:.2f}" if not np.isnan(model.r2) else "n/a")
+m3.metric("Typical Error (RMSE)", f"{model.rmse:.2f}")
+m4.metric("Average Growth", f"{model.fitted['Growth'].mean():+.2f}")
+if model.rank < len(model.terms):
+    st.caption("Some terms could not be separated with the data available (e.g. one role only, or every player the same age); their effects are shared with the others.")
+
+tab1, tab2, tab3 = st.tabs(["Projections", "Growth Curve", "Model"])
+
+with tab1:
+    st.header("Projected Next-Season Overall")
+    with dm.profiler.stage("Projection", rows=len(frame)):
+        projections = model.project(frame)
+    roles = sorted(projections["Role"].unique())
+    selected_roles = st.multiselect("Filter by Role", roles)
+    if selected_roles:
+        projections = projections[projections["Role"].isin(selected_roles)]
+    st.dataframe(
+        projections.style.format({
+            "Age": "{:.0f}", "Minutes Played": "{:.0f}", "Avg Rating": "{:.2f}",
+            "Overall End": "{:.0f}", "Projected Growth": "{:+.2f}", "Projected Overall": "{:.1f}",
+        }),
+        width='stretch', hide_index=True,
+    )
+
+with tab2:
+    st.header("Growth by Age")
+    fitted = model.fitted
+    fig = px.scatter(
+        fitted, x="Age", y="Growth", color="Role",
+        hover_data=["Player Name", "Season", "Minutes Played", "Avg Rating", "Predicted Growth"],
+        template="plotly_dark", opacity=0.7,
+    )
+    # Age curve at the squad's average minutes and rating for the baseline role
+    ages = np.linspace(fitted["Age"].min(), fitted["Age"].max(), 50)
+    curve_rows = pd.DataFrame({
+        "Age": ages,
+        "Minutes Played": fitted["Minutes Played"].mean(),
+        "Avg Rating": model.rating_fill,
+        "Role": model.roles[0],
+    })
+    fig.add_trace(go.Scatter(x=ages, y=model.design(curve_rows) @ model.coef, mode="lines",
+                             name=f"Model ({model.roles[0]}, average minutes/rating)"))
+    fig.update_layout(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)")
+    st.plotly_chart(fig, width="stretch")
+
+    st.write("#### Biggest Surprises")
+    st.caption("Player-seasons whose growth was furthest from the model's prediction.")
+    surprises = fitted.reindex(fitted["Residual"].abs().sort_values(ascending=False).index).head(15)
+    st.dataframe(
+        surprises[["Player Name", "Season", "Age", "Role", "Minutes Played", "Growth", "Predicted Growth", "Residual"]]
+        .style.format({"Age": "{:.0f}", "Minutes Played": "{:.0f}", "Growth": "{:+.0f}", "Predicted Growth": "{:+.2f}", "Residual": "{:+.2f}"}),
+        width='stretch', hide_index=True,
+    )
+
+with tab3:
+    st.header("Model Coefficients")
+    st.caption(f"Overall points of growth per unit of each term. Age terms are measured from {AGE_CENTRE}; "
+               f"role offsets are relative to {model.roles[0]}; a missing average rating is taken as {model.rating_fill:.2f}.")
+    st.dataframe(model.coefficients().style.format({"Coefficient": "{:+.3f}"}), width='stretch', hide_index=True)
@@ -0,0 +1,78 @@
+import time
+
+import pandas as pd
+
+import analytics
+from shared_store import content_hash
+
+
+def season_key(s):
+    """Seasons are compared as stripped text (same keying as the filter index)."""
+    return s.astype(str).str.strip()
+
+
+def fingerprint(rows):
+    """Digest of a partition's values that ignores dtype-only changes.
+
+    Numbers (and flags) hash as floats and everything else as text, so
+    optimize_memory, surrogate keys or an Excel round trip leave it unchanged.
+    """
+    normalized = pd.DataFrame(index=range(len(rows)))
+    for col in rows.columns:
+        s = rows[col]
+        if pd.api.types.is_numeric_dtype(s.dtype) or pd.api.types.is_bool_dtype(s.dtype):
+            normalized[col] = pd.to_numeric(s, errors='coerce').astype(float).to_numpy()
+        else:
+            normalized[col] = s.astype(str).to_numpy()
+    return content_hash(normalized)
+
+
+class FrozenSeason:
+    """Aggregates of one closed MatchStats season, computed once at close time.
+
+    player_sums: stat sums and games per (Player Name, Competition).
+    record:      W/D/L and goals per Competition.
+    totals:      team stat totals per Competition.
+    """
+
+    def __init__(self, season, rows):
+        self.season = season
+        self.rows = len(rows)
+        self.closed_at = time.time()
+        self.fingerprint = fingerprint(rows)
+        self.player_sums = analytics.player_sums(rows, by=("Player Name", "Competition"))
+        self.record = analytics.team_record_table(rows, ("Competition",)).set_index("Competition")
+        self.totals = analytics.team_totals_by(rows, "Competition")
+
+    def _comps(self, table, competitions, level=None):
+        if not competitions:
+            return table
+        values = table.index if level is None else table.index.get_level_values(level)
+        return table[values.astype(str).isin([str(c) for c in competitions])]
+
+    def player_totals(self, competitions=None):
+        """Per-player sums over the selected competitions (all when empty)."""
+        sums = self._comps(self.player_sums, competitions, level="Competition")
+        return sums.groupby(level="Player Name", observed=True).sum()
+
+    def team_record(self, competitions=None):
+        """{"Games Played", "Wins", "Draws", "Losses"} as analytics.team_record returns."""
+        record = self._comps(self.record, competitions)
+        return {col: int(record[col].sum()) for col in ["Games Played", "Wins", "Draws", "Losses"]}
+
+    def team_totals(self, competitions=None):
+        return self._comps(self.totals, competitions).sum()
+
+
+def combine_player_sums(parts):
+    """Add per-player sums from several partitions (index: Player Name)."""
+    parts = [p for p in parts if len(p)]
+    if not parts:
+        return analytics.player_sums(pd.DataFrame(columns=["Player Name"] + analytics.STAT_COLUMNS))
+    if len(parts) == 1:
+        return parts[0]
+    combined = pd.concat(parts)
+    # Categorical indexes from different partitions may not share categories: group on the values
+    combined.index = combined.index.astype(object)
+    combined.index.name = "Player Name"
+    return combined.groupby(level="Player Name").sum()
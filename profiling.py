@@ -0,0 +1,139 @@
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+
+class _NullRecord:
+    """Stand-in record when profiling is off; attribute writes are ignored."""
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_RECORD = _NullRecord()
+
+
+@contextmanager
+def _null_stage():
+    yield _NULL_RECORD
+
+
+class StageRecord:
+    __slots__ = ("stage", "depth", "start", "seconds", "rows")
+
+    def __init__(self, stage, depth, start, rows=None):
+        self.stage = stage
+        self.depth = depth
+        self.start = start
+        self.seconds = 0.0
+        self.rows = rows
+
+    def as_dict(self):
+        return {"stage": self.stage, "depth": self.depth, "start": self.start, "seconds": self.seconds, "rows": self.rows}
+
+
+class Profiler:
+    """Wall-time and row-count recorder for DataManager calls and page stages.
+
+    Records are grouped into runs (one per page rerun). When disabled,
+    stage() hands back a shared no-op context so instrumented code pays
+    only an attribute check. Only the thread that started the current run
+    (the page script) records; calls from worker threads (exports, warm-up)
+    are not timed, so they cannot interleave with the page's stages.
+    """
+
+    def __init__(self, enabled=False, keep_runs=20):
+        self.enabled = enabled
+        self.keep_runs = keep_runs
+        self.runs = []  # [{"page", "started", "stages": [StageRecord]}]
+        self._depth = 0
+        self._owner = None  # thread id that started the current run
+        self._lock = threading.Lock()
+
+    def start_run(self, page):
+        """Begin a new run (call at the top of a page script)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.runs.append({"page": page, "started": time.time(), "stages": []})
+            del self.runs[:-self.keep_runs]
+            self._depth = 0
+            self._owner = threading.get_ident()
+
+    def stage(self, name, rows=None):
+        """Context manager timing one stage; set `.rows` on the yielded record if known later."""
+        if not self.enabled or (self._owner is not None and threading.get_ident() != self._owner):
+            return _null_stage()
+        return self._stage(name, rows)
+
+    @contextmanager
+    def _stage(self, name, rows):
+        if not self.runs:
+            self.start_run("(no page)")
+        record = StageRecord(name, self._depth, time.time(), rows)
+        with self._lock:
+            self.runs[-1]["stages"].append(record)
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            self._depth -= 1
+
+    def last_runs(self):
+        """Most recent run per page, newest first."""
+        latest = {}
+        for run in reversed(self.runs):
+            latest.setdefault(run["page"], run)
+        return list(latest.values())
+
+    def breakdown(self, run):
+        """DataFrame of one run's stages with their share of the top-level time."""
+        df = pd.DataFrame([r.as_dict() for r in run["stages"]], columns=["stage", "depth", "start", "seconds", "rows"])
+        total = df.loc[df["depth"] == 0, "seconds"].sum()
+        df["share %"] = df["seconds"] / total * 100 if total > 0 else 0.0
+        df["stage"] = ["  " * d + s for d, s in zip(df["depth"], df["stage"])]
+        return df[["stage", "seconds", "rows", "share %"]]
+
+    def to_json(self):
+        """All kept runs as JSON (for offline comparison)."""
+        return json.dumps([
+            {"page": run["page"], "started": run["started"], "stages": [r.as_dict() for r in run["stages"]]}
+            for run in self.runs
+        ], indent=2)
+
+    def clear(self):
+        with self._lock:
+            self.runs = []
+            self._owner = None
+
+
+def _row_count(result):
+    try:
+        return len(result)
+    except TypeError:
+        return None
+
+
+def profiled(name, rows=None):
+    """Decorator for methods of objects with a `profiler` attribute.
+
+    rows(self, result, *args, **kwargs) may compute the row count from the call;
+    otherwise len(result) is used when available.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            prof = getattr(self, "profiler", None)
+            if prof is None or not prof.enabled:
+                return fn(self, *args, **kwargs)
+            with prof.stage(name) as record:
+                result = fn(self, *args, **kwargs)
+                record.rows = rows(self, result, *args, **kwargs) if rows else _row_count(result)
+            return result
+        return wrapper
+    return decorator
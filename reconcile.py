@@ -0,0 +1,169 @@
+import re
+import unicodedata
+import numpy as np
+import pandas as pd
+from difflib import SequenceMatcher
+from scipy import sparse
+
+NGRAM = 3
+AUTO_ACCEPT_SCORE = 0.85
+
+
+def normalize_name(name):
+    """Fold accents, case and punctuation so 'Müller ' and 'muller' compare equal."""
+    text = unicodedata.normalize("NFKD", str(name))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"[^a-z0-9]+", " ", text.lower())
+    return text.strip()
+
+
+def _ngrams(name):
+    padded = f"  {name} "
+    return {padded[i:i + NGRAM] for i in range(len(padded) - NGRAM + 1)}
+
+
+def _ngram_matrix(names, vocab):
+    """Binary (names x n-grams) sparse matrix; grows vocab in place."""
+    rows, cols = [], []
+    for i, name in enumerate(names):
+        for gram in _ngrams(name):
+            cols.append(vocab.setdefault(gram, len(vocab)))
+            rows.append(i)
+    data = np.ones(len(rows), dtype=np.float32)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(len(names), max(len(vocab), 1)))
+
+
+def _initials_match(query, candidate):
+    """'l messi' vs 'lionel messi': same last name and matching initials."""
+    q, c = query.split(), candidate.split()
+    if len(q) != len(c) or len(q) < 2 or q[-1] != c[-1]:
+        return False
+    return all(a[0] == b[0] for a, b in zip(q[:-1], c[:-1]))
+
+
+def merge_keys(df, name_col):
+    """(name, season) keys exactly as the dashboard merge builds them."""
+    return pd.DataFrame({
+        "name": df[name_col].astype(str).str.strip().str.lower(),
+        "season": df["Season"].astype(str).str.strip().str.lower(),
+    })
+
+
+def find_unmatched(match_df, squad_df):
+    """MatchStats (Player Name, Season) keys with no Squad row, with their row counts."""
+    if match_df.empty:
+        return pd.DataFrame(columns=["Player Name", "Season", "Rows"])
+    ms = merge_keys(match_df, "Player Name")
+    sq = merge_keys(squad_df, "Name").drop_duplicates()
+    ms_index = pd.MultiIndex.from_frame(ms)
+    missing = ~ms_index.isin(pd.MultiIndex.from_frame(sq))
+
+    keys = pd.DataFrame({
+        "Player Name": match_df["Player Name"].astype(str).str.strip(),
+        "Season": match_df["Season"].astype(str).str.strip(),
+    })[missing]
+    return keys.groupby(["Player Name", "Season"]).size().rename("Rows").reset_index()
+
+
+def suggest_matches(unmatched, squad_df, top_k=3):
+    """Suggest Squad names for each unmatched key.
+
+    Squad names are blocked by season and indexed by character n-grams, so
+    each unmatched name is only scored against Squad names of the same season
+    that share n-grams with it (one sparse product per season), never every pair.
+    """
+    columns = ["Player Name", "Season", "Rows", "Suggestion", "Score", "Accept"]
+    if unmatched.empty or squad_df.empty:
+        out = unmatched.assign(Suggestion=None, Score=0.0, Accept=False)
+        return out.reindex(columns=columns)
+
+    squad = pd.DataFrame({
+        "Name": squad_df["Name"].astype(str).str.strip(),
+        "Season": squad_df["Season"].astype(str).str.strip(),
+    }).drop_duplicates()
+    squad["_norm"] = squad["Name"].map(normalize_name)
+    squad["_season"] = squad["Season"].str.lower()
+
+    queries = unmatched.copy()
+    queries["_norm"] = queries["Player Name"].map(normalize_name)
+    queries["_season"] = queries["Season"].str.lower()
+
+    suggestions = []
+    for season, q_block in queries.groupby("_season", sort=False):
+        c_block = squad[squad["_season"] == season]
+        if c_block.empty:
+            continue
+        vocab = {}
+        c_mat = _ngram_matrix(c_block["_norm"].tolist(), vocab)
+        q_mat = _ngram_matrix(q_block["_norm"].tolist(), vocab)
+        c_mat.resize((c_mat.shape[0], q_mat.shape[1]))
+
+        # Shared n-gram counts for every (query, candidate) pair that overlaps at all
+        overlap = (q_mat @ c_mat.T).tocsr()
+        q_sizes = np.asarray(q_mat.sum(axis=1)).ravel()
+        c_sizes = np.asarray(c_mat.sum(axis=1)).ravel()
+
+        c_names = c_block["Name"].to_numpy()
+        c_norms = c_block["_norm"].to_numpy()
+        for row, (q_idx, q_norm) in enumerate(zip(q_block.index, q_block["_norm"])):
+            start, end = overlap.indptr[row], overlap.indptr[row + 1]
+            cand = overlap.indices[start:end]
+            shared = overlap.data[start:end]
+            if len(cand) == 0:
+                continue
+            jaccard = shared / (q_sizes[row] + c_sizes[cand] - shared)
+            if len(cand) > top_k:
+                keep = np.argpartition(-jaccard, top_k)[:top_k]
+                cand, jaccard = cand[keep], jaccard[keep]
+            best = cand[np.argsort(-jaccard)]
+            # Re-rank the short list with an edit-distance ratio and the initials rule
+            scored = []
+            for c in best:
+                score = SequenceMatcher(None, q_norm, c_norms[c]).ratio()
+                if q_norm == c_norms[c]:
+                    score = 1.0
+                elif _initials_match(q_norm, c_norms[c]):
+                    score = max(score, 0.9)
+                scored.append((score, c_names[c]))
+            score, name = max(scored)
+            suggestions.append((q_idx, name, round(float(score), 3)))
+
+    out = unmatched.copy()
+    out["Suggestion"] = None
+    out["Score"] = 0.0
+    if suggestions:
+        idx, names, scores = zip(*suggestions)
+        out.loc[list(idx), "Suggestion"] = list(names)
+        out.loc[list(idx), "Score"] = list(scores)
+    out["Accept"] = out["Score"] >= AUTO_ACCEPT_SCORE
+    return out.sort_values("Score", ascending=False)[columns].reset_index(drop=True)
+
+
+def apply_renames(df, renames, name_col="Player Name"):
+    """Rename players in df for the given (Player Name, Season) -> New Name table.
+
+    Matching uses the same stripped (name, season) keys as find_unmatched and
+    is done with one vectorized lookup. Returns (new_df, rows_changed).
+    """
+    if df.empty or renames.empty:
+        return df, 0
+    lookup = pd.Series(
+        renames["New Name"].to_numpy(),
+        index=pd.MultiIndex.from_arrays([
+            renames["Player Name"].astype(str).str.strip(),
+            renames["Season"].astype(str).str.strip(),
+        ]),
+    )
+    lookup = lookup[~lookup.index.duplicated()]
+    keys = pd.MultiIndex.from_arrays([
+        df[name_col].astype(str).str.strip(),
+        df["Season"].astype(str).str.strip(),
+    ])
+    positions = lookup.index.get_indexer(keys)
+    hit = positions >= 0
+    if not hit.any():
+        return df, 0
+    out = df.copy()
+    out[name_col] = out[name_col].astype(object)
+    out.loc[hit, name_col] = lookup.to_numpy()[positions[hit]]
+    return out, int(hit.sum())
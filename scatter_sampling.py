@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+# Above this many points scatters are drawn with WebGL (scattergl) and smaller markers
+WEBGL_THRESHOLD = 1000
+# Default point budget when downsampling
+MAX_POINTS = 1500
+# Extreme points kept at each end of every plotted axis, plus the most extreme overall
+OUTLIERS_PER_AXIS = 10
+
+
+def outlier_mask(df, cols, per_axis=OUTLIERS_PER_AXIS):
+    """Rows that are among the per_axis highest/lowest on any column, or the furthest from the centre.
+
+    Distance from the centre is the norm of the z-scores over cols.
+    """
+    keep = np.zeros(len(df), dtype=bool)
+    if len(df) == 0 or not cols:
+        return keep
+    values = np.column_stack([df[c].to_numpy(dtype=float) for c in cols])
+    k = min(per_axis, len(df))
+    for j in range(values.shape[1]):
+        column = np.nan_to_num(values[:, j], nan=np.nanmedian(values[:, j]) if np.isfinite(values[:, j]).any() else 0.0)
+        order = np.argpartition(column, (k - 1, len(column) - k))
+        keep[order[:k]] = True
+        keep[order[-k:]] = True
+    std = np.nanstd(values, axis=0)
+    z = (values - np.nanmean(values, axis=0)) / np.where(std > 0, std, 1.0)
+    distance = np.sqrt(np.nansum(z ** 2, axis=1))
+    keep[np.argpartition(-distance, k - 1)[:k]] = True
+    return keep
+
+
+def downsample(df, cols, max_points=MAX_POINTS, min_minutes=0, seed=0):
+    """(rows to plot, outlier flags) after a minutes cutoff and a random sample that keeps every outlier.
+
+    The sample is seeded so reruns plot the same points.
+    """
+    if min_minutes and "Minutes Played" in df.columns:
+        df = df[df["Minutes Played"] >= min_minutes]
+    outliers = outlier_mask(df, cols)
+    if len(df) <= max_points:
+        return df, outliers
+    rest = np.flatnonzero(~outliers)
+    budget = max(max_points - int(outliers.sum()), 0)
+    rng = np.random.default_rng(seed)
+    chosen = np.sort(np.concatenate([np.flatnonzero(outliers), rng.choice(rest, size=min(budget, len(rest)), replace=False)]))
+    return df.iloc[chosen], outliers[chosen]
+
+
+def density_bins(df, x, y, bins=40):
+    """Server-side 2D histogram: (x bin centres, y bin centres, counts[y, x]) with empty bins as NaN."""
+    xs, ys = df[x].to_numpy(dtype=float), df[y].to_numpy(dtype=float)
+    ok = np.isfinite(xs) & np.isfinite(ys)
+    if not ok.any():
+        return np.array([]), np.array([]), np.empty((0, 0))
+    counts, x_edges, y_edges = np.histogram2d(xs[ok], ys[ok], bins=bins)
+    counts = np.where(counts > 0, counts, np.nan).T
+    return (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2, counts
+
+
+def marker_size(n_points, large=20, small=6):
+    """Marker size shrinking from large to small as the point count passes the WebGL threshold."""
+    if n_points <= WEBGL_THRESHOLD:
+        return large
+    return max(small, int(large * np.sqrt(WEBGL_THRESHOLD / n_points)))
+
+
+def ols_line(df, x, y):
+    """Two-point least-squares line over the finite (x, y) pairs (None when it cannot be fitted)."""
+    xs, ys = df[x].to_numpy(dtype=float), df[y].to_numpy(dtype=float)
+    ok = np.isfinite(xs) & np.isfinite(ys)
+    if ok.sum() < 2 or np.ptp(xs[ok]) == 0:
+        return None
+    slope, intercept = np.polyfit(xs[ok], ys[ok], 1)
+    ends = np.array([xs[ok].min(), xs[ok].max()])
+    return pd.DataFrame({x: ends, y: slope * ends + intercept})
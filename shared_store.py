@@ -0,0 +1,186 @@
+import hashlib
+import threading
+import time
+import weakref
+
+import pandas as pd
+
+# Sessions not seen for this long are dropped from the store and told to release their frames
+IDLE_SECONDS = 30 * 60
+
+
+def content_hash(df):
+    """Digest of a frame's columns, dtypes and values (index ignored)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode())
+    if len(df) and len(df.columns):
+        h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    h.update(str(len(df)).encode())
+    return h.hexdigest()
+
+
+def _nbytes(frame):
+    # Compressed (cold) sheets report their own size
+    if hasattr(frame, "memory_usage"):
+        return int(frame.memory_usage(deep=True).sum())
+    return int(frame.nbytes)
+
+
+class _Entry:
+    __slots__ = ("frame", "refs", "nbytes")
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.refs = 0
+        self.nbytes = _nbytes(frame)
+
+
+class SharedStore:
+    """Process-wide pool of sheet frames shared between Streamlit sessions.
+
+    Frames are interned by content hash, so sessions that loaded the same save
+    (or the same template) hold one copy. Sessions never edit a shared frame:
+    a write replaces the session's reference with a new interned frame and
+    the old one is dropped once no session points at it. All methods take
+    the store lock, so concurrent script runner threads are safe.
+    """
+
+    def __init__(self, idle_seconds=IDLE_SECONDS):
+        self.idle_seconds = idle_seconds
+        self._lock = threading.RLock()
+        self._frames = {}     # {hash: _Entry}
+        self._sessions = {}   # {session id: {"sheets": {sheet: hash}, "last_seen": t, "on_evict": weak callback}}
+        self.evicted = 0
+
+    def _intern(self, df):
+        key = content_hash(df)
+        entry = self._frames.get(key)
+        if entry is None:
+            entry = self._frames[key] = _Entry(df)
+        entry.refs += 1
+        return key, entry.frame
+
+    def _release(self, key):
+        entry = self._frames.get(key)
+        if entry is None:
+            return
+        entry.refs -= 1
+        if entry.refs <= 0:
+            del self._frames[key]
+
+    def register(self, session_id, sheets, on_evict=None):
+        """Intern a session's sheets ({sheet: df}); returns the shared frames to hold instead.
+
+        on_evict (a bound method, held weakly) is called when the session is
+        evicted, so it can stop holding the frames itself.
+        """
+        self.evict_idle()
+        with self._lock:
+            self.drop(session_id)
+            shared, keys = {}, {}
+            for sheet, df in sheets.items():
+                keys[sheet], shared[sheet] = self._intern(df)
+            self._sessions[session_id] = {
+                "sheets": keys, "last_seen": time.time(),
+                "on_evict": weakref.WeakMethod(on_evict) if on_evict is not None else None,
+            }
+            return shared
+
+    def replace(self, session_id, sheet, df):
+        """Copy-on-write: point the session's sheet at df (interned); returns the shared frame."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return df
+            key, frame = self._intern(df)
+            old = session["sheets"].get(sheet)
+            session["sheets"][sheet] = key
+            session["last_seen"] = time.time()
+            if old is not None:
+                self._release(old)
+            return frame
+
+    def exclusive(self, session_id, sheet):
+        """True when no other session shares this session's frame for the sheet."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or sheet not in session["sheets"]:
+                return False
+            return self._frames[session["sheets"][sheet]].refs == 1
+
+    def swap(self, session_id, sheet, frame):
+        """Hold a different encoding (compressed/decoded) of the same content for a sheet."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or sheet not in session["sheets"]:
+                return
+            entry = self._frames[session["sheets"][sheet]]
+            entry.frame = frame
+            entry.nbytes = _nbytes(frame)
+
+    def touch(self, session_id):
+        """Mark a session active; False when it has been evicted and must register again."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return False
+            session["last_seen"] = time.time()
+            return True
+
+    def drop(self, session_id):
+        """Forget a session and release its frames."""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is None:
+                return
+            for key in session["sheets"].values():
+                self._release(key)
+
+    def evict_idle(self, now=None):
+        """Drop sessions idle longer than idle_seconds and call their on_evict; returns how many were dropped."""
+        now = time.time() if now is None else now
+        with self._lock:
+            idle = [sid for sid, s in self._sessions.items() if now - s["last_seen"] > self.idle_seconds]
+            callbacks = [self._sessions[sid]["on_evict"] for sid in idle]
+            for sid in idle:
+                self.drop(sid)
+            self.evicted += len(idle)
+        # Outside the store lock: releasing a session's frames compresses them
+        for ref in callbacks:
+            callback = ref() if ref is not None else None
+            if callback is not None:
+                callback()
+        return len(idle)
+
+    def metrics(self):
+        """Resident sessions/frames/bytes and the bytes sessions would hold without sharing.
+
+        Evicted sessions keep their sheets compressed outside the store; those bytes are not counted.
+        """
+        with self._lock:
+            resident = sum(e.nbytes for e in self._frames.values())
+            logical = sum(
+                self._frames[key].nbytes
+                for s in self._sessions.values() for key in s["sheets"].values()
+                if key in self._frames
+            )
+            return {
+                "Sessions": len(self._sessions),
+                "Frames": len(self._frames),
+                "Resident Bytes": resident,
+                "Unshared Bytes": logical,
+                "Evicted Sessions": self.evicted,
+            }
+
+
+_STORE = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_store():
+    """The store shared by every session in this process."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = SharedStore()
+        return _STORE
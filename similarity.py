@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from analytics import per_90
+
+# Identifying columns carried alongside each profile in query results
+PROFILE_KEY_COLUMNS = ["Player Name", "Season", "Position 1", "Minutes Played"]
+
+
+def profile_matrix(agg, stats):
+    """Standardized per-90 matrix (rows x stats) for aggregated player-season rows.
+
+    Each stat is z-scored across the rows; stats with no spread contribute 0.
+    """
+    values = np.column_stack([per_90(agg, stat).to_numpy(dtype=float) for stat in stats]) if stats else np.empty((len(agg), 0))
+    values = np.nan_to_num(values)
+    mean = values.mean(axis=0) if len(values) else 0.0
+    std = values.std(axis=0) if len(values) else 1.0
+    std = np.where(std > 0, std, 1.0)
+    return (values - mean) / std
+
+
+class SimilarityIndex:
+    """k-nearest-neighbour search over standardized per-90 stat profiles.
+
+    Built once from the player-season aggregate (one row per Player Name +
+    Season); queries go through a KD-tree so they stay fast over thousands
+    of player-seasons. Distance is Euclidean in z-score units.
+    """
+
+    def __init__(self, agg, stats, min_minutes=0):
+        keep = agg["Minutes Played"] >= min_minutes
+        self.stats = list(stats)
+        self.keys = agg.loc[keep, [c for c in PROFILE_KEY_COLUMNS if c in agg.columns]].reset_index(drop=True)
+        self.vectors = profile_matrix(agg[keep], self.stats)
+        self.tree = cKDTree(self.vectors) if len(self.keys) else None
+        self._row = {(name, str(season)): i for i, (name, season) in enumerate(zip(self.keys["Player Name"], self.keys["Season"]))}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def query(self, player, season, k=10, same_player=False):
+        """The k profiles closest to (player, season), nearest first.
+
+        Other seasons of the same player are left out unless same_player is set.
+        Returns the key columns plus Distance and Similarity (0-100, 100 = identical).
+        """
+        row = self._row.get((player, str(season)))
+        if row is None or self.tree is None:
+            return pd.DataFrame(columns=list(self.keys.columns) + ["Distance", "Similarity"])
+
+        # Over-fetch so that enough neighbours survive dropping the player's own rows
+        own_rows = 1 if same_player else int((self.keys["Player Name"] == player).sum())
+        n = min(len(self.keys), k + own_rows)
+        dist, idx = self.tree.query(self.vectors[row], k=n)
+        dist, idx = np.atleast_1d(dist), np.atleast_1d(idx)
+
+        result = self.keys.iloc[idx].copy()
+        result["Distance"] = dist
+        drop = (idx == row) if same_player else (result["Player Name"] == player).to_numpy()
+        result = result[~drop].head(k)
+        # Scale by the typical distance between two random profiles (sqrt(2 * n_stats) in z units)
+        scale = np.sqrt(2 * max(len(self.stats), 1))
+        result["Similarity"] = (100 * np.clip(1 - result["Distance"] / scale, 0, 1)).round(1)
+        return result.reset_index(drop=True)
@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+from data_manager import DataManager
+
+POSITIONS = ["GK", "CB", "LB", "RB", "CDM", "CM", "CAM", "LM", "RM", "LW", "RW", "ST", "CF"]
+ROLES = ["Crucial", "Important", "Rotation", "Sporadic", "Prospect"]
+NATIONALITIES = ["England", "Spain", "France", "Germany", "Italy", "Brazil", "Argentina", "Netherlands", "Portugal", "Ghana"]
+COMPETITIONS = ["League", "FA Cup", "League Cup", "Champions League"]
+FIRST_NAMES = ["Alex", "Ben", "Carlos", "David", "Emil", "Felix", "Gabriel", "Hugo", "Ivan", "Jamal", "Kofi", "Luca",
+               "Mateo", "Nico", "Oscar", "Pablo", "Rafael", "Sami", "Theo", "Victor", "Yusuf", "Zane"]
+LAST_NAMES = ["Adams", "Baker", "Costa", "Diaz", "Evans", "Fischer", "Garcia", "Hansen", "Ito", "Jensen", "Kruger",
+              "Lopez", "Mensah", "Novak", "Owusu", "Petrov", "Rossi", "Silva", "Turner", "Weber"]
+
+# (Attempted, Completed, mean attempts per 90, completion rate)
+ATTEMPT_PAIRS = [
+    ("Short Passes Attempted", "Short Passes Completed", 25, 0.88),
+    ("Medium Passes Attempted", "Medium Passes Completed", 15, 0.78),
+    ("Long Passes Attempted", "Long Passes Completed", 6, 0.55),
+    ("Dribbles Attempted", "Dribbles Completed", 4, 0.6),
+    ("Crosses Attempted", "Crosses Completed", 2, 0.3),
+    ("Tackles Attempted", "Tackles Completed", 3, 0.65),
+    ("Shots", "Shots on Target", 2, 0.45),
+]
+
+# Remaining counting stats and their mean per 90
+COUNT_RATES = {
+    "Goals": 0.25, "Own Goals": 0.01, "Assists": 0.2, "Interceptions": 1.5, "Key Passes": 1.2,
+    "Key Dribbles": 0.6, "Fouled": 1.0, "Successful 1 on 1 Dribbles": 0.8, "Fouls": 0.9,
+    "Penalties Conceded": 0.02, "Blocks": 0.5, "Out of Position": 0.3, "Posession Won": 4.0,
+    "Posession Lost": 6.0, "Clearances": 2.0, "Headers Won": 1.5, "Headers Lost": 1.2,
+    "Balls Stripped": 0.5,
+}
+GK_RATES = {"Saves": 3.0, "Shots Caught": 1.5, "Shots Parried": 1.0, "Crosses Caught": 1.0}
+
+
+def season_labels(n_seasons, start_year=2020):
+    return [f"{y}/{y + 1}" for y in range(start_year, start_year + n_seasons)]
+
+
+def _player_names(rng, n):
+    """n distinct 'First Last' names (numbered once the combinations run out)."""
+    combos = [f"{first} {last}" for first in FIRST_NAMES for last in LAST_NAMES]
+    rng.shuffle(combos)
+    names = combos[:n]
+    k = 2
+    while len(names) < n:
+        names.extend(f"{name} {k}" for name in combos[:n - len(names)])
+        k += 1
+    return names
+
+
+def generate_squads(rng, seasons, squad_size, turnover=0.2):
+    """Squad rows per season plus the transfers implied by season-to-season turnover."""
+    pool = _player_names(rng, squad_size * (1 + len(seasons)))
+    pool_iter = iter(pool)
+    current = [next(pool_iter) for _ in range(squad_size)]
+    position = {name: rng.choice(POSITIONS) for name in pool}
+    position.update({name: "GK" for name in current[:2]})
+    born = {name: int(rng.integers(1988, 2006)) for name in pool}
+    overall = {name: int(rng.integers(55, 85)) for name in pool}
+
+    squad_rows, transfer_rows = [], []
+    for i, season in enumerate(seasons):
+        year = int(season[:4])
+        if i > 0:
+            leaving = rng.choice(current, size=max(1, int(squad_size * turnover)), replace=False)
+            for name in leaving:
+                transfer_rows.append({
+                    "Season": season, "Player Name": name, "Transfer Date": f"{year}-07-{rng.integers(1, 29):02d}",
+                    "Transfer Type": rng.choice(["Transfer Out", "Loan Out"]),
+                    "Transfer Value": f"${rng.integers(1, 60)}M",
+                })
+            arriving = [next(pool_iter) for _ in leaving]
+            for name in arriving:
+                transfer_rows.append({
+                    "Season": season, "Player Name": name, "Transfer Date": f"{year}-07-{rng.integers(1, 29):02d}",
+                    "Transfer Type": rng.choice(["Transfer In", "Loan In", "Loan In (Option to Buy)"]),
+                    "Transfer Value": rng.choice([f"${rng.integers(1, 80)}M", f"{rng.integers(10, 60)}%"]),
+                })
+            current = [n for n in current if n not in set(leaving)] + arriving
+
+        for kit, name in enumerate(current, start=1):
+            start = overall[name]
+            age = year - born[name]
+            growth = int(rng.integers(-2, 5)) + (2 if age < 23 else -1 if age > 30 else 0)
+            overall[name] = int(np.clip(start + growth, 40, 99))
+            squad_rows.append({
+                "Season": season, "Name": name, "Age": age, "Kit Number": kit,
+                "Position 1": position[name], "Position 2": "Not Set", "Position 3": "Not Set", "Position 4": "Not Set",
+                "Nationality": rng.choice(NATIONALITIES), "Height": int(rng.integers(165, 200)), "Weight": int(rng.integers(60, 95)),
+                "Transfer Value": int(start * 250_000), "Wage": int(start * 1_000), "Contract Length": int(rng.integers(1, 6)),
+                "Role": rng.choice(ROLES), "Strong Foot": rng.choice(["Right", "Left", "Both"]),
+                "Overall Start": start, "Overall End": overall[name],
+            })
+    return pd.DataFrame(squad_rows), pd.DataFrame(transfer_rows, columns=["Season", "Player Name", "Transfer Date", "Transfer Type", "Transfer Value"])
+
+
+def generate_match_stats(rng, squad_df, seasons, matches_per_season, players_per_match=16, opponents=20):
+    """MatchStats rows with all 48 columns; completed <= attempted, shots on target <= shots."""
+    frames = []
+    opponent_names = [f"Opponent FC {i + 1}" for i in range(opponents)]
+    for season in seasons:
+        names = squad_df.loc[squad_df["Season"] == season, "Name"].to_numpy()
+        positions = squad_df.loc[squad_df["Season"] == season, "Position 1"].to_numpy()
+        year = int(season[:4])
+        n_players = min(players_per_match, len(names))
+        n_rows = matches_per_season * n_players
+
+        # Match metadata, repeated for every player in the match
+        match_ids = np.repeat(np.arange(matches_per_season), n_players)
+        picks = np.concatenate([rng.choice(len(names), size=n_players, replace=False) for _ in range(matches_per_season)])
+        us = rng.poisson(1.6, matches_per_season)
+        them = rng.poisson(1.1, matches_per_season)
+        dates = pd.Timestamp(f"{year}-08-01") + pd.to_timedelta(np.arange(matches_per_season) * 4, unit="D")
+        df = pd.DataFrame({
+            "Player Name": names[picks],
+            "Season": season,
+            "Competition": np.array(COMPETITIONS)[rng.integers(0, len(COMPETITIONS), matches_per_season)][match_ids],
+            "Opponent": np.array(opponent_names)[rng.integers(0, opponents, matches_per_season)][match_ids],
+            "Scores": np.char.add(np.char.add(us.astype(str), " - "), them.astype(str))[match_ids],
+            "Date": dates.strftime("%Y-%m-%d").to_numpy()[match_ids],
+        })
+
+        started = np.tile(np.arange(n_players) < min(11, n_players), matches_per_season)
+        minutes = np.where(started, rng.choice([90, 90, 90, 75, 60, 120], n_rows), rng.integers(1, 35, n_rows))
+        scale = minutes / 90
+        df["Minutes Played"] = minutes
+        df["Match Rating"] = np.round(np.clip(rng.normal(6.8, 0.8, n_rows), 3.0, 10.0), 1)
+
+        is_gk = positions[picks] == "GK"
+        for col, rate in COUNT_RATES.items():
+            df[col] = rng.poisson(rate * scale)
+        for col, rate in GK_RATES.items():
+            df[col] = np.where(is_gk, rng.poisson(rate * scale), 0)
+        for attempted, completed, rate, success in ATTEMPT_PAIRS:
+            att = rng.poisson(rate * scale)
+            df[attempted] = att
+            df[completed] = rng.binomial(att, success)
+        df["Passes Attempted"] = df["Short Passes Attempted"] + df["Medium Passes Attempted"] + df["Long Passes Attempted"]
+        df["Passes Completed"] = df["Short Passes Completed"] + df["Medium Passes Completed"] + df["Long Passes Completed"]
+        df["Goals"] = np.minimum(df["Goals"], df["Shots on Target"])
+
+        # Highest rating in each match (first one on ties) gets MOTM
+        df["Man of the Match"] = df.index.isin(df.groupby(match_ids)["Match Rating"].idxmax())
+        df["Started"] = started
+        frames.append(df)
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def generate_save(seasons=3, matches=40, squad_size=25, players_per_match=16, seed=0):
+    """Build a DataManager holding a realistic synthetic save at the requested scale."""
+    rng = np.random.default_rng(seed)
+    labels = season_labels(seasons)
+    squad_df, transfers_df = generate_squads(rng, labels, squad_size)
+    match_df = generate_match_stats(rng, squad_df, labels, matches, players_per_match)
+
+    dm = DataManager()
+    dm.current_save_name = f"Synthetic_{seasons}x{matches}x{squad_size}"
+    dm.write_data("Squad", squad_df[dm.headers["Squad"]])
+    dm.write_data("Transfers", transfers_df[dm.headers["Transfers"]])
+    dm.write_data("MatchStats", match_df[dm.headers["MatchStats"]])
+    return dm
@@ -0,0 +1,13 @@
+"""pytest entry point for the equivalence harness (python -m pytest -q)."""
+import pytest
+
+import equivalence
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_engines_match_frozen_baseline(seed):
+    equivalence.assert_equivalent(seeds=(seed,))
+
+
+def test_archived_engine_with_two_seasons():
+    equivalence.assert_equivalent(engines={"archived": equivalence.ENGINES["archived"]}, seeds=(3,), seasons=2)
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+
+# "$5M", "£2.5m", "€750K", "5,000,000", "€10M + 20%" (fee plus sell-on share)
+MONEY_PATTERN = (
+    r"^\s*(?P<currency>[$£€])?\s*(?P<number>\d[\d,]*(?:\.\d+)?)\s*(?P<scale>bn|[kmb])?\s*(?P<currency_after>[$£€])?"
+    r"(?:\s*\+\s*(?P<extra_split>\d+(?:\.\d+)?)\s*%)?\s*$"
+)
+# "20%" (percentage split on its own)
+SPLIT_PATTERN = r"^\s*(?P<split>\d+(?:\.\d+)?)\s*%\s*$"
+FREE_VALUES = {"free", "free transfer", "-", "0"}
+
+SCALES = {"": 1.0, "k": 1e3, "m": 1e6, "b": 1e9, "bn": 1e9}
+
+
+def parse_values(values):
+    """Typed columns for free-text Transfer Value strings (one vectorized pass).
+
+    Amount is in whole currency units. Value Kind is Money, Split, Money + Split,
+    Free or Blank. Value Error flags non-blank text that could not be read.
+    """
+    text = values.astype("string").str.strip().str.lower()
+    money = text.str.extract(MONEY_PATTERN)
+    split = text.str.extract(SPLIT_PATTERN)["split"]
+
+    scale = money["scale"].fillna("")
+    number = pd.to_numeric(money["number"].str.replace(",", "", regex=False), errors="coerce")
+    amount = number * scale.map(SCALES).astype(float)
+    split_pct = pd.to_numeric(split.fillna(money["extra_split"]), errors="coerce")
+
+    blank = text.isna() | (text == "")
+    free = text.isin(FREE_VALUES)
+    has_money = amount.notna() & ~free
+    has_split = split_pct.notna()
+
+    kind = np.select(
+        [blank, free, has_money & has_split, has_money, has_split],
+        ["Blank", "Free", "Money + Split", "Money", "Split"],
+        default="Unparsed",
+    )
+    return pd.DataFrame({
+        "Amount": amount.where(has_money, np.where(free, 0.0, np.nan)).astype(float),
+        "Currency": money["currency"].fillna(money["currency_after"]),
+        "Scale": scale.str.upper().where(has_money),
+        "Split %": split_pct.astype(float),
+        "Value Kind": kind,
+        "Value Error": kind == "Unparsed",
+    }, index=values.index)
+
+
+def parse_transfers(df):
+    """Transfers with the parsed value/date columns and In/Out direction appended."""
+    out = df.copy()
+    parsed = parse_values(out["Transfer Value"])
+    for col in parsed.columns:
+        out[col] = parsed[col]
+    raw_date = out["Transfer Date"].astype("string").str.strip()
+    out["Date"] = pd.to_datetime(raw_date, errors="coerce", format="mixed")
+    out["Date Error"] = out["Date"].isna() & raw_date.notna() & (raw_date != "")
+    transfer_type = out["Transfer Type"].astype(str)
+    out["Direction"] = np.where(transfer_type.str.contains(r"\bIn\b", regex=True), "In",
+                                np.where(transfer_type.str.contains(r"\bOut\b", regex=True), "Out", "Other"))
+    return out
+
+
+def _key(s):
+    return s.astype(str).str.strip().str.lower()
+
+
+def ledger_by_type(parsed):
+    """Count, fees and average split per Season and Transfer Type."""
+    if parsed.empty:
+        return pd.DataFrame(columns=["Season", "Transfer Type", "Direction", "Transfers", "Fees", "Avg Split %", "Unparsed"])
+    keys = parsed.assign(Season=parsed["Season"].astype(str), **{"Transfer Type": parsed["Transfer Type"].astype(str)})
+    table = keys.groupby(["Season", "Transfer Type", "Direction"], observed=True).agg(
+        Transfers=("Player Name", "size"),
+        Fees=("Amount", "sum"),
+        **{"Avg Split %": ("Split %", "mean")},
+        Unparsed=("Value Error", "sum"),
+    )
+    return table.reset_index()
+
+
+def season_summary(parsed, squad_df):
+    """Per season: in/out counts, spend, income, net spend and wage bills.
+
+    Wage Bill sums Squad Wage for the season; Incoming Wages sums the Squad
+    Wage of the players transferred in that season (joined on name + season).
+    """
+    columns = ["Season", "In", "Out", "Spend", "Income", "Net Spend", "Wage Bill", "Incoming Wages", "Unparsed"]
+    if parsed.empty and squad_df.empty:
+        return pd.DataFrame(columns=columns)
+
+    season = parsed["Season"].astype(str).str.strip()
+    is_in = parsed["Direction"] == "In"
+    is_out = parsed["Direction"] == "Out"
+    fees = parsed["Amount"].fillna(0)
+    frame = pd.DataFrame({
+        "Season": season,
+        "In": is_in.astype(int),
+        "Out": is_out.astype(int),
+        "Spend": fees.where(is_in, 0.0),
+        "Income": fees.where(is_out, 0.0),
+        "Unparsed": parsed["Value Error"].astype(int),
+    })
+    summary = frame.groupby("Season").sum()
+
+    wages = pd.DataFrame({
+        "name": _key(squad_df["Name"]),
+        "season": _key(squad_df["Season"]),
+        "Season": squad_df["Season"].astype(str).str.strip(),
+        "Wage": pd.to_numeric(squad_df["Wage"], errors="coerce").fillna(0),
+    })
+    summary = summary.join(wages.groupby("Season")["Wage"].sum().rename("Wage Bill"), how="outer")
+
+    arrivals = pd.DataFrame({"name": _key(parsed["Player Name"]), "season": _key(parsed["Season"]), "Season": season})[is_in.to_numpy()]
+    arrivals = arrivals.drop_duplicates(["name", "season"]).merge(
+        wages.drop_duplicates(["name", "season"])[["name", "season", "Wage"]], on=["name", "season"], how="left")
+    summary = summary.join(arrivals.groupby("Season")["Wage"].sum().rename("Incoming Wages"), how="outer")
+
+    summary = summary.fillna(0)
+    summary[["In", "Out", "Unparsed"]] = summary[["In", "Out", "Unparsed"]].astype(int)
+    summary["Net Spend"] = summary["Spend"] - summary["Income"]
+    return summary.reset_index().rename(columns={"index": "Season"})[columns]
+
+
+def build_ledger(transfers_df, squad_df):
+    """{"parsed", "by_type", "by_season"} for the Transfers and Squad sheets."""
+    parsed = parse_transfers(transfers_df)
+    return {
+        "parsed": parsed,
+        "by_type": ledger_by_type(parsed),
+        "by_season": season_summary(parsed, squad_df),
+    }
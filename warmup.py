@@ -0,0 +1,94 @@
+import threading
+import time
+
+
+def default_steps(dm):
+    """(label, fn) pairs that build what the analytics pages show first.
+
+    Each fn fills the DataManager's per-version cache under the same keys the
+    pages read, so a finished warm-up turns their first visit into lookups.
+    """
+    def seasons():
+        return dm.filter_index().values("Season")
+
+    def latest_season():
+        values = sorted(seasons())
+        return values[-1] if values else None
+
+    return [
+        ("Filter index", dm.filter_index),
+        ("Numeric coercion", dm.prepared_match_stats),
+        ("Squad merge", dm.merged_match_stats),
+        ("Player-season aggregates", dm.aggregate),
+        ("Latest-season aggregates", lambda: dm.aggregate(latest_season()) if latest_season() else None),
+        ("Default dashboard stat", dm.leaderboard_index),
+        ("Player totals", dm.player_totals),
+        ("Team W/D/L", lambda: [(dm.team_record(s), dm.team_totals(s)) for s in seasons()[:1]]),
+    ]
+
+
+class WarmUp:
+    """Background build of one data version's default views.
+
+    Stops between steps once cancel() is called or the data version moves on
+    (new save loaded, edits); nothing built for an old version is cached.
+    """
+
+    def __init__(self, dm, steps=None):
+        self.dm = dm
+        self.version = dm.version
+        self.steps = steps if steps is not None else default_steps(dm)
+        self.completed = []   # labels of the finished steps
+        self.error = None
+        self.started = None
+        self.finished = None
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+
+    def start(self):
+        self.started = time.time()
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    def cancelled(self):
+        return self._cancel.is_set() or self.dm.version != self.version
+
+    def _run(self):
+        try:
+            with self.dm.background_reads():
+                for label, fn in self.steps:
+                    if self.cancelled():
+                        return
+                    fn()
+                    self.completed.append(label)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished = time.time()
+
+    @property
+    def progress(self):
+        return len(self.completed) / len(self.steps) if self.steps else 1.0
+
+    def running(self):
+        return self._thread.is_alive()
+
+    def status(self):
+        """"Warm", "Warming", "Cold" (cancelled, failed or outdated) for the DataManager's current data."""
+        if self.dm.version != self.version:
+            return "Cold"
+        if self.running():
+            return "Warming"
+        if self.error is not None or len(self.completed) < len(self.steps):
+            return "Cold"
+        return "Warm"
+
+
+def restart(previous, dm):
+    """Cancel the previous warm-up (if any) and start one for dm's current data."""
+    if previous is not None:
+        previous.cancel()
+    return WarmUp(dm).start()